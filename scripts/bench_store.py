@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""Benchmark the flow store at production sizes.
+
+Generates synthetic stores of the given sizes (rows are written straight to the
+logs table, with log paths that mostly don't exist), on local disk and/or on a
+moto S3 server, and times the store operations that scale with the table:
+
+- `import_log_path`: importing a directory of new logs into the store
+- `get_logs`: listing every log in the store
+- `_get_logs`: looking up the logs of a sample of tasks
+- `search_for_logs`: finding the best log for a sample of tasks
+- `remove_log_prefix`: removing a directory of logs
+- `_set_task_identifiers`: the task identifier backfill scan (`full`) and its
+  marker check once the scan has completed (`marker`)
+
+Cold timings open a new store, warm timings repeat the call on the same store.
+Results are written as JSON, and a previous results file can be passed with
+`--compare` to report the change per operation, e.g. across commits:
+
+    python scripts/bench_store.py --rows 10000 100000 --output base.json
+    git checkout my-branch
+    python scripts/bench_store.py --rows 10000 100000 --compare base.json
+
+The S3 backend needs `moto_server` (installed with the dev dependencies).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta, timezone
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+import platformdirs
+import pyarrow as pa
+
+REPO = Path(__file__).resolve().parents[1]
+TEMPLATE_LOG = (
+    REPO
+    / "tests/test_logs/logs1/2025-12-11T18-00-43+00-00_gpqa-diamond_NL3aygdanSgqAJfzoMFuH6.eval"
+)
+BUCKET = "flow-store-bench"
+
+DEFAULT_ROWS = [10_000, 100_000]
+DEFAULT_ROWS_PER_TASK = 2
+DEFAULT_DIRS = 100
+DEFAULT_LOOKUP_TASKS = 100
+DEFAULT_IMPORT_LOGS = 200
+DEFAULT_REPEAT = 3
+DEFAULT_WRITE_BATCH = 100_000
+# Changes within this fraction of the baseline are reported as unchanged
+DEFAULT_TOLERANCE = 0.2
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextmanager
+def _moto_server() -> Iterator[None]:
+    """Run a moto S3 server and point the AWS environment at it."""
+    import boto3
+
+    with socket.socket() as sock:
+        sock.bind(("", 0))
+        port = sock.getsockname()[1]
+    proc = subprocess.Popen(
+        ["moto_server", "-p", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(50):
+            try:
+                urllib.request.urlopen(url, timeout=0.5)
+                break
+            except Exception:
+                time.sleep(0.1)
+        os.environ.update(
+            {
+                "AWS_ENDPOINT_URL": url,
+                "AWS_ACCESS_KEY_ID": "testing",
+                "AWS_SECRET_ACCESS_KEY": "testing",
+                "AWS_SESSION_TOKEN": "",
+                "AWS_DEFAULT_REGION": "us-east-1",
+            }
+        )
+        boto3.client("s3").create_bucket(Bucket=BUCKET)
+        yield
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+class _Synthetic:
+    """A synthetic store's rows and the log files that need to exist."""
+
+    def __init__(self, rows: int, args: argparse.Namespace, log_root: Path) -> None:
+        self.rows = rows
+        self.log_root = log_root
+        num_tasks = max(1, rows // args.rows_per_task)
+        rng = random.Random(rows)
+        self.task_ids = [f"bench-task-{i:08d}" for i in range(num_tasks)]
+        self.lookup_task_ids = set(
+            rng.sample(self.task_ids, min(args.lookup_tasks, num_tasks))
+        )
+        self.remove_dir = str(log_root / "dir00000")
+        self._rng = rng
+        self._dirs = args.dirs
+
+    def log_path(self, i: int) -> str:
+        from inspect_flow._store.deltalake import to_uri
+
+        directory = self.log_root / f"dir{i % self._dirs:05d}"
+        return to_uri(str(directory / f"2026-01-01T00-00-00+00-00_bench_{i:08d}.eval"))
+
+    def table(self, start: int, stop: int) -> pa.Table:
+        from inspect_flow._store.deltalake import (
+            _TASK_HASH_COL,
+            LogRecord,
+            _task_hash,
+            _task_id_col,
+        )
+
+        completed = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        task_ids = [self.task_ids[i % len(self.task_ids)] for i in range(start, stop)]
+        columns: dict[str, Any] = {
+            "log_path": [self.log_path(i) for i in range(start, stop)],
+            _task_id_col(): task_ids,
+            "ts": [completed] * (stop - start),
+            "status": ["success"] * (stop - start),
+            "task": ["bench"] * (stop - start),
+            "model": [f"model-{i % 10}" for i in range(start, stop)],
+            "completed_samples": [100] * (stop - start),
+            "total_samples": [100] * (stop - start),
+            "completed_at": [
+                completed + timedelta(seconds=i) for i in range(start, stop)
+            ],
+            "invalidated": [False] * (stop - start),
+            "valid_samples": [self._rng.randint(0, 100) for _ in range(start, stop)],
+            "size": [1000] * (stop - start),
+            "mtime": [0.0] * (stop - start),
+            _TASK_HASH_COL: [_task_hash(t) for t in task_ids],
+        }
+        schema = LogRecord.to_schema()
+        return pa.table(
+            {
+                f.name: pa.array(columns.get(f.name, [None] * (stop - start)), f.type)
+                for f in schema
+            },
+            schema=schema,
+        )
+
+    def write_log_files(self) -> None:
+        """Create the log files that lookups of the sampled tasks will check."""
+        for i in range(self.rows):
+            if self.task_ids[i % len(self.task_ids)] in self.lookup_task_ids:
+                dest = Path(self.log_path(i).removeprefix("file://"))
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(TEMPLATE_LOG, dest)
+
+
+def _build_store(store_path: str, synthetic: _Synthetic, batch: int) -> None:
+    from deltalake import write_deltalake
+    from inspect_flow._store.deltalake import LOGS, DeltaLakeStore
+
+    store = DeltaLakeStore(store_path, create=True)
+    for start in range(0, synthetic.rows, batch):
+        write_deltalake(
+            store._table_path(LOGS),
+            synthetic.table(start, min(start + batch, synthetic.rows)),
+            mode="append",
+            storage_options=store._storage_options,
+        )
+    synthetic.write_log_files()
+
+
+def _import_dir(log_root: Path, count: int) -> str:
+    import_dir = log_root / "import"
+    import_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        shutil.copyfile(
+            TEMPLATE_LOG,
+            import_dir / f"2026-02-01T00-00-00+00-00_import_{i:06d}.eval",
+        )
+    return str(import_dir)
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> list[float]:
+    seconds: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def _bench_store(
+    backend: str, rows: int, args: argparse.Namespace, work_dir: Path
+) -> list[dict[str, Any]]:
+    from inspect_flow._store.deltalake import DeltaLakeStore
+
+    log_root = work_dir / f"logs-{backend}-{rows}"
+    store_path = (
+        f"s3://{BUCKET}/store-{rows}"
+        if backend == "s3"
+        else str(work_dir / f"store-{backend}-{rows}")
+    )
+    synthetic = _Synthetic(rows, args, log_root)
+    print(f"Generating {rows} rows ({backend})...", file=sys.stderr)
+    build_start = time.perf_counter()
+    _build_store(store_path, synthetic, args.write_batch)
+    print(f"  built in {time.perf_counter() - build_start:.1f}s", file=sys.stderr)
+
+    results: list[dict[str, Any]] = []
+
+    def record(operation: str, seconds: list[float]) -> None:
+        results.append(
+            {
+                "backend": backend,
+                "rows": rows,
+                "operation": operation,
+                "seconds": seconds,
+                "min": min(seconds),
+                "median": statistics.median(seconds),
+            }
+        )
+        print(f"  {operation:<32} {min(seconds):8.3f}s", file=sys.stderr)
+
+    # The first backfill scans every row, later ones check the marker
+    record(
+        "_set_task_identifiers/full",
+        _time(lambda: DeltaLakeStore(store_path)._set_task_identifiers(), 1),
+    )
+    record(
+        "_set_task_identifiers/marker",
+        _time(lambda: DeltaLakeStore(store_path)._set_task_identifiers(), args.repeat),
+    )
+
+    record(
+        "get_logs/cold",
+        _time(lambda: DeltaLakeStore(store_path).get_logs(), args.repeat),
+    )
+    warm = DeltaLakeStore(store_path)
+    warm.get_logs()
+    record("get_logs/warm", _time(warm.get_logs, args.repeat))
+
+    task_ids = synthetic.lookup_task_ids
+    record(
+        "_get_logs/cold",
+        _time(lambda: DeltaLakeStore(store_path)._get_logs(task_ids), args.repeat),
+    )
+    record("_get_logs/warm", _time(lambda: warm._get_logs(task_ids), args.repeat))
+    record(
+        "search_for_logs/cold",
+        _time(
+            lambda: DeltaLakeStore(store_path).search_for_logs(task_ids), args.repeat
+        ),
+    )
+    record(
+        "search_for_logs/warm",
+        _time(lambda: warm.search_for_logs(task_ids), args.repeat),
+    )
+
+    import_dir = _import_dir(log_root, args.import_logs)
+    record(
+        "import_log_path/new",
+        _time(lambda: DeltaLakeStore(store_path).import_log_path(import_dir), 1),
+    )
+    record(
+        "import_log_path/unchanged",
+        _time(
+            lambda: DeltaLakeStore(store_path).import_log_path(import_dir),
+            args.repeat,
+        ),
+    )
+    record(
+        "remove_log_prefix",
+        _time(
+            lambda: DeltaLakeStore(store_path).remove_log_prefix(
+                synthetic.remove_dir, verbose=False
+            ),
+            1,
+        ),
+    )
+    return results
+
+
+def _compare(
+    results: list[dict[str, Any]], baseline_file: str, tolerance: float
+) -> bool:
+    """Print the change from a baseline per operation.
+
+    Returns:
+        Whether any operation was slower than the baseline beyond the tolerance.
+    """
+    baseline = json.loads(Path(baseline_file).read_text())
+    before = {
+        (r["backend"], r["rows"], r["operation"]): r["min"] for r in baseline["results"]
+    }
+    regressed = False
+    print(f"\nCompared with {baseline_file} ({baseline.get('commit')}):")
+    for r in results:
+        key = (r["backend"], r["rows"], r["operation"])
+        if key not in before:
+            continue
+        ratio = r["min"] / before[key] if before[key] else float("inf")
+        if ratio > 1 + tolerance:
+            status = "SLOWER"
+            regressed = True
+        elif ratio < 1 - tolerance:
+            status = "faster"
+        else:
+            status = ""
+        print(
+            f"  {r['backend']:<5} {r['rows']:>9} {r['operation']:<32} "
+            f"{before[key]:8.3f}s -> {r['min']:8.3f}s  {ratio:5.2f}x {status}"
+        )
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=DEFAULT_ROWS,
+        help=f"Store sizes to benchmark (default: {DEFAULT_ROWS})",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["local", "s3"],
+        nargs="+",
+        default=["local"],
+        help="Where to create the stores (default: local)",
+    )
+    parser.add_argument(
+        "--rows-per-task",
+        type=int,
+        default=DEFAULT_ROWS_PER_TASK,
+        help=f"Logs per task identifier (default: {DEFAULT_ROWS_PER_TASK})",
+    )
+    parser.add_argument(
+        "--dirs",
+        type=int,
+        default=DEFAULT_DIRS,
+        help=f"Log directories the rows are spread over (default: {DEFAULT_DIRS})",
+    )
+    parser.add_argument(
+        "--lookup-tasks",
+        type=int,
+        default=DEFAULT_LOOKUP_TASKS,
+        help=f"Tasks to look up (default: {DEFAULT_LOOKUP_TASKS})",
+    )
+    parser.add_argument(
+        "--import-logs",
+        type=int,
+        default=DEFAULT_IMPORT_LOGS,
+        help=f"Log files to import (default: {DEFAULT_IMPORT_LOGS})",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Times to repeat each operation (default: {DEFAULT_REPEAT})",
+    )
+    parser.add_argument(
+        "--write-batch",
+        type=int,
+        default=DEFAULT_WRITE_BATCH,
+        help=f"Rows per commit when generating a store (default: {DEFAULT_WRITE_BATCH})",
+    )
+    parser.add_argument("--output", help="File to write the JSON results to")
+    parser.add_argument(
+        "--compare", help="Results file to compare with; exits 1 on a regression"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"Slowdown fraction reported as a regression (default: {DEFAULT_TOLERANCE})",
+    )
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="flow-store-bench-"))
+    # Keep the header cache and other flow data out of the user's data directory
+    user_data = str(work_dir / "user_data")
+    platformdirs.user_data_dir = lambda *args, **kwargs: user_data  # type: ignore[assignment]
+
+    from inspect_flow._util.console import console
+
+    console.quiet = True
+    results: list[dict[str, Any]] = []
+    try:
+        for backend in args.backend:
+            with _moto_server() if backend == "s3" else nullcontext():
+                for rows in args.rows:
+                    results.extend(_bench_store(backend, rows, args, work_dir))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = {
+        "commit": _git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "deltalake": version("deltalake"),
+        "pyarrow": version("pyarrow"),
+        "inspect_ai": version("inspect_ai"),
+        "results": results,
+    }
+    text = json.dumps(output, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+    if args.compare and _compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
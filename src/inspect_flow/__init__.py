@@ -37,7 +37,14 @@ from inspect_flow._types.flow_types import (
     InstantiateConfig,
     LogFilter,
 )
+from inspect_flow._types.lazy_dataset import (
+    SampleCount,
+    file_sample_count,
+    hf_sample_count,
+    lazy_dataset,
+)
 from inspect_flow._types.log_filter import log_filter
+from inspect_flow._types.log_filter_expr import FilterExpr, log_field
 from inspect_flow._types.merge import (
     merge,
 )
@@ -52,9 +59,12 @@ __all__ = [
     "FlowFactory",
     "FlowSpec",
     "FlowStoreConfig",
+    "FilterExpr",
     "FlowModel",
     "InstantiateConfig",
     "LogFilter",
+    "SampleCount",
+    "log_field",
     "log_filter",
     "step",
     "FlowOptions",
@@ -67,6 +77,9 @@ __all__ = [
     "agents_with",
     "configs_matrix",
     "configs_with",
+    "file_sample_count",
+    "hf_sample_count",
+    "lazy_dataset",
     "merge",
     "models_matrix",
     "models_with",
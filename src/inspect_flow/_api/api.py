@@ -178,6 +178,7 @@ def check(
     base_dir: str | None = None,
     *,
     log_dir: str | None = None,
+    from_manifest: bool = False,
 ) -> CheckResult:
     """Check completeness of an inspect_flow evaluation against existing logs.
 
@@ -185,6 +186,10 @@ def check(
         spec: The flow spec configuration.
         base_dir: The base directory for resolving relative paths. Defaults to the current working directory.
         log_dir: Log directory to check against. Overrides the `log_dir` in the spec.
+        from_manifest: Describe tasks from the task manifest written to the log
+            directory by `run` instead of instantiating them. Always checks in
+            process. Raises `PrerequisiteError` if the manifest doesn't describe
+            every task.
 
     Returns:
         A CheckResult whose `is_complete` flag reflects whether every task has a
@@ -201,7 +206,7 @@ def check(
     )
     if log_dir is not None:
         spec = spec.model_copy(update={"log_dir": log_dir})
-    result = launch_check(spec=spec, base_dir=base_dir)
+    result = launch_check(spec=spec, base_dir=base_dir, from_manifest=from_manifest)
     if result.find_result is None:
         return CheckResult(is_complete=result.is_complete, tasks=[], unrecognized=[])
     return _to_check_result(result.is_complete, result.find_result)
@@ -213,7 +218,7 @@ def _to_check_result(is_complete: bool, logs_result: FindLogsResult) -> CheckRes
         assert info.flow_task is not None
         tasks.append(
             CheckTask(
-                name=info.task.name,
+                name=info.name,
                 task=info.flow_task,
                 log_file=info.eval_log.location if info.eval_log else None,
                 samples=info.log_samples,
@@ -245,15 +250,18 @@ def config(
     return dump
 
 
-def store_get(store: str = "auto", create: bool = True) -> FlowStore:
+def store_get(
+    store: str = "auto", create: bool = True, samples: bool = False
+) -> FlowStore:
     """Get a FlowStore instance.
 
     Args:
         store: The store location. Can be a path to the store directory or `"auto"` for the default store location.
         create: Whether to create the store if it does not exist.
+        samples: Whether to create the store's sample index if it has none (see `FlowStore.scan_samples()`).
     """
     ensure_init(dotenv_base_dir=".")
-    flow_store = store_factory(store, base_dir=".", create=create)
+    flow_store = store_factory(store, base_dir=".", create=create, samples=samples)
     if not flow_store:
         raise ValueError(f"Could not open store at {store}")
     return flow_store
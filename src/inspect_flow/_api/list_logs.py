@@ -1,10 +1,12 @@
 from datetime import datetime, timezone
 
 import dateparser
+import pyarrow as pa
 from inspect_ai.log import list_eval_logs
 
 from inspect_flow._api.api import ensure_init
 from inspect_flow._store.store import FlowStore, store_factory
+from inspect_flow._types.flow_types import LogFilter
 from inspect_flow._util.logs import log_filename_ts, sort_logs
 
 
@@ -39,11 +41,29 @@ def _filter_logs_by_date(
     return filtered
 
 
+def _collapse_copies(table: pa.Table, keep_copies: bool) -> list[str]:
+    """The log paths of a store scan, without later copies of the same file."""
+    paths = table["log_path"].to_pylist()
+    if keep_copies:
+        return paths
+    seen: set[str] = set()
+    result: list[str] = []
+    for p, fingerprint in zip(paths, table["fingerprint"].to_pylist(), strict=True):
+        if fingerprint is not None:
+            if fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+        result.append(p)
+    return result
+
+
 def list_logs(
     log_dir: str | None = None,
     store: str | FlowStore = "auto",
     since: str | datetime | None = None,
     until: str | datetime | None = None,
+    filter: LogFilter | None = None,
+    copies: bool = False,
 ) -> list[str]:
     """List log paths grouped by directory, directories ordered by most recent log file.
 
@@ -63,16 +83,35 @@ def list_logs(
             Accepts a `datetime` or a date string. Date strings like `"2024-06-01"`
             resolve to midnight; relative expressions like `"yesterday"` resolve to
             the current time minus one day.
+        filter: Only include logs that pass this filter. When reading from a store,
+            filter expressions built with `log_field()` are answered from the
+            store without reading log files.
+        copies: Whether to list every copy of the same log file in the store
+            (e.g. copies made when a stored log was reused). By default only the
+            first copy listed is included. Only used when `log_dir` is `None`.
     """
     ensure_init(dotenv_base_dir=".")
     if log_dir is not None:
-        paths = {info.name for info in list_eval_logs(log_dir=log_dir, recursive=True)}
-    elif isinstance(store, FlowStore):
-        paths = store.get_logs()
+        paths = {
+            info.name
+            for info in list_eval_logs(log_dir=log_dir, recursive=True, filter=filter)
+        }
+        sorted_paths = sort_logs(paths)
     else:
-        flow_store = store_factory(store, base_dir=".", create=False, quiet=True)
-        paths = flow_store.get_logs() if flow_store else set()
-    sorted_paths = sort_logs(paths)
+        flow_store = (
+            store
+            if isinstance(store, FlowStore)
+            else store_factory(store, base_dir=".", create=False, quiet=True)
+        )
+        # The store sorts the logs with Arrow
+        table = (
+            flow_store.scan(["log_path", "fingerprint"], filter).read_all()
+            if flow_store
+            else None
+        )
+        sorted_paths = (
+            [] if table is None else _collapse_copies(table, keep_copies=copies)
+        )
     if since is None and until is None:
         return sorted_paths
     return _filter_logs_by_date(sorted_paths, since, until)
@@ -0,0 +1,44 @@
+import click
+
+from inspect_flow._cli.json_output import emit_json
+from inspect_flow._cli.options import json_option
+from inspect_flow._util.console import flow_print, path, quantity
+from inspect_flow._util.header_cache import header_cache
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+@click.group("cache", help="Manage the local log header cache")
+def cache_command() -> None:
+    """CLI command group for header cache operations."""
+    pass
+
+
+@cache_command.command("stats", help="Print header cache statistics")
+@json_option
+def cache_stats(output_json: bool) -> None:
+    stats = header_cache().stats()
+    if output_json:
+        emit_json(
+            {
+                "path": str(stats.path),
+                "entries": stats.entries,
+                "size": stats.size,
+                "max_size": stats.max_size,
+            }
+        )
+        return
+    flow_print("Path:    ", path(str(stats.path)))
+    flow_print("Entries: ", quantity(stats.entries, "header"))
+    flow_print("Size:    ", f"{_mb(stats.size)} of {_mb(stats.max_size)}")
+
+
+@cache_command.command("clear", help="Remove all cached log headers")
+def cache_clear() -> None:
+    removed = header_cache().clear()
+    flow_print(
+        f"Removed {quantity(removed, 'cached header')}",
+        format="success",
+    )
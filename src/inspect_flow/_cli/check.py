@@ -31,9 +31,18 @@ _check_actions = {
 )
 @json_option
 @check_options
+@click.option(
+    "--from-manifest",
+    type=bool,
+    is_flag=True,
+    help="Describe tasks from the task manifest written to the log directory by "
+    + "`flow run` instead of instantiating them.",
+    envvar="INSPECT_FLOW_CHECK_FROM_MANIFEST",
+)
 def check_command(
     config_file: str,
     output_json: bool,
+    from_manifest: bool,
     **kwargs: Unpack[ConfigOptionArgs],
 ) -> None:
     init_output(**kwargs)
@@ -44,7 +53,12 @@ def check_command(
         output_json, mode="check", actions=_check_actions, config_file=config_file
     ):
         spec = int_load_spec(config_file, options=parse_config_options(**kwargs))
-        result = launch_check(spec, base_dir=base_dir, output_json=output_json)
+        result = launch_check(
+            spec,
+            base_dir=base_dir,
+            output_json=output_json,
+            from_manifest=from_manifest,
+        )
     if output_json:
         assert result.json_result is not None
         emit_json(result.json_result)
@@ -1,4 +1,3 @@
-import fnmatch
 import io
 import os
 import subprocess
@@ -18,7 +17,6 @@ from inspect_ai.log import (
     EvalLog,
     MetadataEdit,
     TagsEdit,
-    read_eval_log_async,
 )
 from rich.console import Console, Group, RenderableType
 from rich.live import Live
@@ -38,10 +36,12 @@ from inspect_flow._cli.store import (
 )
 from inspect_flow._runner.task_log import TaskInfo, unique_task_names
 from inspect_flow._types.flow_types import FlowSpec, LogFilter
+from inspect_flow._types.log_filter_expr import FilterExpr, log_field
 from inspect_flow._util.console import flow_print, path
+from inspect_flow._util.header_cache import evict_header_cache, read_header_async
 from inspect_flow._util.logs import (
     group_logs_by_dir,
-    num_valid_samples_async,
+    total_samples,
 )
 from inspect_flow._util.path_util import apply_bundle_url_mappings, path_str
 from inspect_flow._util.terminal import stdout_is_terminal
@@ -57,6 +57,7 @@ class ListOptions:
     oneline: bool = False
     page: bool = True
     provenance: bool = False
+    copies: bool = False
 
 
 def _find_flow_yaml(dir_path: str) -> FlowSpec | None:
@@ -108,9 +109,9 @@ async def _read_header(
     log_path: str, on_read: Callable[[], None] | None = None
 ) -> _HeaderResult | None:
     try:
-        header = await read_eval_log_async(log_path, header_only=True)
-        valid_samples = await num_valid_samples_async(header)
-        return _HeaderResult(log_path, header, valid_samples)
+        cached = await read_header_async(log_path, valid_samples=True)
+        assert cached.valid_samples is not None
+        return _HeaderResult(log_path, cached.header, cached.valid_samples)
     except Exception:
         return None
     finally:
@@ -132,6 +133,7 @@ def _read_headers(
     results = run_coroutine(
         tg_collect([partial(_read_header, p, on_read) for p in log_paths])
     )
+    evict_header_cache()
     headers = {r.log_path: r for r in results if r is not None}
     if options.log_filter:
         headers = {p: h for p, h in headers.items() if options.log_filter(h.header)}
@@ -196,16 +198,9 @@ def _date_str(header_result: _HeaderResult) -> str:
     return dt.strftime("%Y-%m-%d %H:%M:%S %z")
 
 
-def _total_samples(header: EvalLog) -> int | None:
-    if header.results:
-        return header.results.total_samples
-    total = (header.eval.dataset.samples or 0) * (header.eval.config.epochs or 1)
-    return total or None
-
-
 def _samples_str(header_result: _HeaderResult) -> str:
     valid_samples = header_result.num_valid_samples
-    total = _total_samples(header_result.header)
+    total = total_samples(header_result.header)
     return f"{valid_samples}/{total}" if total is not None else ""
 
 
@@ -750,7 +745,14 @@ def _compute_renderable(
     options: ListOptions,
     console: Console,
 ) -> RenderableType:
-    log_paths = list_logs(log_dir=log_dir, store=store, since=since, until=until)
+    log_paths = list_logs(
+        log_dir=log_dir,
+        store=store,
+        since=since,
+        until=until,
+        filter=_store_filter(log_dir, options.log_filter),
+        copies=options.copies,
+    )
     if not log_paths:
         return Text("No logs found")
     log_paths_str = [path_str(p) for p in log_paths]
@@ -810,9 +812,11 @@ def _live_output(
 # -- CLI commands -------------------------------------------------------------
 
 
-def _chain(base: LogFilter | None, new: LogFilter) -> LogFilter:
+def _chain(base: LogFilter | None, new: FilterExpr) -> LogFilter:
     if base is None:
         return new
+    if isinstance(base, FilterExpr):
+        return base & new
 
     def combined(log: EvalLog) -> bool:
         return base(log) and new(log)
@@ -820,6 +824,16 @@ def _chain(base: LogFilter | None, new: LogFilter) -> LogFilter:
     return combined
 
 
+def _store_filter(
+    log_dir: str | None, log_filter: LogFilter | None
+) -> FilterExpr | None:
+    # Declarative filters are answered by the store from its columns, so only
+    # the matching logs have their headers read.
+    if log_dir is None and isinstance(log_filter, FilterExpr):
+        return log_filter
+    return None
+
+
 def _log_entry_to_json(entry: LogEntry) -> dict[str, Any]:
     header = entry.header
     return {
@@ -828,7 +842,7 @@ def _log_entry_to_json(entry: LogEntry) -> dict[str, Any]:
         "status": header.status,
         "model": header.eval.model,
         "samples": entry.header_result.num_valid_samples,
-        "total_samples": _total_samples(header),
+        "total_samples": total_samples(header),
         "started_at": header.stats.started_at,
         "completed_at": header.stats.completed_at,
         "tags": list(header.tags) if header.tags else [],
@@ -882,6 +896,12 @@ class _MaxCountCommand(click.Command):
     default=False,
     help="Show provenance (edit history) for each log. Only displayed in multiline mode.",
 )
+@click.option(
+    "--copies",
+    is_flag=True,
+    default=False,
+    help="List every copy of the same log file in the store. By default each log file is listed once.",
+)
 @click.option(
     "--no-page",
     "no_page",
@@ -957,6 +977,7 @@ def list_log(
     output_format: str,
     oneline: bool,
     provenance: bool,
+    copies: bool,
     no_page: bool,
     max_count: int | None,
     tasks: tuple[str, ...],
@@ -972,28 +993,14 @@ def list_log(
 ) -> None:
     log_filter = _resolve_cli_filter(filter_name, exclude_name)
     if tasks:
-        task_patterns = tasks
-        log_filter = _chain(
-            log_filter,
-            lambda log: any(fnmatch.fnmatch(log.eval.task, p) for p in task_patterns),
-        )
+        log_filter = _chain(log_filter, log_field("task").glob(*tasks))
     if models:
-        model_patterns = models
-        log_filter = _chain(
-            log_filter,
-            lambda log: any(fnmatch.fnmatch(log.eval.model, p) for p in model_patterns),
-        )
+        log_filter = _chain(log_filter, log_field("model").glob(*models))
     if tags:
-        tag_patterns = tags
-        log_filter = _chain(
-            log_filter,
-            lambda log: any(
-                fnmatch.fnmatch(t, p) for t in log.tags for p in tag_patterns
-            ),
-        )
+        log_filter = _chain(log_filter, log_field("tags").glob(*tags))
     if statuses:
-        status_set = set(statuses)
-        log_filter = _chain(log_filter, lambda log: log.status in status_set)
+        log_filter = _chain(log_filter, log_field("status").isin(statuses))
+    store_filter = _store_filter(path, log_filter)
     options = ListOptions(
         output_format=output_format,
         log_filter=log_filter,
@@ -1001,13 +1008,21 @@ def list_log(
         oneline=oneline,
         page=not no_page,
         provenance=provenance,
+        copies=copies,
     )
     store = kwargs.get("store") or "auto"
     if output_json:
         with quiet_output():
             log_paths = [
                 path_str(p)
-                for p in list_logs(log_dir=path, store=store, since=since, until=until)
+                for p in list_logs(
+                    log_dir=path,
+                    store=store,
+                    since=since,
+                    until=until,
+                    filter=store_filter,
+                    copies=options.copies,
+                )
             ]
             entries = _truncate(
                 _process_groups(group_logs_by_dir(log_paths), options),
@@ -1021,7 +1036,14 @@ def list_log(
     progress = Progress(transient=True)
     progress.add_task("Listing logs…", total=None)
     progress.start()
-    log_paths = list_logs(log_dir=path, store=store, since=since, until=until)
+    log_paths = list_logs(
+        log_dir=path,
+        store=store,
+        since=since,
+        until=until,
+        filter=store_filter,
+        copies=options.copies,
+    )
     if not log_paths:
         progress.stop()
         flow_print("No logs found")
@@ -3,6 +3,7 @@ import sys
 import click
 from dotenv import find_dotenv, load_dotenv
 
+from inspect_flow._cli.cache import cache_command
 from inspect_flow._cli.check import check_command
 from inspect_flow._cli.config import config_command
 from inspect_flow._cli.constants import resolve_tokens
@@ -57,6 +58,7 @@ flow.add_command(config_command)
 flow.add_command(list_command)
 flow.add_command(store_command)
 flow.add_command(step_command)
+flow.add_command(cache_command)
 
 
 def main() -> None:  # pragma: no cover
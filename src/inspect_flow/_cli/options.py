@@ -187,6 +187,20 @@ def config_options(f: F) -> F:
         help="Read existing logs from the store (default: `--no-store-read`).",
         envvar="INSPECT_FLOW_STORE_READ",
     )(f)
+    f = click.option(
+        "--store-read-from",
+        type=str,
+        multiple=True,
+        help="Additional store to match existing logs from. Only read, completed logs are only written to --store. Can be used multiple times.",
+        envvar="INSPECT_FLOW_STORE_READ_FROM",
+    )(f)
+    f = click.option(
+        "--store-version",
+        type=str,
+        default=None,
+        help="Read the store as of this version (an integer) or timestamp (ISO 8601), so every read in the run sees the same snapshot.",
+        envvar="INSPECT_FLOW_STORE_VERSION",
+    )(f)
     f = click.option(
         "--store-write/--no-store-write",
         default=None,
@@ -237,6 +251,8 @@ class ConfigOptionArgs(CheckOptionArgs, total=False):
     store_filter: tuple[str, ...]
     store_read: bool | None
     store_write: bool | None
+    store_read_from: tuple[str, ...]
+    store_version: str | None
     log_dir_allow_dirty: bool | None
     log_dir_create_unique: bool | None
     resume: bool | None
@@ -285,4 +301,10 @@ def parse_config_options(**kwargs: Unpack[ConfigOptionArgs]) -> ConfigOptions:
         store_filter=kwargs.get("store_filter") or None,
         store_read=kwargs.get("store_read"),
         store_write=kwargs.get("store_write"),
+        store_read_from=tuple(
+            p if p.lower() == "auto" else absolute_file_path(p)
+            for p in kwargs.get("store_read_from") or ()
+        )
+        or None,
+        store_version=kwargs.get("store_version"),
     )
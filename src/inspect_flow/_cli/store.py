@@ -1,3 +1,4 @@
+import dataclasses
 from collections.abc import Callable
 from typing import Any, Literal, TypeVar
 
@@ -17,6 +18,7 @@ from inspect_flow._cli.options import (
     store_option,
 )
 from inspect_flow._store.store import (
+    DEFAULT_RETENTION_HOURS,
     FlowStore,
     delete_store,
     resolve_store_path,
@@ -25,7 +27,9 @@ from inspect_flow._store.store import (
 )
 from inspect_flow._types.flow_types import LogFilter
 from inspect_flow._types.log_filter import resolve_log_filter
+from inspect_flow._types.log_filter_expr import FilterExpr
 from inspect_flow._util.console import console, flow_print, path, quantity
+from inspect_flow._util.constants import DEFAULT_MAX_CONCURRENCY
 from inspect_flow._util.logs import copy_all_logs
 from inspect_flow._util.terminal import stdin_is_interactive
 
@@ -123,6 +127,8 @@ def _resolve_cli_filter(
     if exclude_name:
         resolved = resolve_log_filter(exclude_name)
         assert resolved is not None
+        if isinstance(resolved, FilterExpr):
+            return ~resolved
         return lambda log: not resolved(log)
     return None
 
@@ -132,11 +138,16 @@ class StoreOptionArgs(OutputOptionArgs, total=False):
 
 
 def init_store(
-    create: bool = False, quiet: bool = False, **kwargs: Unpack[StoreOptionArgs]
+    create: bool = False,
+    quiet: bool = False,
+    samples: bool = False,
+    **kwargs: Unpack[StoreOptionArgs],
 ) -> FlowStore | None:
     init_output(**kwargs)
     store_location = kwargs.get("store") or "auto"
-    flow_store = store_factory(store_location, base_dir=".", create=create, quiet=quiet)
+    flow_store = store_factory(
+        store_location, base_dir=".", create=create, quiet=quiet, samples=samples
+    )
     if not flow_store:
         flow_print(
             "Error: Store not found at",
@@ -181,11 +192,18 @@ def store_command() -> None:
     help="Preview what would be imported without making changes",
     envvar="INSPECT_FLOW_STORE_IMPORT_DRY_RUN",
 )
+@click.option(
+    "--samples",
+    is_flag=True,
+    help="Create the store's sample index if it has none, and index the samples of the imported logs. Once created, the index is kept up to date by every import and run.",
+    envvar="INSPECT_FLOW_STORE_IMPORT_SAMPLES",
+)
 def store_import(
     path: tuple[str, ...],
     recursive: bool,
     copy_from: str | None,
     dry_run: bool,
+    samples: bool,
     **kwargs: Unpack[StoreOptionArgs],
 ) -> None:
     if dry_run:
@@ -193,7 +211,7 @@ def store_import(
             "\n[blue][DRY RUN][/blue] Preview mode - logs will not be imported\n"
         )
 
-    flow_store = init_store(create=True, **kwargs)
+    flow_store = init_store(create=True, samples=samples and not dry_run, **kwargs)
     if not flow_store:
         return
     if copy_from:
@@ -234,6 +252,14 @@ def store_import(
     help="Remove logs that no longer exist on file system",
     envvar="INSPECT_FLOW_STORE_REMOVE_MISSING",
 )
+@click.option(
+    "--max-concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_CONCURRENCY,
+    show_default=True,
+    help="Maximum concurrent file system requests when checking for missing logs",
+    envvar="INSPECT_FLOW_STORE_REMOVE_MAX_CONCURRENCY",
+)
 @click.option(
     "--dry-run",
     is_flag=True,
@@ -244,6 +270,7 @@ def store_remove(
     prefix: tuple[str, ...],
     recursive: bool,
     missing: bool,
+    max_concurrency: int,
     dry_run: bool,
     filter_name: tuple[str, ...],
     exclude_name: str | None,
@@ -265,6 +292,7 @@ def store_remove(
             dry_run=dry_run,
             verbose=True,
             filter=log_filter,
+            max_concurrency=max_concurrency,
         )
 
 
@@ -337,6 +365,101 @@ def store_info(output_json: bool, **kwargs: Unpack[StoreOptionArgs]) -> None:
     flow_print("Version: ", flow_store.version)
 
 
+@store_command.command(
+    "optimize",
+    help="Compact the store's data files, checkpoint its log and delete unused files",
+)
+@json_option
+@store_options
+@click.option(
+    "--retention-hours",
+    type=click.IntRange(min=0),
+    default=DEFAULT_RETENTION_HOURS,
+    show_default=True,
+    help="Only delete unused files older than this. Keep it longer than any run using the store.",
+    envvar="INSPECT_FLOW_STORE_OPTIMIZE_RETENTION_HOURS",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help=f"Allow a --retention-hours shorter than {DEFAULT_RETENTION_HOURS}. Files that concurrent runs or pinned reads still need may be deleted.",
+    envvar="INSPECT_FLOW_STORE_OPTIMIZE_FORCE",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Preview what would be deleted without making changes",
+    envvar="INSPECT_FLOW_STORE_OPTIMIZE_DRY_RUN",
+)
+def store_optimize(
+    retention_hours: int,
+    force: bool,
+    dry_run: bool,
+    output_json: bool,
+    **kwargs: Unpack[StoreOptionArgs],
+) -> None:
+    with output_context(output_json):
+        flow_store = init_store(quiet=output_json, **kwargs)
+        result = (
+            flow_store.optimize(
+                retention_hours=retention_hours, dry_run=dry_run, force=force
+            )
+            if flow_store
+            else None
+        )
+    if output_json:
+        emit_json(dataclasses.asdict(result) if result else None)
+        return
+    if not result:
+        return
+    if dry_run:
+        flow_print("\n[blue][DRY RUN][/blue] Preview mode - store was not changed")
+    flow_print("Files:    ", f"{result.files_before} → {result.files_after}")
+    flow_print("Vacuumed: ", quantity(result.files_vacuumed, "file"))
+    flow_print(
+        "Scan time:",
+        f"{result.scan_seconds_before:.2f}s → {result.scan_seconds_after:.2f}s",
+    )
+
+
+@store_command.command(
+    "dedupe",
+    help="Remove logs from the store that are copies of another stored log",
+)
+@json_option
+@store_options
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Preview what would be removed without making changes",
+    envvar="INSPECT_FLOW_STORE_DEDUPE_DRY_RUN",
+)
+def store_dedupe(
+    dry_run: bool,
+    output_json: bool,
+    **kwargs: Unpack[StoreOptionArgs],
+) -> None:
+    with output_context(output_json):
+        flow_store = init_store(quiet=output_json, **kwargs)
+        result = flow_store.dedupe(dry_run=dry_run) if flow_store else None
+    if output_json:
+        emit_json(dataclasses.asdict(result) if result else None)
+        return
+    if not result:
+        return
+    if dry_run:
+        flow_print("\n[blue][DRY RUN][/blue] Preview mode - store was not changed")
+    for kept, copies in result.copies.items():
+        flow_print(path(kept))
+        for copy in copies:
+            flow_print("  copy:", path(copy))
+    num_copies = sum(len(c) for c in result.copies.values())
+    flow_print(
+        f"Removed {quantity(num_copies, 'copy', 'copies')} from store",
+        format="success" if num_copies else "warning",
+    )
+
+
 @store_command.command("delete", help="Delete the flow store")
 @store_options
 @click.option(
@@ -49,6 +49,8 @@ class ConfigOptions:
     store_filter: tuple[str, ...] | str | None = None
     store_read: bool | None = None
     store_write: bool | None = None
+    store_read_from: tuple[str, ...] | None = None
+    store_version: str | None = None
 
 
 @dataclass
@@ -94,6 +96,8 @@ def expand_spec(
         options.store_filter
         or options.store_read is not None
         or options.store_write is not None
+        or options.store_read_from
+        or options.store_version is not None
     ):
         if not isinstance(spec.store, FlowStoreConfig):
             spec.store = FlowStoreConfig(
@@ -105,6 +109,10 @@ def expand_spec(
             spec.store.read = options.store_read
         if options.store_write is not None:
             spec.store.write = options.store_write
+        if options.store_read_from:
+            spec.store.read_from = list(options.store_read_from)
+        if options.store_version is not None:
+            spec.store.as_of = options.store_version
     if options.resume:
         last_log_dir = read_data(LAST_LOG_DIR_KEY)
         if not last_log_dir:
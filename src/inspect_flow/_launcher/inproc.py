@@ -27,11 +27,13 @@ def inproc_launch(spec: FlowSpec, base_dir: str, dry_run: bool) -> LaunchResult:
     return run_eval_set(spec, base_dir=base_dir, dry_run=dry_run)
 
 
-def inproc_check(spec: FlowSpec, base_dir: str) -> FindLogsResult:
+def inproc_check(
+    spec: FlowSpec, base_dir: str, from_manifest: bool = False
+) -> FindLogsResult:
     with RunAction("env", info="inproc"):
         if spec.env:
             os.environ.update(spec.env)
-    return check_eval_set(spec, base_dir=base_dir)
+    return check_eval_set(spec, base_dir=base_dir, from_manifest=from_manifest)
 
 
 def inproc_dry_run(spec: FlowSpec, base_dir: str) -> FindLogsResult:
@@ -85,13 +85,18 @@ def launch_dry_run(spec: FlowSpec, base_dir: str) -> dict[str, Any] | None:
 
 
 def launch_check(
-    spec: FlowSpec, base_dir: str, output_json: bool = False
+    spec: FlowSpec,
+    base_dir: str,
+    output_json: bool = False,
+    from_manifest: bool = False,
 ) -> CheckLaunchResult:
     if not spec.log_dir:
         raise ValueError("log_dir must be set before checking the flow spec")
     spec.log_dir = absolute_path_relative_to(spec.log_dir, base_dir=base_dir)
 
-    if spec.execution_type == "venv":
+    # A check from the task manifest doesn't instantiate tasks, so it never
+    # needs the venv
+    if spec.execution_type == "venv" and not from_manifest:
         # The full result lives in the subprocess; the completeness flag (and the
         # JSON result under --json) are signaled back via a per-run result file.
         result = venv_check(spec=spec, base_dir=base_dir, output_json=output_json)
@@ -99,7 +104,7 @@ def launch_check(
             is_complete=result.ok, find_result=None, json_result=result.json_result
         )
     else:
-        result = inproc_check(spec=spec, base_dir=base_dir)
+        result = inproc_check(spec=spec, base_dir=base_dir, from_manifest=from_manifest)
         json_result = (
             find_logs_result_to_json(result, spec.log_dir) if output_json else None
         )
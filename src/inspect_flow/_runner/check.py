@@ -7,22 +7,32 @@ from inspect_flow._runner.logs import (
     find_existing_logs,
     get_task_ids_to_tasks,
 )
+from inspect_flow._runner.manifest import complete_tasks, manifest_tasks
 from inspect_flow._runner.resolve import resolve_spec
 from inspect_flow._runner.task_log import create_task_log_display
 from inspect_flow._types.flow_types import FlowSpec
 from inspect_flow._util.console import path
 
 
-def check_eval_set(spec: FlowSpec, base_dir: str) -> FindLogsResult:
+def check_eval_set(
+    spec: FlowSpec, base_dir: str, from_manifest: bool = False
+) -> FindLogsResult:
     resolved_spec = resolve_spec(spec, base_dir=base_dir)
 
-    tasks = instantiate_tasks(resolved_spec, base_dir=base_dir)
-    task_id_to_task = get_task_ids_to_tasks(tasks=tasks, spec=resolved_spec)
-
     if not resolved_spec.log_dir:
         raise ValueError("log_dir must be set before checking the flow spec")
     log_dir = resolved_spec.log_dir
 
+    # With from_manifest every task is described by the manifest, so none are
+    # instantiated and only log headers are read
+    described = (
+        manifest_tasks(resolved_spec, base_dir=base_dir)
+        if from_manifest
+        else complete_tasks(resolved_spec, base_dir=base_dir)
+    )
+    tasks = instantiate_tasks(resolved_spec, base_dir=base_dir, described=described)
+    task_id_to_task = get_task_ids_to_tasks(tasks=tasks, spec=resolved_spec)
+
     logs_result = find_existing_logs(
         task_id_to_task,
         resolved_spec,
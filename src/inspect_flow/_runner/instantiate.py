@@ -1,7 +1,31 @@
+import copy
+import importlib
+import inspect
+import json
+import multiprocessing
+import os
+import pickle
+import sys
 import threading
-from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from dataclasses import dataclass
-from typing import Any, Callable, NamedTuple, Sequence, TypeAlias, TypeVar
+from functools import partial
+from logging import getLogger
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    TypeAlias,
+    TypeVar,
+)
 
 from inspect_ai import Epochs, Task, task_with
 from inspect_ai._eval.loader import load_tasks, scorer_from_spec
@@ -11,10 +35,12 @@ from inspect_ai._util.notgiven import NOT_GIVEN
 from inspect_ai._util.notgiven import NotGiven as InspectNotGiven
 from inspect_ai._util.path import chdir_python
 from inspect_ai._util.registry import (
+    registry_find,
     registry_kwargs,
     registry_lookup,
 )
 from inspect_ai.agent import Agent
+from inspect_ai.dataset import Dataset
 from inspect_ai.model import Model, get_model
 from inspect_ai.model._model import init_active_model, resolve_models
 from inspect_ai.scorer import Scorer
@@ -26,6 +52,7 @@ from rich.progress import Progress, TextColumn
 from typing_extensions import Literal
 
 from inspect_flow._display.run_action import RunAction
+from inspect_flow._runner.task_log import TaskDescription
 from inspect_flow._types.flow_types import (
     CreateArgs,
     FlowAgent,
@@ -41,10 +68,13 @@ from inspect_flow._types.flow_types import (
     ModelRolesConfig,
     NotGiven,
 )
+from inspect_flow._util.console import quantity
 from inspect_flow._util.list_util import sequence_to_list
 from inspect_flow._util.not_given import default, default_none, is_set
 from inspect_flow._util.pydantic_util import callable_name
 
+logger = getLogger(__name__)
+
 ModelRoles: TypeAlias = dict[str, str | Model]
 SingleSolver: TypeAlias = Solver | Agent | list[Solver]
 TaskSpec: TypeAlias = str | FlowTask | Task
@@ -97,10 +127,38 @@ def _kwargs(
     return registry_kwargs(**{**base_args, **additional_args})
 
 
-@dataclass
 class InstantiatedTask:
-    flow_task: FlowTask | None
-    task: Task
+    """A task built from a flow task.
+
+    Under `'process'` instantiation the task is built in a worker process,
+    which returns only its `description`; `task` rebuilds it on first access.
+    """
+
+    def __init__(
+        self,
+        flow_task: FlowTask | None,
+        task: Task | None = None,
+        description: TaskDescription | None = None,
+        load: Callable[[], Task] | None = None,
+    ) -> None:
+        if task is None and load is None:
+            raise ValueError("Either task or load is required")
+        self.flow_task = flow_task
+        self.description = description
+        self._task = task
+        self._load = load
+
+    @property
+    def loaded_task(self) -> Task | None:
+        """The task, if it has been built in this process."""
+        return self._task
+
+    @property
+    def task(self) -> Task:
+        if self._task is None:
+            assert self._load
+            self._task = self._load()
+        return self._task
 
 
 def get_task_name(task_config: TaskSpec) -> str:
@@ -123,7 +181,7 @@ def get_task_name(task_config: TaskSpec) -> str:
     return "<unnamed>"
 
 
-def _resolve_instantiate(spec: FlowSpec) -> InstantiateConfig:
+def resolve_instantiate(spec: FlowSpec) -> InstantiateConfig:
     value = spec.instantiate
     if isinstance(value, NotGiven) or value is None:
         return InstantiateConfig()
@@ -132,12 +190,73 @@ def _resolve_instantiate(spec: FlowSpec) -> InstantiateConfig:
     return value
 
 
+class _TaskCache:
+    """Tasks loaded during one instantiation, keyed by (factory, args, base_dir).
+
+    The variants of a matrix sweep share a task factory and args, so the task
+    (and its dataset) is loaded once and each variant gets a shallow clone for
+    `task_with` to apply its overrides to.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[Hashable, list[Task]] = {}
+        self._locks: dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable | None, load: Callable[[], list[Task]]) -> list[Task]:
+        if key is None:
+            return load()
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        # Concurrent variants of the same task wait for the first load
+        with key_lock:
+            if key not in self._tasks:
+                self._tasks[key] = load()
+            tasks = self._tasks[key]
+        return [_clone_task(task) for task in tasks]
+
+
+def _clone_task(task: Task) -> Task:
+    # task_with replaces attributes rather than mutating them, so a shallow
+    # copy is enough. The dataset is re-sliced so that shuffling or filtering
+    # one variant's samples doesn't affect the others.
+    clone = copy.copy(task)
+    dataset = task.dataset[:]
+    assert isinstance(dataset, Dataset)
+    clone.dataset = dataset
+    return clone
+
+
+def _task_cache_key(task: FlowTask, base_dir: str) -> Hashable | None:
+    factory = task.factory
+    if isinstance(factory, FlowFactory):
+        source: object = factory.factory
+        args = factory.args
+    elif callable(factory):
+        source, args = factory, task.args
+    else:
+        source = factory if isinstance(factory, str) else task.name
+        args = task.args
+    if not isinstance(source, str) and not callable(source):
+        return None
+    try:
+        canonical_args = json.dumps(
+            None if isinstance(args, NotGiven) else args, sort_keys=True
+        )
+        hash(source)
+    except (TypeError, ValueError):
+        # Args that don't serialize can't be compared, so aren't cached
+        return None
+    return (source, canonical_args, base_dir)
+
+
 def _instantiate_one(
     spec: FlowSpec,
     task_config: TaskSpec,
     base_dir: str,
+    cache: _TaskCache | None = None,
 ) -> list[InstantiatedTask]:
-    tasks = _instantiate_task(spec, task_config, base_dir=base_dir)
+    tasks = _instantiate_task(spec, task_config, base_dir=base_dir, cache=cache)
     return [
         InstantiatedTask(
             flow_task=task_config if isinstance(task_config, FlowTask) else None,
@@ -147,46 +266,133 @@ def _instantiate_one(
     ]
 
 
-def instantiate_tasks(spec: FlowSpec, base_dir: str) -> list[InstantiatedTask]:
+def instantiate_tasks(
+    spec: FlowSpec,
+    base_dir: str,
+    described: Mapping[int, list[TaskDescription]] | None = None,
+) -> list[InstantiatedTask]:
+    """Instantiate the tasks of a resolved spec.
+
+    Args:
+        spec: The resolved flow spec.
+        base_dir: The base directory for relative task paths.
+        described: Descriptions of the tasks of flow tasks (by position in
+            `spec.tasks`) that don't need instantiating. Their tasks are
+            only built if accessed.
+    """
     task_configs = list(spec.tasks or [])
     if not task_configs:
         return []
-    cfg = _resolve_instantiate(spec)
+    cfg = resolve_instantiate(spec)
+    cache = _TaskCache() if cfg.cache_tasks else None
+    described = described or {}
+    indexed = [
+        _IndexedSpec(position, task_config)
+        for position, task_config in enumerate(task_configs)
+        if position not in described
+    ]
     with RunAction("instantiate") as action:
         progress = Progress(
             TextColumn("[progress.percentage]{task.completed}/{task.total}"),
             TextColumn("[progress.description]{task.description}"),
         )
         action.update(info=progress)
-        progress_task = progress.add_task("Instantiating", total=len(task_configs))
-        if cfg.mode == "serial":
-            results = _instantiate_serial(
-                spec, task_configs, base_dir, action, progress, progress_task
+        progress_task = progress.add_task("Instantiating", total=len(indexed))
+        if not indexed:
+            results_by_position = {}
+        elif cfg.mode == "serial":
+            results_by_position = _instantiate_serial(
+                spec, indexed, base_dir, cache, action, progress, progress_task
+            )
+        elif cfg.mode == "process":
+            results_by_position = _instantiate_process(
+                spec,
+                indexed,
+                base_dir,
+                cfg,
+                cache,
+                action,
+                progress,
+                progress_task,
             )
         else:
-            results = _instantiate_threaded(
-                spec, task_configs, base_dir, cfg, action, progress, progress_task
+            results_by_position = _instantiate_threaded(
+                spec, indexed, base_dir, cfg, cache, action, progress, progress_task
             )
-        action.update(info=f"Instantiated {len(results)} tasks")
+        for position, descriptions in described.items():
+            results_by_position[position] = _described_tasks(
+                spec, task_configs[position], base_dir, cache, descriptions
+            )
+        results = [
+            result
+            for position in sorted(results_by_position)
+            for result in results_by_position[position]
+        ]
+        num_described = sum(len(d) for d in described.values())
+        info = f"Instantiated {quantity(len(results) - num_described, 'task')}"
+        if num_described:
+            info += f", {quantity(num_described, 'task')} from the task manifest"
+        action.update(info=info)
     return results
 
 
-def _instantiate_serial(
+def build_tasks(tasks: Sequence[InstantiatedTask], spec: FlowSpec) -> None:
+    """Build the tasks that are only described (e.g. by worker processes), in threads.
+
+    Args:
+        tasks: The tasks to build. Tasks that are already built are skipped.
+        spec: The resolved flow spec.
+    """
+    unbuilt = [it for it in tasks if it.loaded_task is None]
+    if not unbuilt:
+        return
+    cfg = resolve_instantiate(spec)
+    with RunAction("instantiate") as action:
+        progress = Progress(
+            TextColumn("[progress.percentage]{task.completed}/{task.total}"),
+            TextColumn("[progress.description]{task.description}"),
+        )
+        action.update(info=progress)
+        progress_task = progress.add_task("[cyan]building[/cyan]", total=len(unbuilt))
+
+        def build(it: InstantiatedTask) -> None:
+            it.task  # noqa: B018 - builds the task
+            progress.advance(progress_task)
+
+        max_workers = max(1, min(cfg.max_threads, len(unbuilt)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures: dict[Future[None], InstantiatedTask] = {
+                executor.submit(build, it): it for it in unbuilt
+            }
+            for fut in as_completed(futures):
+                try:
+                    fut.result()
+                except BaseException:
+                    for other in futures:
+                        other.cancel()
+                    it = futures[fut]
+                    with action.error_context(
+                        it.description.info.name if it.description else "<unnamed>"
+                    ):
+                        raise
+        action.update(info=f"Built {quantity(len(unbuilt), 'task')} to run")
+
+
+def _described_tasks(
     spec: FlowSpec,
-    task_configs: list[TaskSpec],
+    task_config: TaskSpec,
     base_dir: str,
-    action: RunAction,
-    progress: Progress,
-    progress_task: Any,
+    cache: _TaskCache | None,
+    descriptions: list[TaskDescription],
 ) -> list[InstantiatedTask]:
-    results: list[InstantiatedTask] = []
-    for task_config in task_configs:
-        task_name = get_task_name(task_config)
-        with action.error_context(task_name):
-            progress.update(progress_task, description=f"[cyan]{task_name}[/cyan]")
-            results.extend(_instantiate_one(spec, task_config, base_dir))
-        progress.advance(progress_task)
-    return results
+    load = _task_loader(spec, task_config, base_dir, cache)
+    flow_task = task_config if isinstance(task_config, FlowTask) else None
+    return [
+        InstantiatedTask(
+            flow_task=flow_task, description=description, load=partial(load, index)
+        )
+        for index, description in enumerate(descriptions)
+    ]
 
 
 @dataclass(frozen=True)
@@ -195,6 +401,27 @@ class _IndexedSpec:
     spec: TaskSpec
 
 
+def _instantiate_serial(
+    spec: FlowSpec,
+    indexed: list[_IndexedSpec],
+    base_dir: str,
+    cache: _TaskCache | None,
+    action: RunAction,
+    progress: Progress,
+    progress_task: Any,
+) -> dict[int, list[InstantiatedTask]]:
+    results_by_position: dict[int, list[InstantiatedTask]] = {}
+    for item in indexed:
+        task_name = get_task_name(item.spec)
+        with action.error_context(task_name):
+            progress.update(progress_task, description=f"[cyan]{task_name}[/cyan]")
+            results_by_position[item.position] = _instantiate_one(
+                spec, item.spec, base_dir, cache
+            )
+        progress.advance(progress_task)
+    return results_by_position
+
+
 # A unit is the work given to one worker: a single spec under "parallel",
 # or all specs sharing a task name under "by_task".
 _Unit: TypeAlias = list[_IndexedSpec]
@@ -202,17 +429,14 @@ _Unit: TypeAlias = list[_IndexedSpec]
 
 def _instantiate_threaded(
     spec: FlowSpec,
-    task_configs: list[TaskSpec],
+    indexed: list[_IndexedSpec],
     base_dir: str,
     cfg: InstantiateConfig,
+    cache: _TaskCache | None,
     action: RunAction,
     progress: Progress,
     progress_task: Any,
-) -> list[InstantiatedTask]:
-    indexed = [
-        _IndexedSpec(position, task_config)
-        for position, task_config in enumerate(task_configs)
-    ]
+) -> dict[int, list[InstantiatedTask]]:
     if cfg.mode == "parallel":
         units: list[_Unit] = [[item] for item in indexed]
     else:
@@ -224,7 +448,9 @@ def _instantiate_threaded(
     def run_unit(unit: _Unit) -> dict[int, list[InstantiatedTask]]:
         unit_results: dict[int, list[InstantiatedTask]] = {}
         for item in unit:
-            unit_results[item.position] = _instantiate_one(spec, item.spec, base_dir)
+            unit_results[item.position] = _instantiate_one(
+                spec, item.spec, base_dir, cache
+            )
             progress.advance(progress_task)
         return unit_results
 
@@ -246,13 +472,185 @@ def _instantiate_threaded(
                 with action.error_context(task_name):
                     raise
 
+    return results_by_position
+
+
+# The spec, base_dir and task cache of a worker process, set by _init_worker,
+# or the error registering the parent's objects
+_worker: tuple[FlowSpec, str, _TaskCache | None] | BaseException | None = None
+
+
+def _registry_modules() -> list[str] | None:
+    """Modules that registered the objects in this process's registry.
+
+    Worker processes don't inherit the registry, so they import these to
+    register the same tasks, solvers and scorers.
+
+    Returns:
+        The modules, or `None` if an object was registered by code that can't
+        be imported (such as a flow config file).
+    """
+    modules: set[str] = set()
+    for obj in registry_find(lambda _: True):
+        func = inspect.unwrap(obj) if callable(obj) else obj
+        module = getattr(func, "__module__", None)
+        # The main module is imported by the worker itself, and task files
+        # are loaded again by the tasks that name them
+        if (
+            not module
+            or module in ("__main__", "__mp_main__")
+            or module.endswith((".py", ".ipynb"))
+        ):
+            continue
+        spec = getattr(sys.modules.get(module), "__spec__", None)
+        if spec is None or spec.name != module:
+            logger.info(f"Objects registered by {module} can't be imported")
+            return None
+        modules.add(module)
+    return sorted(modules)
+
+
+def _init_worker(
+    spec: FlowSpec, base_dir: str, cache_tasks: bool, modules: list[str]
+) -> None:
+    global _worker
+    try:
+        for module in modules:
+            importlib.import_module(module)
+    except BaseException as e:
+        # Raised by the tasks, so the error is reported against them
+        _worker = e
+        return
+    _worker = (spec, base_dir, _TaskCache() if cache_tasks else None)
+
+
+def _describe(task_config: TaskSpec) -> list[TaskDescription]:
+    """Instantiate a task spec in a worker process and describe its tasks."""
+    from inspect_flow._runner.logs import describe_task, resolve_task_ids
+
+    assert _worker is not None
+    if isinstance(_worker, BaseException):
+        raise RuntimeError(
+            f"Failed to import registered objects in worker process: {_worker}"
+        ) from _worker
+    spec, base_dir, cache = _worker
+    tasks = _instantiate_task(spec, task_config, base_dir, cache)
+    flow_task = task_config if isinstance(task_config, FlowTask) else None
     return [
-        result
-        for position in sorted(results_by_position)
-        for result in results_by_position[position]
+        describe_task(task, task_id, flow_task)
+        for task, task_id in zip(tasks, resolve_task_ids(tasks, spec), strict=True)
     ]
 
 
+def _picklable(value: object) -> bool:
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+def _mp_context() -> multiprocessing.context.BaseContext:
+    # Never fork: the display's refresh and output capture threads are
+    # running, and forking a multi-threaded process can deadlock the child
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        # The fork server is started once (single-threaded) per process and
+        # imports inspect_flow and inspect_ai, so workers fork without
+        # importing them again
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _task_loader(
+    spec: FlowSpec, task_config: TaskSpec, base_dir: str, cache: _TaskCache | None
+) -> Callable[[int], Task]:
+    """Rebuild the tasks of a spec on first use, then return them by index."""
+    tasks: list[Task] = []
+
+    def load(index: int) -> Task:
+        if not tasks:
+            tasks.extend(_instantiate_task(spec, task_config, base_dir, cache))
+        return tasks[index]
+
+    return load
+
+
+def _instantiate_process(
+    spec: FlowSpec,
+    indexed: list[_IndexedSpec],
+    base_dir: str,
+    cfg: InstantiateConfig,
+    cache: _TaskCache | None,
+    action: RunAction,
+    progress: Progress,
+    progress_task: Any,
+) -> dict[int, list[InstantiatedTask]]:
+    modules = _registry_modules()
+    if modules is None:
+        logger.warning(
+            "Instantiating tasks in threads: worker processes can't import "
+            + "some registered objects (e.g. ones defined in flow config files)"
+        )
+        return _instantiate_threaded(
+            spec,
+            indexed,
+            base_dir,
+            cfg.model_copy(update={"mode": "parallel"}),
+            cache,
+            action,
+            progress,
+            progress_task,
+        )
+    worker_spec = spec.model_copy(update={"tasks": None})
+    remote: list[_IndexedSpec] = []
+    local: list[_IndexedSpec] = []
+    send = _picklable(worker_spec)
+    for item in indexed:
+        # Task objects and specs with in-memory callables stay in this process
+        if send and not isinstance(item.spec, Task) and _picklable(item.spec):
+            remote.append(item)
+        else:
+            local.append(item)
+
+    progress.update(progress_task, description=f"[cyan]{cfg.mode}[/cyan]")
+    results_by_position: dict[int, list[InstantiatedTask]] = {}
+    for item in local:
+        with action.error_context(get_task_name(item.spec)):
+            results_by_position[item.position] = _instantiate_one(
+                spec, item.spec, base_dir, cache
+            )
+        progress.advance(progress_task)
+
+    if remote:
+        max_workers = max(1, min(cfg.max_processes or os.cpu_count() or 1, len(remote)))
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=_mp_context(),
+            initializer=_init_worker,
+            initargs=(worker_spec, base_dir, cfg.cache_tasks, modules),
+        ) as executor:
+            futures: dict[Future[list[TaskDescription]], _IndexedSpec] = {
+                executor.submit(_describe, item.spec): item for item in remote
+            }
+            for fut in as_completed(futures):
+                item = futures[fut]
+                try:
+                    descriptions = fut.result()
+                except BaseException:
+                    for other in futures:
+                        other.cancel()
+                    with action.error_context(get_task_name(item.spec)):
+                        raise
+                results_by_position[item.position] = _described_tasks(
+                    spec, item.spec, base_dir, cache, descriptions
+                )
+                progress.advance(progress_task)
+
+    return results_by_position
+
+
 def _create_model(task: FlowTask, model: FlowModel | Model) -> Model:
     if isinstance(model, Model):
         return model
@@ -366,7 +764,12 @@ def _create_solver(
     return [_create_single_solver(task, single_solver) for single_solver in solver]
 
 
-def _instantiate_task(spec: FlowSpec, flow_task: TaskSpec, base_dir: str) -> list[Task]:
+def _instantiate_task(
+    spec: FlowSpec,
+    flow_task: TaskSpec,
+    base_dir: str,
+    cache: _TaskCache | None = None,
+) -> list[Task]:
     if isinstance(flow_task, Task):
         return [flow_task]
     if (
@@ -393,7 +796,7 @@ def _instantiate_task(spec: FlowSpec, flow_task: TaskSpec, base_dir: str) -> lis
     )
     if model:
         init_active_model(model, model.config)
-    tasks = _create_task(flow_task, base_dir=base_dir)
+    tasks = _create_task(flow_task, base_dir=base_dir, cache=cache)
 
     # Try to preserve the task name provided in the flow_task, but if a file with multiple tasks is provided need to use the default names to ensure there are not duplicates.
     task_name = flow_task.name if len(tasks) == 1 else NOT_GIVEN
@@ -463,7 +866,17 @@ def _instantiate_task(spec: FlowSpec, flow_task: TaskSpec, base_dir: str) -> lis
     return tasks
 
 
-def _create_task(task: FlowTask, base_dir: str) -> list[Task]:
+def _create_task(
+    task: FlowTask, base_dir: str, cache: _TaskCache | None = None
+) -> list[Task]:
+    if cache is None:
+        return _load_task(task, base_dir)
+    return cache.get(
+        _task_cache_key(task, base_dir), partial(_load_task, task, base_dir)
+    )
+
+
+def _load_task(task: FlowTask, base_dir: str) -> list[Task]:
     result = _call_factory(task.factory, task.args, task.name)
     if isinstance(result, Task):
         return [result]
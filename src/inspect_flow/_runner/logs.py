@@ -8,7 +8,6 @@ from inspect_ai._eval.eval import eval_resolve_tasks
 from inspect_ai._eval.evalset import (
     EvalSetArgsInTaskIdentifier,
     Log,
-    list_all_eval_logs,
     task_identifier,
 )
 from inspect_ai._eval.task.task import resolve_epochs
@@ -22,14 +21,20 @@ from inspect_flow._display.display import DisplayMode
 from inspect_flow._display.path_progress import ReadLogsProgress
 from inspect_flow._display.run_action import RunAction
 from inspect_flow._runner.instantiate import InstantiatedTask
-from inspect_flow._runner.task_log import TaskLogInfo
+from inspect_flow._runner.task_log import (
+    TaskDescription,
+    TaskLogInfo,
+    task_to_task_info,
+)
 from inspect_flow._store.store import FlowStoreInternal
 from inspect_flow._types.flow_types import (
     FlowOptions,
     FlowSpec,
     FlowTask,
 )
+from inspect_flow._types.lazy_dataset import dataset_samples
 from inspect_flow._util.console import quantity
+from inspect_flow._util.header_cache import list_logs_with_headers
 from inspect_flow._util.logs import num_valid_samples, samples_complete
 from inspect_flow._util.not_given import default_none
 from inspect_flow._util.path_util import path_join, path_str
@@ -53,7 +58,7 @@ class FindLogsResult(NamedTuple):
 def _task_to_json(info: TaskLogInfo) -> dict[str, Any]:
     complete = info.task_samples is not None and info.log_samples >= info.task_samples
     return {
-        "name": info.task.name,
+        "name": info.name,
         "log_file": info.eval_log.location if info.eval_log else None,
         "samples": info.log_samples,
         "total_samples": info.task_samples,
@@ -77,16 +82,15 @@ def find_logs_result_to_json(result: FindLogsResult, log_dir: str) -> dict[str,
     }
 
 
-def get_task_ids_to_tasks(
-    tasks: list[InstantiatedTask], spec: FlowSpec
-) -> dict[str, InstantiatedTask]:
+def resolve_task_ids(tasks: list[Task], spec: FlowSpec) -> list[str]:
+    """Task identifiers of tasks, as `eval_set` computes them."""
     if not tasks:
-        return dict()
+        return []
 
     options = spec.options or FlowOptions()
 
     resolved_tasks, _ = eval_resolve_tasks(
-        tasks=[t.task for t in tasks],
+        tasks=tasks,
         task_args=dict(),
         models=[get_model("none")],
         model_roles=None,
@@ -95,29 +99,56 @@ def get_task_ids_to_tasks(
         sandbox=default_none(options.sandbox),
         sample_shuffle=default_none(options.sample_shuffle),
     )
-
-    task_ids: dict[str, InstantiatedTask] = dict()
-    for i, resolved_task in enumerate(resolved_tasks):
-        task_id = task_identifier(
+    return [
+        task_identifier(
             task=resolved_task,
             eval_set_args=EvalSetArgsInTaskIdentifier(config=GenerateConfig()),
         )
+        for resolved_task in resolved_tasks
+    ]
+
+
+def get_task_ids_to_tasks(
+    tasks: list[InstantiatedTask], spec: FlowSpec
+) -> dict[str, InstantiatedTask]:
+    if not tasks:
+        return dict()
+
+    # Tasks instantiated in a worker process carry their identifier, so only
+    # the tasks instantiated here need resolving
+    to_resolve = [t for t in tasks if t.description is None]
+    resolved_ids = iter(resolve_task_ids([t.task for t in to_resolve], spec))
+
+    task_ids: dict[str, InstantiatedTask] = dict()
+    for it in tasks:
+        task_id = it.description.task_id if it.description else next(resolved_ids)
         if task_id in task_ids:
-            flow_task = tasks[i].flow_task
+            flow_task = it.flow_task
             if isinstance(flow_task, FlowTask):
                 task_json = model_dump(flow_task)
                 raise ValueError(f"Duplicate task found: {task_json}")
             else:
-                raise ValueError(f"Duplicate task found: {resolved_task}")
+                raise ValueError(f"Duplicate task found: {it.task}")
 
-        task_ids[task_id] = tasks[i]
+        task_ids[task_id] = it
     return task_ids
 
 
 def _num_samples(task: Task, limit: int | tuple[int, int] | None) -> int:
     epochs = resolve_epochs(task.epochs)
     epoch_count = epochs.epochs if epochs else 1
-    count = len(task.dataset)
+    return _limit_samples(dataset_samples(task.dataset), epoch_count, limit)
+
+
+def _task_samples(it: InstantiatedTask, limit: int | tuple[int, int] | None) -> int:
+    if it.description:
+        return description_samples(it.description, limit)
+    return _num_samples(it.task, limit)
+
+
+def _limit_samples(
+    count: int, epoch_count: int, limit: int | tuple[int, int] | None
+) -> int:
     if isinstance(limit, tuple):
         start, stop = limit
         if start >= count:
@@ -129,16 +160,59 @@ def _num_samples(task: Task, limit: int | tuple[int, int] | None) -> int:
     return count * epoch_count
 
 
+def task_epochs(task: Task) -> tuple[int | None, list[str] | None]:
+    """Epoch count (`None` if the task doesn't set one) and reducer names of a task."""
+    epochs = resolve_epochs(
+        Epochs(task.epochs, reducer=task.epochs_reducer)
+        if task.epochs and task.epochs_reducer
+        else task.epochs
+    )
+    if epochs is None:
+        return None, None
+    reducer = (
+        [reducer_log_name(r) for r in epochs.reducer]
+        if epochs.reducer is not None
+        else None
+    )
+    return epochs.epochs, reducer
+
+
+def describe_task(
+    task: Task, task_id: str, flow_task: FlowTask | None
+) -> TaskDescription:
+    epochs, reducer = task_epochs(task)
+    return TaskDescription(
+        task_id=task_id,
+        info=task_to_task_info(task, flow_task),
+        dataset_samples=dataset_samples(task.dataset),
+        epochs=epochs,
+        epochs_reducer=reducer,
+    )
+
+
+def description_samples(
+    description: TaskDescription, limit: int | tuple[int, int] | None
+) -> int:
+    return _limit_samples(description.dataset_samples, description.epochs or 1, limit)
+
+
 def _epochs_reducer_changed(epochs: Epochs | None, config: EvalConfig) -> bool:
     # user didn't say anything about epochs on subsequent call (not changed)
     if epochs is None:
         return False
+    return _reducer_changed(
+        [reducer_log_name(r) for r in epochs.reducer]
+        if epochs.reducer is not None
+        else None,
+        config,
+    )
+
+
+def _reducer_changed(reducer: list[str] | None, config: EvalConfig) -> bool:
     default_epoch_reducer = ["mean"]
-    if epochs.reducer is None and config.epochs_reducer == default_epoch_reducer:
+    if reducer is None and config.epochs_reducer == default_epoch_reducer:
         return False
-    return [reducer_log_name(r) for r in (epochs.reducer or [])] != [
-        r for r in (config.epochs_reducer or [])
-    ]
+    return (reducer or []) != (config.epochs_reducer or [])
 
 
 def num_log_samples(
@@ -147,15 +221,16 @@ def num_log_samples(
     log_samples = num_valid_samples(header)
     if log_samples == 0:
         return 0
-    task = log_info.task
-    epochs = resolve_epochs(
-        Epochs(task.epochs, reducer=task.epochs_reducer)
-        if task.epochs and task.epochs_reducer
-        else task.epochs
-    )
-    if _epochs_reducer_changed(epochs, header.eval.config):
+    if log_info.description:
+        epochs = log_info.description.epochs
+        reducer = log_info.description.epochs_reducer
+    else:
+        assert log_info.task
+        epochs, reducer = task_epochs(log_info.task)
+    # user didn't say anything about epochs on subsequent call (not changed)
+    if epochs is not None and _reducer_changed(reducer, header.eval.config):
         return 0
-    epoch_count = epochs.epochs if epochs else 1
+    epoch_count = epochs or 1
     log_epoch_count = header.eval.config.epochs or 1
     if log_epoch_count <= epoch_count:
         return log_samples
@@ -174,7 +249,7 @@ def find_existing_logs(
     with RunAction("logs") as action:
         assert spec.log_dir
         with ReadLogsProgress(action=action) as progress:
-            logs = list_all_eval_logs(log_dir=spec.log_dir, progress=progress)
+            logs = list_logs_with_headers(log_dir=spec.log_dir, progress=progress)
         num_found = 0
         options = spec.options or FlowOptions()
         limit = default_none(options.limit)
@@ -201,9 +276,10 @@ def find_existing_logs(
 
         result = {
             id: TaskLogInfo(
-                task=it.task,
+                task=it.loaded_task,
                 flow_task=it.flow_task,
-                task_samples=_num_samples(it.task, limit),
+                task_samples=_task_samples(it, limit),
+                description=it.description,
             )
             for id, it in task_id_to_task.items()
         }
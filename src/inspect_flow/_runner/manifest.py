@@ -0,0 +1,253 @@
+"""Task manifest written to the log directory by `flow run`.
+
+For each flow task the manifest records a fingerprint of its resolved config
+and the description of the tasks it instantiated to (task identifier, display
+info, dataset size and epochs). With `InstantiateConfig(skip_complete=True)`,
+a later run, dry run or check that finds a flow task with a known fingerprint
+whose logs are already complete uses the recorded description instead of
+calling the task's factories. `flow check --from-manifest` uses the descriptions of
+every task, so it only reads log headers.
+"""
+
+import hashlib
+import json
+from importlib.metadata import version
+from logging import getLogger
+from typing import Any, NamedTuple
+
+from inspect_ai._util.error import PrerequisiteError
+from inspect_ai._util.file import file, filesystem
+from inspect_ai.model import GenerateConfig
+
+from inspect_flow._runner.instantiate import (
+    InstantiatedTask,
+    TaskSpec,
+    get_task_name,
+    resolve_instantiate,
+)
+from inspect_flow._runner.logs import (
+    describe_task,
+    description_samples,
+    num_log_samples,
+)
+from inspect_flow._runner.task_log import TaskDescription, TaskInfo, TaskLogInfo
+from inspect_flow._types.flow_types import FlowOptions, FlowSpec, FlowTask
+from inspect_flow._util.console import flow_print, quantity
+from inspect_flow._util.header_cache import list_logs_with_headers
+from inspect_flow._util.not_given import default_none
+from inspect_flow._util.path_util import path_join, path_str
+from inspect_flow._util.pydantic_util import model_dump
+
+logger = getLogger(__name__)
+
+MANIFEST_FILE = "flow-tasks.json"
+MANIFEST_VERSION = 1
+
+
+class TaskManifest(NamedTuple):
+    spec: str | None
+    """Fingerprint of the spec that wrote the manifest."""
+
+    versions: dict[str, str]
+    """Versions of inspect_ai and inspect_flow that wrote the manifest."""
+
+    tasks: dict[str, list[TaskDescription]]
+    """Task descriptions by flow task fingerprint."""
+
+
+def task_fingerprint(
+    task_config: TaskSpec, spec: FlowSpec, base_dir: str
+) -> str | None:
+    """Fingerprint of a resolved flow task and the spec options its identifier depends on.
+
+    Returns `None` for tasks that can't be fingerprinted (e.g. ones with
+    in-memory factories or objects), which are always instantiated.
+    """
+    if not isinstance(task_config, FlowTask):
+        return None
+    options = spec.options or FlowOptions()
+    try:
+        payload = json.dumps(
+            {
+                "task": task_config.model_dump(
+                    mode="json", exclude_unset=True, exclude_defaults=True
+                ),
+                "approval": default_none(options.approval),
+                "sandbox": default_none(options.sandbox),
+                "sample_shuffle": default_none(options.sample_shuffle),
+                "base_dir": base_dir,
+            },
+            sort_keys=True,
+        )
+    except (TypeError, ValueError):
+        return None
+    return _hash(payload)
+
+
+def spec_fingerprint(spec: FlowSpec) -> str:
+    """Fingerprint of a resolved spec, ignoring where and by which Python it ran."""
+    dump = model_dump(spec, exclude={"log_dir", "python_version", "internal"})
+    return _hash(json.dumps(dump, sort_keys=True, default=str))
+
+
+def _hash(payload: str) -> str:
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _versions() -> dict[str, str]:
+    return {
+        "inspect_ai": version("inspect_ai"),
+        "inspect_flow": version("inspect_flow"),
+    }
+
+
+def _description_to_json(description: TaskDescription) -> dict[str, Any]:
+    info = {
+        **description.info.__dict__,
+        "config": description.info.config.model_dump(mode="json", exclude_none=True),
+    }
+    return {**description.__dict__, "info": info}
+
+
+def _description_from_json(data: dict[str, Any]) -> TaskDescription:
+    info = {
+        **data["info"],
+        "config": GenerateConfig.model_validate(data["info"]["config"]),
+    }
+    return TaskDescription(**{**data, "info": TaskInfo(**info)})
+
+
+def read_manifest(log_dir: str) -> TaskManifest | None:
+    """The task manifest in a log directory, or `None` if there is no readable one."""
+    manifest_file = path_join(log_dir, MANIFEST_FILE)
+    try:
+        if not filesystem(manifest_file).exists(manifest_file):
+            return None
+        with file(manifest_file, "r") as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION:
+            return None
+        return TaskManifest(
+            spec=data.get("spec"),
+            versions=data.get("versions", {}),
+            tasks={
+                fingerprint: [_description_from_json(d) for d in descriptions]
+                for fingerprint, descriptions in data["tasks"].items()
+            },
+        )
+    except Exception as e:
+        logger.info(f"Ignoring task manifest {path_str(manifest_file)}: {e}")
+        return None
+
+
+def write_manifest(
+    log_dir: str,
+    task_id_to_task: dict[str, InstantiatedTask],
+    spec: FlowSpec,
+    base_dir: str,
+) -> None:
+    tasks: dict[str, list[dict[str, Any]]] = {}
+    for task_id, it in task_id_to_task.items():
+        fingerprint = (
+            task_fingerprint(it.flow_task, spec, base_dir) if it.flow_task else None
+        )
+        if fingerprint is None:
+            continue
+        description = it.description or describe_task(it.task, task_id, it.flow_task)
+        tasks.setdefault(fingerprint, []).append(_description_to_json(description))
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "spec": spec_fingerprint(spec),
+        "versions": _versions(),
+        "tasks": tasks,
+    }
+    # The manifest only saves work on later checks, so failing to write it
+    # mustn't stop the run
+    manifest_file = path_join(log_dir, MANIFEST_FILE)
+    try:
+        contents = json.dumps(manifest, indent=2)
+        with file(manifest_file, "w") as f:
+            f.write(contents)
+    except Exception as e:
+        logger.warning(f"Not writing task manifest {path_str(manifest_file)}: {e}")
+
+
+def complete_tasks(spec: FlowSpec, base_dir: str) -> dict[int, list[TaskDescription]]:
+    """Descriptions of the flow tasks (by position) whose logs are complete.
+
+    Uses the manifest in the log directory, so flow tasks it doesn't know
+    about (or whose config changed) are never included.
+    """
+    if not spec.log_dir or not resolve_instantiate(spec).skip_complete:
+        return {}
+    manifest = read_manifest(spec.log_dir)
+    # Task identifiers are computed by inspect_ai, so a manifest written by
+    # other versions may not match
+    if manifest is None or manifest.versions != _versions():
+        return {}
+    candidates: dict[int, list[TaskDescription]] = {}
+    for position, task_config in enumerate(spec.tasks or []):
+        fingerprint = task_fingerprint(task_config, spec, base_dir)
+        if fingerprint in manifest.tasks:
+            candidates[position] = manifest.tasks[fingerprint]
+    if not candidates:
+        return {}
+
+    limit = default_none((spec.options or FlowOptions()).limit)
+    complete_ids: set[str] = set()
+    descriptions = {d.task_id: d for ds in candidates.values() for d in ds}
+    for log in list_logs_with_headers(spec.log_dir):
+        description = descriptions.get(log.task_identifier)
+        if description is None or log.header.status != "success":
+            continue
+        log_samples = num_log_samples(
+            log.header, TaskLogInfo(description=description), limit
+        )
+        if log_samples >= description_samples(description, limit):
+            complete_ids.add(description.task_id)
+
+    return {
+        position: ds
+        for position, ds in candidates.items()
+        if all(d.task_id in complete_ids for d in ds)
+    }
+
+
+def manifest_tasks(spec: FlowSpec, base_dir: str) -> dict[int, list[TaskDescription]]:
+    """Descriptions of every flow task (by position) from the task manifest.
+
+    Raises:
+        PrerequisiteError: If there is no manifest or it doesn't describe
+            every flow task.
+    """
+    assert spec.log_dir
+    manifest = read_manifest(spec.log_dir)
+    if manifest is None:
+        raise PrerequisiteError(
+            f"No task manifest ({MANIFEST_FILE}) found in '{path_str(spec.log_dir)}'. "
+            + "Task manifests are written by `flow run`."
+        )
+    if manifest.versions != _versions():
+        written_by = ", ".join(f"{k} {v}" for k, v in manifest.versions.items())
+        flow_print(
+            f"Task manifest was written by {written_by}: task identifiers may not match",
+            format="warning",
+        )
+    if manifest.spec != spec_fingerprint(spec):
+        logger.info("Spec has changed since the task manifest was written")
+
+    described: dict[int, list[TaskDescription]] = {}
+    missing: list[str] = []
+    for position, task_config in enumerate(spec.tasks or []):
+        fingerprint = task_fingerprint(task_config, spec, base_dir)
+        if fingerprint in manifest.tasks:
+            described[position] = manifest.tasks[fingerprint]
+        else:
+            missing.append(get_task_name(task_config))
+    if missing:
+        raise PrerequisiteError(
+            f"The task manifest in '{path_str(spec.log_dir)}' doesn't describe "
+            + f"{quantity(len(missing), 'task')} of the spec: {', '.join(missing)}. "
+            + "Check without --from-manifest, or run the spec to update the manifest."
+        )
+    return described
@@ -10,8 +10,17 @@ from typing import NamedTuple
 import click
 from inspect_ai import eval_set
 from inspect_ai._display.textual.app import set_flow_content
-from inspect_ai._eval.evalset import list_all_eval_logs, task_identifier
+from inspect_ai._eval.evalset import (
+    EvalSet,
+    EvalSetTask,
+    eval_set_id_for_log_dir,
+    list_all_eval_logs,
+    read_eval_set_info,
+    task_identifier,
+)
 from inspect_ai._util.error import PrerequisiteError
+from inspect_ai._util.file import file
+from inspect_ai._util.json import to_json_safe
 from inspect_ai.log import EvalLog
 from inspect_ai.util import DisplayType
 from inspect_ai.util._display import init_display_type
@@ -27,13 +36,18 @@ from inspect_flow._config.write import write_config_file
 from inspect_flow._display.display import display, get_display_type
 from inspect_flow._display.path_progress import ReadLogsProgress
 from inspect_flow._display.run_action import RunAction
-from inspect_flow._runner.instantiate import InstantiatedTask, instantiate_tasks
+from inspect_flow._runner.instantiate import (
+    InstantiatedTask,
+    build_tasks,
+    instantiate_tasks,
+)
 from inspect_flow._runner.logs import (
     FindLogsResult,
     find_existing_logs,
     get_task_ids_to_tasks,
     num_log_samples,
 )
+from inspect_flow._runner.manifest import complete_tasks, write_manifest
 from inspect_flow._runner.resolve import resolve_spec
 from inspect_flow._runner.scanner import resolve_scanner
 from inspect_flow._runner.task_log import TaskLogInfo, create_task_log_display
@@ -51,10 +65,16 @@ from inspect_flow._util.list_util import sequence_to_list
 from inspect_flow._util.logging import get_last_log_level, update_log_level
 from inspect_flow._util.module_util import execute_file_and_get_last_result
 from inspect_flow._util.not_given import default, default_none
-from inspect_flow._util.path_util import apply_bundle_url_mappings, cwd_relative_path
+from inspect_flow._util.path_util import (
+    apply_bundle_url_mappings,
+    cwd_relative_path,
+    path_join,
+)
 
 logger = getLogger(__name__)
 
+EVAL_SET_FILE = "eval-set.json"
+
 
 class LaunchResult(NamedTuple):
     success: bool
@@ -74,6 +94,8 @@ class _RunContext:
     display_type: DisplayType
     log_level: str
     tasks: list[InstantiatedTask]
+    to_run: list[InstantiatedTask]
+    reused: list[EvalLog]
     logs_result: FindLogsResult
     store: FlowStoreInternal | None
     store_config: FlowStoreConfig | None
@@ -89,7 +111,13 @@ def _prepare_run(spec: FlowSpec, base_dir: str, dry_run: bool) -> _RunContext:
     log_level = options.log_level or get_last_log_level()
 
     _load_preload_files(resolved_spec)
-    tasks = instantiate_tasks(resolved_spec, base_dir=base_dir)
+    # Complete tasks known to the task manifest are described rather than
+    # instantiated, and runs leave them out of the eval set
+    tasks = instantiate_tasks(
+        resolved_spec,
+        base_dir=base_dir,
+        described=complete_tasks(resolved_spec, base_dir=base_dir),
+    )
     task_id_to_task = get_task_ids_to_tasks(tasks=tasks, spec=resolved_spec)
     store = store_factory(resolved_spec, base_dir=base_dir, create=True)
     store_config = (
@@ -109,19 +137,26 @@ def _prepare_run(spec: FlowSpec, base_dir: str, dry_run: bool) -> _RunContext:
 
     if not dry_run:
         write_config_file(resolved_spec)
+        write_manifest(resolved_spec.log_dir, task_id_to_task, resolved_spec, base_dir)
 
     logs_result = find_existing_logs(
-        task_id_to_task,
+        dict(task_id_to_task),
         resolved_spec,
         store if (store_config is not None and store_config.read) else None,
         mode="dry_run" if dry_run else "run",
     )
+    to_run, reused = _split_reused(task_id_to_task, logs_result)
+    if not dry_run:
+        # Only the tasks that run are built
+        build_tasks(to_run, resolved_spec)
     return _RunContext(
         spec=resolved_spec,
         options=options,
         display_type=display_type,
         log_level=log_level,
         tasks=tasks,
+        to_run=to_run,
+        reused=reused,
         logs_result=logs_result,
         store=store,
         store_config=store_config,
@@ -129,11 +164,23 @@ def _prepare_run(spec: FlowSpec, base_dir: str, dry_run: bool) -> _RunContext:
 
 
 def dry_run_eval_set(spec: FlowSpec, base_dir: str) -> FindLogsResult:
-    return _prepare_run(spec, base_dir=base_dir, dry_run=True).logs_result
+    ctx = _prepare_run(spec, base_dir=base_dir, dry_run=True)
+    if ctx.store:
+        ctx.store.flush()
+    return ctx.logs_result
 
 
 def run_eval_set(spec: FlowSpec, base_dir: str, dry_run: bool = False) -> LaunchResult:
     ctx = _prepare_run(spec, base_dir=base_dir, dry_run=dry_run)
+    try:
+        return _run_eval_set(ctx, dry_run=dry_run)
+    finally:
+        # Commit the logs spooled by this run before the runner exits
+        if ctx.store:
+            ctx.store.flush()
+
+
+def _run_eval_set(ctx: _RunContext, dry_run: bool) -> LaunchResult:
     resolved_spec = ctx.spec
     assert resolved_spec.log_dir
     options = ctx.options
@@ -166,78 +213,90 @@ def run_eval_set(spec: FlowSpec, base_dir: str, dry_run: bool = False) -> Launch
 
     update_log_level(ctx.log_level)
 
-    eval_tasks = run_after_instantiate_hooks([t.task for t in ctx.tasks])
+    reused = ctx.reused
+    eval_tasks = run_after_instantiate_hooks([t.task for t in ctx.to_run])
 
     start_time = time.time()
     result: LaunchResult | None
     try:
-        success, logs = eval_set(
-            tasks=eval_tasks,
-            log_dir=cwd_relative_path(resolved_spec.log_dir),
-            retry_attempts=default_none(options.retry_attempts),
-            retry_wait=default_none(options.retry_wait),
-            retry_connections=default_none(options.retry_connections),
-            retry_cleanup=default_none(options.retry_cleanup),
-            # model= FlowTask
-            # model_base_url= FlowModel
-            # model_args= FlowModel
-            # model_roles= FlowTask
-            # task_args= FlowTask
-            sandbox=default_none(options.sandbox),
-            sandbox_cleanup=default_none(options.sandbox_cleanup),
-            checkpoint=default_none(options.checkpoint),
-            acp_server=default_none(options.acp_server),
-            ctl_server=default_none(options.ctl_server),
-            # solver= FlowTask
-            scanner=resolve_scanner(default_none(options.scanner)),
-            tags=sequence_to_list(default_none(options.tags)),
-            metadata=default_none(options.metadata),
-            trace=default_none(options.trace),
-            display=default_none(ctx.display_type),
-            approval=default_none(options.approval),
-            notification=default_none(options.notification),
-            score=default(options.score, True),
-            score_display=default_none(options.score_display),
-            log_level=default_none(ctx.log_level),
-            log_level_transcript=default_none(options.log_level_transcript),
-            log_format=default_none(options.log_format),
-            limit=default_none(options.limit),
-            # sample_id= FlowTask
-            sample_shuffle=default_none(options.sample_shuffle),
-            # epochs= FlowTask
-            fail_on_error=default_none(options.fail_on_error),
-            continue_on_fail=default_none(options.continue_on_fail),
-            retry_on_error=default(options.retry_on_error, 3),
-            score_on_error=default_none(options.score_on_error),
-            debug_errors=default_none(options.debug_errors),
-            # message_limit= FlowTask
-            # token_limit= FlowTask
-            # turn_limit= FlowTask
-            # time_limit= FlowTask
-            # working_limit= FlowTask
-            # cost_limit= FlowTask
-            model_cost_config=default_none(options.model_cost_config),
-            max_samples=default_none(options.max_samples),
-            max_dataset_memory=default_none(options.max_dataset_memory),
-            max_tasks=default(options.max_tasks, 10),
-            max_subprocesses=default_none(options.max_subprocesses),
-            max_sandboxes=default_none(options.max_sandboxes),
-            log_samples=default_none(options.log_samples),
-            log_realtime=default_none(options.log_realtime),
-            log_images=default_none(options.log_images),
-            log_model_api=default_none(options.log_model_api),
-            log_refusals=default_none(options.log_refusals),
-            log_buffer=default_none(options.log_buffer),
-            log_shared=default_none(options.log_shared),
-            bundle_dir=default_none(options.bundle_dir),
-            bundle_overwrite=default(options.bundle_overwrite, False),
-            log_dir_allow_dirty=default_none(options.log_dir_allow_dirty),
-            eval_set_id=default_none(options.eval_set_id),
-            embed_viewer=default(options.embed_viewer, False),
-            retry_immediate=True,
-            # kwargs= FlowSpec, FlowTask, and FlowModel allow setting the generate config
-        )
-        result = LaunchResult(success=success, logs=logs)
+        if eval_tasks:
+            success, logs = eval_set(
+                tasks=eval_tasks,
+                log_dir=cwd_relative_path(resolved_spec.log_dir),
+                retry_attempts=default_none(options.retry_attempts),
+                retry_wait=default_none(options.retry_wait),
+                retry_connections=default_none(options.retry_connections),
+                retry_cleanup=default_none(options.retry_cleanup),
+                # model= FlowTask
+                # model_base_url= FlowModel
+                # model_args= FlowModel
+                # model_roles= FlowTask
+                # task_args= FlowTask
+                sandbox=default_none(options.sandbox),
+                sandbox_cleanup=default_none(options.sandbox_cleanup),
+                checkpoint=default_none(options.checkpoint),
+                acp_server=default_none(options.acp_server),
+                ctl_server=default_none(options.ctl_server),
+                # solver= FlowTask
+                scanner=resolve_scanner(default_none(options.scanner)),
+                tags=sequence_to_list(default_none(options.tags)),
+                metadata=default_none(options.metadata),
+                trace=default_none(options.trace),
+                display=default_none(ctx.display_type),
+                approval=default_none(options.approval),
+                notification=default_none(options.notification),
+                score=default(options.score, True),
+                score_display=default_none(options.score_display),
+                log_level=default_none(ctx.log_level),
+                log_level_transcript=default_none(options.log_level_transcript),
+                log_format=default_none(options.log_format),
+                limit=default_none(options.limit),
+                # sample_id= FlowTask
+                sample_shuffle=default_none(options.sample_shuffle),
+                # epochs= FlowTask
+                fail_on_error=default_none(options.fail_on_error),
+                continue_on_fail=default_none(options.continue_on_fail),
+                retry_on_error=default(options.retry_on_error, 3),
+                score_on_error=default_none(options.score_on_error),
+                debug_errors=default_none(options.debug_errors),
+                # message_limit= FlowTask
+                # token_limit= FlowTask
+                # turn_limit= FlowTask
+                # time_limit= FlowTask
+                # working_limit= FlowTask
+                # cost_limit= FlowTask
+                model_cost_config=default_none(options.model_cost_config),
+                max_samples=default_none(options.max_samples),
+                max_dataset_memory=default_none(options.max_dataset_memory),
+                max_tasks=default(options.max_tasks, 10),
+                max_subprocesses=default_none(options.max_subprocesses),
+                max_sandboxes=default_none(options.max_sandboxes),
+                log_samples=default_none(options.log_samples),
+                log_realtime=default_none(options.log_realtime),
+                log_images=default_none(options.log_images),
+                log_model_api=default_none(options.log_model_api),
+                log_refusals=default_none(options.log_refusals),
+                log_buffer=default_none(options.log_buffer),
+                log_shared=default_none(options.log_shared),
+                bundle_dir=default_none(options.bundle_dir),
+                bundle_overwrite=default(options.bundle_overwrite, False),
+                # Flow has checked that every log in the log directory belongs
+                # to a task of the spec, but eval_set only sees those it runs
+                log_dir_allow_dirty=True
+                if reused
+                else default_none(options.log_dir_allow_dirty),
+                eval_set_id=default_none(options.eval_set_id),
+                embed_viewer=default(options.embed_viewer, False),
+                retry_immediate=True,
+                # kwargs= FlowSpec, FlowTask, and FlowModel allow setting the generate config
+            )
+        else:
+            success, logs = True, []
+        if reused:
+            _add_reused_to_eval_set(
+                resolved_spec.log_dir, default_none(options.eval_set_id), reused
+            )
+        result = LaunchResult(success=success, logs=[*logs, *reused])
     except (KeyboardInterrupt, click.Abort):
         flow_print(Rule("Eval Set Interrupted"))
         result = None
@@ -278,6 +337,59 @@ def run_eval_set(spec: FlowSpec, base_dir: str, dry_run: bool = False) -> Launch
     return result
 
 
+def _split_reused(
+    task_id_to_task: dict[str, InstantiatedTask], logs_result: FindLogsResult
+) -> tuple[list[InstantiatedTask], list[EvalLog]]:
+    """Split the tasks into those to pass to eval_set and the logs of those left out.
+
+    Complete tasks that weren't built (because the task manifest or a worker
+    process describes them) are left out, so they are never built.
+    """
+    to_run: list[InstantiatedTask] = []
+    reused: list[EvalLog] = []
+    for task_id, it in task_id_to_task.items():
+        info = logs_result.task_log_info[task_id]
+        log = info.eval_log
+        if (
+            it.loaded_task is None
+            and info.is_complete
+            and log is not None
+            and log.status == "success"
+        ):
+            reused.append(log)
+        else:
+            to_run.append(it)
+    return to_run, reused
+
+
+def _add_reused_to_eval_set(
+    log_dir: str, eval_set_id: str | None, logs: list[EvalLog]
+) -> None:
+    """Add the tasks of reused logs to the eval set info written by eval_set."""
+    eval_set = read_eval_set_info(log_dir) or EvalSet(
+        eval_set_id=eval_set_id_for_log_dir(log_dir, eval_set_id), tasks=[]
+    )
+    listed = {task.task_id for task in eval_set.tasks}
+    tasks = [
+        EvalSetTask(
+            name=log.eval.task,
+            task_id=log.eval.task_id,
+            task_file=log.eval.task_file,
+            task_args=log.eval.task_args,
+            model=log.eval.model,
+            model_args=log.eval.model_args,
+            model_roles={k: v.model for k, v in log.eval.model_roles.items()}
+            if log.eval.model_roles
+            else None,
+            sequence=len(eval_set.tasks) + i,
+        )
+        for i, log in enumerate(log for log in logs if log.eval.task_id not in listed)
+    ]
+    eval_set.tasks.extend(tasks)
+    with file(path_join(log_dir, EVAL_SET_FILE), "wb") as f:
+        f.write(to_json_safe(eval_set))
+
+
 def _print_result(
     spec: FlowSpec,
     result: LaunchResult,
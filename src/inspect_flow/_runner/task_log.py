@@ -26,16 +26,6 @@ class TaskLogDisplay(NamedTuple):
     summary: RenderableType
 
 
-@dataclass
-class TaskLogInfo:
-    task: Task
-    flow_task: FlowTask | None = None
-    task_samples: int | None = None
-    eval_log: EvalLog | None = None
-    log_samples: int = 0
-    duplicate_logs: list[str] = field(default_factory=list)
-
-
 @dataclass
 class TaskInfo:
     """Abstract task info for qualifier computation.
@@ -60,15 +50,58 @@ class TaskInfo:
     config: GenerateConfig = field(default_factory=GenerateConfig)
 
 
+@dataclass
+class TaskDescription:
+    """Picklable summary of an instantiated task.
+
+    Returned by worker processes under `'process'` instantiation, so the
+    runner can match logs and count samples without the full `Task`.
+    """
+
+    task_id: str
+    info: TaskInfo
+    dataset_samples: int
+    epochs: int | None = None
+    epochs_reducer: list[str] | None = None
+
+
+@dataclass
+class TaskLogInfo:
+    task: Task | None = None
+    flow_task: FlowTask | None = None
+    task_samples: int | None = None
+    eval_log: EvalLog | None = None
+    log_samples: int = 0
+    duplicate_logs: list[str] = field(default_factory=list)
+    description: TaskDescription | None = None
+
+    @property
+    def is_complete(self) -> bool:
+        return self.task_samples is not None and self.log_samples >= self.task_samples
+
+    @property
+    def name(self) -> str:
+        if self.description:
+            return self.description.info.name
+        assert self.task
+        return self.task.name
+
+
 def task_log_to_task_info(info: TaskLogInfo) -> TaskInfo:
-    task = info.task
+    if info.description:
+        return info.description.info
+    assert info.task
+    return task_to_task_info(info.task, info.flow_task)
+
+
+def task_to_task_info(task: Task, flow_task: FlowTask | None) -> TaskInfo:
     solver_ri = registry_info(task.solver)
     flow_args = None
-    if info.flow_task:
-        if isinstance(info.flow_task.factory, FlowFactory):
-            flow_args = info.flow_task.factory.args
+    if flow_task:
+        if isinstance(flow_task.factory, FlowFactory):
+            flow_args = flow_task.factory.args
         else:
-            flow_args = info.flow_task.args
+            flow_args = flow_task.args
     return TaskInfo(
         name=task.name,
         model=str(task.model) if task.model else None,
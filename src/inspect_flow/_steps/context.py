@@ -6,11 +6,11 @@ from typing import Iterator, cast
 
 from inspect_ai._util._async import run_coroutine, tg_collect
 from inspect_ai.log import EvalLog, write_eval_log
-from inspect_ai.log._file import read_eval_log_async
 
 from inspect_flow._display.path_progress import ReadLogsProgress
 from inspect_flow._store.store import FlowStore
 from inspect_flow._util.console import console
+from inspect_flow._util.header_cache import evict_header_cache, read_header_async
 
 
 @dataclass
@@ -48,7 +48,7 @@ def read_log_headers(paths: list[str]) -> list[EvalLog]:
     async def _read_log_headers() -> list[EvalLog]:
         async def _read(path: str) -> EvalLog | None:
             try:
-                log = await read_eval_log_async(path, header_only=True)
+                log = (await read_header_async(path)).header
             except Exception:
                 console.print(f"[red]Could not read log {path}[/red]")
                 return None
@@ -63,7 +63,9 @@ def read_log_headers(paths: list[str]) -> list[EvalLog]:
 
     with ReadLogsProgress() as progress:
         progress.before_reading_logs(len(paths))
-        return run_coroutine(_read_log_headers())
+        headers = run_coroutine(_read_log_headers())
+    evict_header_cache()
+    return headers
 
 
 @contextmanager
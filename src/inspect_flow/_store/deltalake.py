@@ -1,44 +1,69 @@
+import hashlib
 import json
 import os
+import time
+from bisect import bisect_left
+from collections import Counter
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from functools import partial
 from logging import getLogger
 from pathlib import Path
-from typing import Any, NamedTuple, Sequence
+from typing import Any, Callable, Iterable, Sequence
 from urllib.parse import urlparse
 
+import anyio
 import pyarrow as pa
 import pyarrow.compute as pc
-from deltalake import DeltaTable, Field, write_deltalake
+import pyarrow.dataset as ds
+from deltalake import CommitProperties, DeltaTable, Field, write_deltalake
 from deltalake.exceptions import TableNotFoundError
 from deltalake.schema import PrimitiveType
-from inspect_ai._eval.evalset import (
-    TASK_IDENTIFIER_VERSION,
-    list_all_eval_logs,
-    task_identifier,
-)
+from inspect_ai._eval.evalset import TASK_IDENTIFIER_VERSION, task_identifier
 from inspect_ai._util._async import run_coroutine, tg_collect
-from inspect_ai._util.file import absolute_file_path, exists, filesystem
-from inspect_ai.log import EvalLog, read_eval_log, read_eval_log_async
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from inspect_ai._util.file import FileInfo, absolute_file_path, filesystem
+from inspect_ai.log import EvalLog, list_eval_logs
+from inspect_ai.log._file import EvalLogInfo
 from semver import Version
 from typing_extensions import override
 
 from inspect_flow._display.path_progress import PathProgressDisplay, ReadLogsProgress
-from inspect_flow._store.store import FlowStoreInternal, StoreLogMatch, is_better_log
+from inspect_flow._store.mirror import TableMirror
+from inspect_flow._store.missing import find_missing_logs
+from inspect_flow._store.samples import (
+    SampleRecord,
+    read_sample_records,
+    samples_table,
+)
+from inspect_flow._store.spool import LogSpool
+from inspect_flow._store.store import (
+    DEFAULT_RETENTION_HOURS,
+    DEFAULT_SCAN_BATCH_SIZE,
+    FlowStoreInternal,
+    StoreDedupeResult,
+    StoreLogMatch,
+    StoreOptimizeResult,
+    log_rank,
+)
 from inspect_flow._types.flow_types import LogFilter
+from inspect_flow._types.log_filter_expr import FilterExpr
 from inspect_flow._util.console import (
-    console,
     flow_print,
     path,
     quantity,
 )
-from inspect_flow._util.constants import PKG_NAME
+from inspect_flow._util.constants import DEFAULT_MAX_CONCURRENCY, PKG_NAME
+from inspect_flow._util.data import BUCKET_REGIONS_KEY, read_data, write_data
 from inspect_flow._util.error import NoLogsError
+from inspect_flow._util.header_cache import (
+    evict_header_cache,
+    read_header_async,
+    read_headers,
+)
 from inspect_flow._util.logging import PrefixLogger
+from inspect_flow._util.logs import num_valid_samples, sort_log_table, total_samples
 from inspect_flow._util.path_util import path_str
-from inspect_flow._util.util import now
+from inspect_flow._util.util import now, tg_collect_bounded
 
 logger = PrefixLogger(getLogger(__name__), prefix="flow-store")
 
@@ -55,11 +80,71 @@ def _task_id_col() -> str:
     return f"task_identifier_{TASK_IDENTIFIER_VERSION}"
 
 
-def _escape_sql_string(s: str) -> str:
-    return s.replace("'", "''")
+# Logs are partitioned by a short hash of their task identifier, so a lookup for
+# a few tasks reads only their partitions. Two hex digits give 256 partitions.
+_TASK_HASH_COL = "task_hash"
+_TASK_HASH_LEN = 2
+
+
+def _task_hash(task_identifier: str | None) -> str | None:
+    if not task_identifier:
+        return None
+    return hashlib.sha256(task_identifier.encode()).hexdigest()[:_TASK_HASH_LEN]
+
+
+# A bucket's region only changes if it is deleted and recreated elsewhere
+_BUCKET_REGION_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Regions resolved by this process, so each bucket is looked up at most once
+_bucket_regions: dict[str, str] = {}
 
 
 def _get_bucket_region(bucket_name: str) -> str | None:
+    """Get the region for an S3 bucket, cached in the flow data file."""
+    if region := _bucket_regions.get(bucket_name):
+        return region
+    region = _read_cached_bucket_region(bucket_name)
+    if region is None:
+        region = _lookup_bucket_region(bucket_name)
+        if region is None:
+            return None
+        _cache_bucket_region(bucket_name, region)
+    _bucket_regions[bucket_name] = region
+    return region
+
+
+def _read_cached_bucket_region(bucket_name: str) -> str | None:
+    """Read an unexpired bucket region from the flow data file.
+
+    Any failure to read or parse the cache is treated as a miss.
+    """
+    try:
+        cached = (read_data(BUCKET_REGIONS_KEY) or {}).get(bucket_name)
+        if cached and time.time() - cached["resolved_at"] < _BUCKET_REGION_TTL_SECONDS:
+            return str(cached["region"])
+    except Exception as e:
+        logger.info(f"Failed to read cached region of bucket {bucket_name}: {e}")
+    return None
+
+
+def _cache_bucket_region(bucket_name: str, region: str) -> None:
+    """Add a bucket region to the flow data file.
+
+    The read-modify-write is not locked, so a process caching another bucket
+    at the same time can drop this entry. That only costs a repeated lookup,
+    so it is not worth a lock on the shared data file.
+    """
+    try:
+        regions = read_data(BUCKET_REGIONS_KEY)
+        if not isinstance(regions, dict):
+            regions = {}
+        regions[bucket_name] = {"region": region, "resolved_at": time.time()}
+        write_data(BUCKET_REGIONS_KEY, regions)
+    except Exception as e:
+        logger.info(f"Failed to cache region of bucket {bucket_name}: {e}")
+
+
+def _lookup_bucket_region(bucket_name: str) -> str | None:
     """Get the region for an S3 bucket using the AWS API."""
     try:
         import boto3
@@ -78,9 +163,14 @@ class TableDef:
     name: str
     version: str
     schema: pa.Schema
+    partition_by: list[str] | None = None
+    # Optional tables are only created when enabled, and only written once
+    # they exist
+    optional: bool = False
 
 
 LOGS = "_table_logs"
+SAMPLES = "_table_samples"
 
 
 @dataclass
@@ -88,16 +178,85 @@ class LogRecord:
     log_path: str
     task_identifier: str
     ts: datetime | None = None
+    status: str | None = None
+    task: str | None = None
+    model: str | None = None
+    tags: list[str] | None = None
+    completed_samples: int | None = None
+    total_samples: int | None = None
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+    invalidated: bool | None = None
+    valid_samples: int | None = None
+    size: int | None = None
+    mtime: float | None = None
+    etag: str | None = None
+    fingerprint: str | None = None
 
     def __post_init__(self) -> None:
         if self.ts is None:
             self.ts = now()
 
+    @classmethod
+    def from_header(
+        cls,
+        header: EvalLog,
+        log_path: str,
+        size: int | None = None,
+        mtime: float | None = None,
+        etag: str | None = None,
+        valid_samples: int | None = None,
+    ) -> "LogRecord":
+        """Create a record capturing the header fields used to filter and rank logs.
+
+        `valid_samples` defaults to the completed samples of a log that has
+        results and is not invalidated. Other logs need their samples read to
+        count it (see `num_valid_samples`).
+        """
+        if valid_samples is None and header.results and not header.invalidated:
+            valid_samples = header.results.completed_samples
+        return cls(
+            log_path=log_path,
+            task_identifier=task_identifier(header, None),
+            status=header.status,
+            task=header.eval.task,
+            model=header.eval.model,
+            tags=list(header.tags),
+            completed_samples=(
+                header.results.completed_samples if header.results else None
+            ),
+            total_samples=total_samples(header),
+            started_at=_header_ts(header.stats.started_at),
+            completed_at=_header_ts(header.stats.completed_at),
+            invalidated=header.invalidated,
+            valid_samples=valid_samples,
+            size=size,
+            mtime=mtime,
+            etag=etag or header.etag,
+            fingerprint=_fingerprint(header, size),
+        )
+
+    @classmethod
+    def from_dict(cls, row: dict[str, Any]) -> "LogRecord | None":
+        """Create a record from a row of the logs table.
+
+        Returns:
+            None if the row has no identifier for the current task identifier version.
+        """
+        row = dict(row)
+        task_id = row.pop(_task_id_col(), None)
+        if task_id is None:
+            return None
+        fields = {k: v for k, v in row.items() if k in cls.__dataclass_fields__}
+        return cls(task_identifier=task_id, **fields)
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "log_path": self.log_path,
             _task_id_col(): self.task_identifier,
             "ts": self.ts,
+            **{col: getattr(self, col) for col in HEADER_COLUMNS},
+            _TASK_HASH_COL: _task_hash(self.task_identifier),
         }
 
     @classmethod
@@ -107,18 +266,114 @@ class LogRecord:
                 ("log_path", pa.string()),
                 (_task_id_col(), pa.string()),
                 ("ts", pa.timestamp("ms")),
+                ("status", pa.string()),
+                ("task", pa.string()),
+                ("model", pa.string()),
+                ("tags", pa.list_(pa.string())),
+                ("completed_samples", pa.int64()),
+                ("total_samples", pa.int64()),
+                ("started_at", pa.timestamp("us", tz="UTC")),
+                ("completed_at", pa.timestamp("us", tz="UTC")),
+                ("invalidated", pa.bool_()),
+                ("valid_samples", pa.int64()),
+                ("size", pa.int64()),
+                ("mtime", pa.float64()),
+                ("etag", pa.string()),
+                ("fingerprint", pa.string()),
+                (_TASK_HASH_COL, pa.string()),
             ]
         )
 
 
-TABLES: list[TableDef] = [
-    TableDef(
-        name=LOGS,
-        version="0.2.0",
-        schema=LogRecord.to_schema(),
-    ),
+# Columns denormalized from the log header (and file info) so that filtering and
+# ranking logs can be answered from the table without reading log files. Rows
+# written before these columns existed have nulls here; `status` is always set
+# when the header was captured. `valid_samples` is precomputed with
+# `num_valid_samples` so ranking never needs to read samples.
+HEADER_COLUMNS = [
+    "status",
+    "task",
+    "model",
+    "tags",
+    "completed_samples",
+    "total_samples",
+    "started_at",
+    "completed_at",
+    "invalidated",
+    "valid_samples",
+    "size",
+    "mtime",
+    "etag",
+    "fingerprint",
+]
+
+
+# Columns `scan_samples` can read: the sample index plus these columns of the
+# sample's log
+_SAMPLE_LOG_COLUMNS = ["task_identifier", "task", "model"]
+SAMPLE_SCAN_COLUMNS = [
+    "log_path",
+    *_SAMPLE_LOG_COLUMNS,
+    *[c for c in SampleRecord.to_schema().names if c != "log_path"],
 ]
 
+# Columns `scan` can read; `task_identifier` is the current identifier version
+SCAN_COLUMNS = ["log_path", "task_identifier", "ts", *HEADER_COLUMNS]
+
+
+def _fingerprint(header: EvalLog, size: int | None) -> str | None:
+    """Identifies the content of a log file, so that copies of it can be collapsed.
+
+    Copies of a log (e.g. made when a stored log is reused, or by the `copy`
+    step) have the same eval id, status and size, while a log that is rewritten
+    in place changes size. This avoids hashing whole log files on import.
+    """
+    if size is None or not header.eval.eval_id:
+        return None
+    key = json.dumps([header.eval.eval_id, header.status, header.invalidated, size])
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def parse_as_of(as_of: int | str | datetime) -> int | datetime:
+    """The store version or timestamp to read a store as of.
+
+    Strings of digits are versions, other strings ISO 8601 timestamps (in UTC
+    unless they have a timezone).
+    """
+    if isinstance(as_of, str):
+        if as_of.strip().isdigit():
+            return int(as_of)
+        try:
+            as_of = datetime.fromisoformat(as_of.strip())
+        except ValueError:
+            raise ValueError(
+                f"Invalid store version {as_of!r}: expected a version number or an ISO 8601 timestamp"
+            ) from None
+    if isinstance(as_of, datetime) and as_of.tzinfo is None:
+        as_of = as_of.replace(tzinfo=timezone.utc)
+    return as_of
+
+
+def _header_ts(value: str) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+_LOGS_TABLE = TableDef(
+    name=LOGS,
+    version="0.3.1",
+    schema=LogRecord.to_schema(),
+    partition_by=[_TASK_HASH_COL],
+)
+
+_SAMPLES_TABLE = TableDef(
+    name=SAMPLES,
+    version="0.1.0",
+    schema=SampleRecord.to_schema(),
+    optional=True,
+)
+
+TABLES: list[TableDef] = [_LOGS_TABLE, _SAMPLES_TABLE]
+
 
 def _create_table_description(table: TableDef) -> str:
     description = {"name": table.name, "version": table.version}
@@ -140,57 +395,316 @@ def _check_table_description(table: TableDef, description: str) -> None:
             )
 
 
-class LogEntry(NamedTuple):
-    task_identifier: str
-    log_path: str
+def _needs_partitioning(table: TableDef, dt: DeltaTable) -> bool:
+    """Whether a table was written before its current partitioned layout.
+
+    Such tables (logs tables before 0.3.0) still work, but every lookup scans
+    all rows until `optimize` rewrites them into the partitioned layout.
+    """
+    return bool(table.partition_by) and (
+        dt.metadata().partition_columns != table.partition_by
+    )
+
+
+# Key in the table description recording that every row has the current task
+# identifier, as of a given table version.
+_BACKFILL_MARKER = "task_identifiers_complete"
+# Commit metadata key recording the task identifier version a commit wrote.
+_COMMIT_TASK_ID_VERSION = f"{PKG_NAME}.task_identifier_version"
+# Operations that never add rows, so can't introduce a missing task identifier.
+_ROWLESS_OPERATIONS = {
+    "ADD COLUMN",
+    "DELETE",
+    "OPTIMIZE",
+    "SET TBLPROPERTIES",
+    "UPDATE TABLE METADATA",
+    "VACUUM END",
+    "VACUUM START",
+}
+# Beyond this many commits since the marker, rescan rather than read history.
+_BACKFILL_MAX_HISTORY = 100
+# Rows backfilled per merge commit, so an interrupted backfill keeps its progress.
+_BACKFILL_CHUNK_SIZE = 500
+
+
+def _commit_properties() -> CommitProperties:
+    """Tag a row-writing commit with the task identifier version it writes."""
+    return CommitProperties(
+        custom_metadata={_COMMIT_TASK_ID_VERSION: str(TASK_IDENTIFIER_VERSION)}
+    )
 
 
-def _file_to_log_entry(log_file: str) -> LogEntry:
-    header = read_eval_log(log_file, header_only=True)
-    tid = task_identifier(header, None)
-    assert tid
-    return LogEntry(task_identifier=tid, log_path=to_uri(log_file))
+def _backfill_complete(dt: DeltaTable) -> bool:
+    """Whether every row is known to have the current task identifier.
+
+    True if the backfill marker is for the current identifier version and no
+    commit since it could have added a row without one.
+    """
+    marker = json.loads(dt.metadata().description or "{}").get(_BACKFILL_MARKER)
+    if not marker or marker.get("task_identifier_version") != TASK_IDENTIFIER_VERSION:
+        return False
+    num_commits = dt.version() - marker["table_version"]
+    if num_commits < 0 or num_commits > _BACKFILL_MAX_HISTORY:
+        return False
+    if num_commits == 0:
+        return True
+    history = dt.history(limit=num_commits)
+    # A mirror may not have the commits from before its first sync
+    return len(history) == num_commits and all(
+        commit.get("operation") in _ROWLESS_OPERATIONS
+        or commit.get(_COMMIT_TASK_ID_VERSION) == str(TASK_IDENTIFIER_VERSION)
+        for commit in history
+    )
 
 
-def _add_log_dir(
-    log_dir: str, recursive: bool, entries: list[LogEntry], verbose: bool
+async def _read_log_record(log_file: str) -> LogRecord | None:
+    fs = filesystem(log_file)
+    try:
+        info = await anyio.to_thread.run_sync(fs.info, log_file)
+        cached = await read_header_async(log_file, info, valid_samples=True)
+    except Exception as e:
+        logger.info(f"Failed to read log {path_str(log_file)}: {e}")
+        return None
+    return LogRecord.from_header(
+        cached.header,
+        log_path=to_uri(log_file),
+        size=info.size,
+        mtime=info.mtime,
+        etag=info.etag,
+        valid_samples=cached.valid_samples,
+    )
+
+
+def _count_valid_samples(
+    records: list[LogRecord], files: list[FileInfo | EvalLogInfo]
 ) -> None:
-    with ReadLogsProgress() as progress:
-        dir_logs = list_all_eval_logs(
-            log_dir=log_dir, recursive=recursive, progress=progress
-        )
+    """Fill in `valid_samples` for records whose logs need their samples read."""
+
+    async def _count(record: LogRecord, f: FileInfo | EvalLogInfo) -> None:
+        try:
+            cached = await read_header_async(f.name, f, valid_samples=True)
+        except Exception as e:
+            logger.info(f"Failed to count samples of {path_str(f.name)}: {e}")
+            return
+        record.valid_samples = cached.valid_samples
+
+    pending = [
+        partial(_count, r, f)
+        for r, f in zip(records, files, strict=True)
+        if r.valid_samples is None
+    ]
+    if pending:
+        run_coroutine(tg_collect_bounded(pending, DEFAULT_MAX_CONCURRENCY))
+
+
+def _list_log_dir(log_dir: str, recursive: bool) -> list[EvalLogInfo]:
+    dir_logs = list_eval_logs(log_dir=log_dir, recursive=recursive)
     if not dir_logs:
         raise NoLogsError(f"No logs found in directory: {log_dir}")
-    if verbose:
-        for log in dir_logs:
-            flow_print(path(log.info.name))
-    entries.extend(
-        LogEntry(task_identifier=log.task_identifier, log_path=to_uri(log.info.name))
-        for log in dir_logs
+    return dir_logs
+
+
+def _changed_files(
+    stored: pa.Table, files: list[FileInfo | EvalLogInfo]
+) -> list[FileInfo | EvalLogInfo]:
+    """The files that are not in the logs table with the same size and mtime.
+
+    Rows that predate the header columns count as changed so they get filled in.
+    """
+    listed = pa.table(
+        {
+            "log_path": pa.array([to_uri(f.name) for f in files], type=pa.string()),
+            "size": pa.array([f.size for f in files], type=pa.int64()),
+            "mtime": pa.array([f.mtime for f in files], type=pa.float64()),
+            "index": pa.array(range(len(files)), type=pa.int64()),
+        }
+    )
+    stored = stored.filter(
+        pc.field("status").is_valid() & pc.field("valid_samples").is_valid()
+    ).drop_columns(["status", "valid_samples"])
+    changed = listed.join(
+        stored, keys=["log_path", "size", "mtime"], join_type="left anti"
     )
+    return [files[i] for i in sorted(changed["index"].to_pylist())]
+
+
+def _records_table(records: list[LogRecord]) -> pa.Table:
+    return pa.Table.from_pylist(
+        [r.to_dict() for r in records], schema=LogRecord.to_schema()
+    )
+
+
+def _run_log_record(log: EvalLog) -> LogRecord:
+    try:
+        info = filesystem(log.location).info(log.location)
+    except Exception as e:
+        logger.info(f"Failed to read file info for {path_str(log.location)}: {e}")
+        return LogRecord.from_header(
+            log, log_path=to_uri(log.location), valid_samples=num_valid_samples(log)
+        )
+    return LogRecord.from_header(
+        log,
+        log_path=to_uri(log.location),
+        size=info.size,
+        mtime=info.mtime,
+        etag=info.etag,
+        valid_samples=num_valid_samples(log),
+    )
+
+
+def _is_stale(stored: dict[str, Any], record: LogRecord) -> bool:
+    """Whether a stored row is missing header columns or describes an older file."""
+    if stored["status"] is None or stored["valid_samples"] is None:
+        return True
+    if (stored["size"], stored["mtime"]) != (record.size, record.mtime):
+        return True
+    # Directory listings don't carry etags, so only compare them when both do
+    return bool(stored["etag"] and record.etag and stored["etag"] != record.etag)
+
+
+@dataclass
+class _Candidate:
+    """A stored log competing to be the best log for a task."""
+
+    log_path: str
+    valid_samples: int
+    completed_at: datetime | None
+    header: EvalLog | None = None
+    fingerprint: str | None = None
+
+    def rank(self) -> tuple[int, datetime]:
+        return log_rank(self.valid_samples, self.completed_at)
+
+
+def _best_matches(
+    candidates: dict[str, list[_Candidate]],
+) -> dict[str, StoreLogMatch]:
+    """The best existing log for each task, from its candidates best first."""
+    # Rows ranked from table columns were never opened, so make sure each
+    # winner is still there before handing it out. The winners are checked
+    # together, and again for the runners-up of any that are missing.
+    checked: set[str] = set()
+    while unchecked := {
+        c[0].log_path
+        for c in candidates.values()
+        if c and c[0].header is None and c[0].log_path not in checked
+    }:
+        missing = find_missing_logs(unchecked)
+        checked |= unchecked
+        for task_candidates in candidates.values():
+            while task_candidates and task_candidates[0].log_path in missing:
+                logger.info(
+                    f"Failed to read log {path_str(task_candidates.pop(0).log_path)} referenced from the store. File not found."
+                )
+    results: dict[str, StoreLogMatch] = {}
+    for task_id, task_candidates in candidates.items():
+        if not task_candidates:
+            continue
+        # Copies of the same file are one log, not duplicates of each other
+        fingerprints: set[str] = set()
+        unique: list[_Candidate] = []
+        for c in task_candidates:
+            if c.fingerprint is None or c.fingerprint not in fingerprints:
+                unique.append(c)
+            if c.fingerprint is not None:
+                fingerprints.add(c.fingerprint)
+        results[task_id] = StoreLogMatch(
+            log_file=unique[0].log_path,
+            duplicate_logs=[c.log_path for c in unique[1:]],
+        )
+    return results
+
+
+def _time_scan(dt: DeltaTable) -> float:
+    """Seconds to read the whole table."""
+    start = time.perf_counter()
+    dt.to_pyarrow_dataset().to_table()
+    return time.perf_counter() - start
+
+
+def _select_columns(table: pa.Table, columns: list[str]) -> pa.Table:
+    """Select columns of the logs table, as nulls where the table predates them."""
+    schema = LogRecord.to_schema()
+    for c in columns:
+        if c not in table.column_names:
+            field = schema.field(c)
+            table = table.append_column(field, pa.nulls(len(table), type=field.type))
+    return table.select(columns)
+
+
+def _unique(columns: list[str]) -> list[str]:
+    return list(dict.fromkeys(columns))
+
+
+def _match_table(table: pa.Table, expr: FilterExpr) -> tuple[set[str], set[str]]:
+    """Evaluate a filter expression on the header columns of stored rows.
+
+    Returns:
+        The log paths that match, and the log paths whose rows predate the
+        header columns and so must be checked against their headers.
+    """
+    has_columns = pc.field("status").is_valid()
+    matched = table.filter(has_columns & expr.to_arrow())
+    unknown = table.filter(~has_columns)
+    return set(matched["log_path"].to_pylist()), set(unknown["log_path"].to_pylist())
+
+
+def _match_headers(logs: Iterable[str], filter: LogFilter) -> set[str]:
+    """The logs whose headers pass a filter. Logs that can't be read don't."""
+
+    async def _read(log: str) -> tuple[str, EvalLog | None]:
+        try:
+            return log, (await read_header_async(log)).header
+        except Exception as e:
+            logger.info(f"Failed to read log {path_str(log)} for filtering. {e}")
+            return log, None
+
+    results = run_coroutine(tg_collect([partial(_read, log) for log in logs]))
+    evict_header_cache()
+    return {
+        log for log, eval_log in results if eval_log is not None and filter(eval_log)
+    }
+
+
+class _PrefixIndex:
+    """Sorted log paths, for finding the logs under a prefix without a full scan."""
+
+    def __init__(self, logs: set[str]) -> None:
+        self._logs = sorted(logs)
+
+    def __contains__(self, log: str) -> bool:
+        i = bisect_left(self._logs, log)
+        return i < len(self._logs) and self._logs[i] == log
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        """The logs that start with `prefix`."""
+        start = bisect_left(self._logs, prefix)
+        end = start
+        while end < len(self._logs) and self._logs[end].startswith(prefix):
+            end += 1
+        return self._logs[start:end]
 
 
 def _remove_prefix(
     prefix: str,
     recursive: bool,
-    logs: set[str],
+    index: _PrefixIndex,
     logs_to_remove: set[str],
 ) -> None:
     prefix = to_uri(prefix)
-    if prefix in logs:
+    if prefix in index:
         logs_to_remove.add(prefix)
         return
     sep = filesystem(prefix).sep
     prefix_len = len(prefix)
-    for log in list(logs):
-        if log.startswith(prefix):
-            remainder = log[prefix_len:]
-            if remainder.startswith(sep):
-                remainder = remainder[len(sep) :]
-            if recursive:
-                logs_to_remove.add(log)
-            elif sep not in remainder:
-                logs_to_remove.add(log)
+    for log in index.with_prefix(prefix):
+        remainder = log[prefix_len:]
+        if remainder.startswith(sep):
+            remainder = remainder[len(sep) :]
+        if recursive:
+            logs_to_remove.add(log)
+        elif sep not in remainder:
+            logs_to_remove.add(log)
 
 
 class DeltaLakeStore(FlowStoreInternal):
@@ -205,16 +719,45 @@ class DeltaLakeStore(FlowStoreInternal):
         store_path: str,
         create: bool = False,
         log_filter: LogFilter | None = None,
+        mirror: bool = False,
+        spool: bool = False,
+        samples: bool = False,
+        as_of: int | str | datetime | None = None,
+        read_only: bool = False,
     ) -> None:
         self._log_filter = log_filter
+        # Stores read from (rather than written to) are never modified, so
+        # rows without the current task identifier aren't backfilled
+        self._backfill = not read_only
         self._root_path = store_path
         self._store_path = store_path + filesystem(store_path).sep + "flow_store"
 
         self._fs = filesystem(self._store_path)
         self._storage_options = self._get_storage_options()
+        # Table handles are kept open and brought up to date incrementally, and
+        # the logs table is read at most once per table version.
+        self._tables: dict[str, DeltaTable] = {}
+        self._snapshot: tuple[int, pa.Table] | None = None
+        # Reads can be pinned to one immutable version of the logs table
+        self._as_of = parse_as_of(as_of) if as_of is not None else None
+        self._pinned: DeltaTable | None = None
+        # Reads of a remote store can go through a local mirror
+        self._mirror = (
+            TableMirror(self._table_path(LOGS))
+            if mirror and not self._fs.is_local()
+            else None
+        )
+        # Appends can be spooled locally and committed in batches
+        self._spool = (
+            LogSpool(self._table_path(LOGS), self._commit_spooled) if spool else None
+        )
+        self._spool_writer: "DeltaLakeStore | None" = None
         self.exists = False
-        found = [self._init_table(table, create=create) for table in TABLES]
-        if any(found):
+        found = {
+            table.name: self._init_table(table, create=create and not table.optional)
+            for table in TABLES
+        }
+        if any(found.values()):
             logger.info("Using store: %s", path(store_path))
             self.exists = True
         else:
@@ -222,29 +765,56 @@ class DeltaLakeStore(FlowStoreInternal):
             if create:
                 logger.info("Creating store: %s", path(store_path))
                 self.exists = True
+        # Once a store has a sample index, every write keeps it up to date
+        self._index_samples = found[SAMPLES]
+        if samples and self.exists and not self._index_samples:
+            self._init_table(_SAMPLES_TABLE, create=True)
+            self._index_samples = True
 
-    def _filter_logs(self, logs: set[str], filter: LogFilter | None) -> set[str]:
+    def _resolve_filter(self, filter: LogFilter | None) -> LogFilter | None:
         if filter and self._log_filter:
             raise ValueError(
                 "Cannot specify both a per-call filter and a store-level filter."
             )
-        filter = filter or self._log_filter
+        return filter or self._log_filter
+
+    def _filter_logs(self, logs: set[str], filter: LogFilter | None) -> set[str]:
+        filter = self._resolve_filter(filter)
         if not filter:
             return logs
-
-        async def _read(log: str) -> tuple[str, EvalLog | None]:
-            try:
-                return log, await read_eval_log_async(log, header_only=True)
-            except Exception as e:
-                logger.info(f"Failed to read log {path_str(log)} for filtering. {e}")
-                return log, None
-
-        results = run_coroutine(tg_collect([partial(_read, log) for log in logs]))
-        return {
-            log
-            for log, eval_log in results
-            if eval_log is not None and filter(eval_log)
-        }
+        matched: set[str] = set()
+        if isinstance(filter, FilterExpr):
+            # Only logs without header columns need their headers read
+            table = self._read_columns(
+                _unique(["log_path", "status", *sorted(filter.columns())])
+            )
+            table = table.filter(pc.field("log_path").isin(list(logs)))
+            matched, unknown = _match_table(table, filter)
+            logs = logs - matched - (set(table["log_path"].to_pylist()) - unknown)
+        return matched | _match_headers(logs, filter)
+
+    def _filter_table(self, table: pa.Table, filter: LogFilter | None) -> pa.Table:
+        """Filter rows of the logs table by their logs' headers.
+
+        Args:
+            table: Rows with `log_path`, and for a `FilterExpr` the `status`
+                column and the columns it reads.
+            filter: The filter, resolved with `_resolve_filter`.
+        """
+        if not filter:
+            return table
+        if isinstance(filter, FilterExpr):
+            # Only rows that predate the header columns need headers read
+            has_columns = pc.field("status").is_valid()
+            keep = has_columns & filter.to_arrow()
+            unknown = table.filter(~has_columns)["log_path"]
+        else:
+            keep = pc.scalar(False)
+            unknown = table["log_path"]
+        if len(unknown):
+            matched = _match_headers(pc.unique(unknown).to_pylist(), filter)
+            keep = keep | pc.field("log_path").isin(pa.array(matched, pa.string()))
+        return table.filter(keep)
 
     def _get_storage_options(self) -> dict[str, str] | None:
         if not self._fs.is_s3():
@@ -277,10 +847,90 @@ class DeltaLakeStore(FlowStoreInternal):
         return f"{self._store_path}/{table_name}"
 
     def _open_table(self, table_name: str) -> DeltaTable:
-        return DeltaTable(
+        """The table at its latest version, reusing the open handle if there is one."""
+        if dt := self._tables.get(table_name):
+            # Only reads commits newer than the handle's version
+            dt.update_incremental()
+            return dt
+        dt = DeltaTable(
             self._table_path(table_name),
             storage_options=self._storage_options,
         )
+        self._tables[table_name] = dt
+        return dt
+
+    def _read_table(self, latest: bool = False) -> DeltaTable:
+        """The logs table to read from.
+
+        Args:
+            latest: Read the latest version even if reads are pinned, e.g. to
+                decide what to write. Otherwise the pinned version is read if
+                there is one. The latest version is read through the local
+                mirror if enabled.
+        """
+        if self._as_of is not None and not latest:
+            return self._pinned_table()
+        if self._mirror is not None:
+            try:
+                return self._mirror.sync()
+            except Exception as e:
+                logger.info(f"Failed to sync store mirror, reading the store. {e}")
+        return self._open_table(LOGS)
+
+    def _pinned_table(self) -> DeltaTable:
+        """The logs table at the version reads are pinned to, loaded once."""
+        if self._pinned is None:
+            assert self._as_of is not None
+            # A handle of its own, as the shared handles are kept up to date
+            dt = DeltaTable(
+                self._table_path(LOGS), storage_options=self._storage_options
+            )
+            try:
+                dt.load_as_version(self._as_of)
+            except Exception as e:
+                raise ValueError(
+                    f"Store {path_str(self._root_path)} has no version as of {self._as_of}: {e}"
+                ) from e
+            logger.info(f"Reading store as of version {dt.version()}")
+            self._pinned = dt
+        return self._pinned
+
+    def _log_paths(self, dt: DeltaTable | None = None) -> set[str]:
+        table = self._read_columns(["log_path"], dt)
+        return {path for path in table["log_path"].to_pylist() if path is not None}
+
+    def _read_columns(
+        self,
+        columns: list[str],
+        dt: DeltaTable | None = None,
+        task_ids: set[str] | None = None,
+    ) -> pa.Table:
+        """Read columns of the logs table, from a snapshot cached per table version.
+
+        Args:
+            columns: The columns to read. Columns the table predates are nulls.
+            dt: The logs table at the version to read. Defaults to the latest.
+            task_ids: Only the rows for these task identifiers are needed. If
+                the table is partitioned and not already cached, only their
+                partitions are read (and not cached). Other rows may be returned.
+        """
+        dt = dt or self._read_table()
+        cached = self._snapshot is not None and self._snapshot[0] == dt.version()
+        if (
+            task_ids
+            and not cached
+            and _TASK_HASH_COL in dt.metadata().partition_columns
+        ):
+            # Partition values are pruned from the Delta log, so this doesn't
+            # need the parquet pushdown that string_view breaks
+            hashes = sorted({h for h in map(_task_hash, task_ids) if h})
+            partitions = [(_TASK_HASH_COL, "in", hashes)]
+            return _select_columns(
+                dt.to_pyarrow_dataset(partitions=partitions).to_table(), columns
+            )
+        if self._snapshot is None or self._snapshot[0] != dt.version():
+            self._snapshot = (dt.version(), dt.to_pyarrow_dataset().to_table())
+        return _select_columns(self._snapshot[1], columns)
 
     def _get_table(self, table_path: str) -> DeltaTable | None:
         try:
@@ -293,6 +943,11 @@ class DeltaLakeStore(FlowStoreInternal):
         if dt := self._get_table(table_path):
             logger.info(f"Existing table: {table_path}")
             _check_table_description(table, dt.metadata().description)
+            if _needs_partitioning(table, dt):
+                logger.info(
+                    f"Table {table.name} is not partitioned, run `flow store optimize` to partition it"
+                )
+            self._tables[table.name] = dt
             return True
         elif create:
             logger.info(f"Creating table: {table_path}")
@@ -305,6 +960,7 @@ class DeltaLakeStore(FlowStoreInternal):
             write_deltalake(
                 table_path,
                 empty_table,
+                partition_by=table.partition_by,
                 description=metadata,
                 storage_options=self._storage_options,
             )
@@ -326,14 +982,52 @@ class DeltaLakeStore(FlowStoreInternal):
 
     @override
     def add_run_logs(self, eval_logs: list[EvalLog]) -> None:
-        entries = [
-            LogEntry(
-                task_identifier=task_identifier(log, None),
-                log_path=to_uri(log.location),
-            )
-            for log in eval_logs
+        records = [_run_log_record(log) for log in eval_logs]
+        if self._spool is not None:
+            self._spool.append(_records_table(records))
+        else:
+            self._add_logs(records, dry_run=False)
+
+    @override
+    def flush(self) -> None:
+        if self._spool is not None:
+            self._spool.flush()
+
+    def _commit_spooled(self, records: pa.Table) -> None:
+        """Commit a batch of spooled records, keeping the latest of each log."""
+        rows = records.to_pylist()
+        parsed = [LogRecord.from_dict(row) for row in rows]
+        # Records spooled by a version of flow with another task identifier
+        # version are rebuilt from their log headers rather than dropped
+        stale = [
+            row["log_path"] for row, r in zip(rows, parsed, strict=True) if r is None
         ]
-        self._add_logs(entries, dry_run=False)
+        if stale:
+            logger.warning(
+                f"Recomputing the task identifiers of {len(stale)} spooled store records from another task identifier version"
+            )
+            rebuilt = iter(
+                run_coroutine(
+                    tg_collect_bounded(
+                        [partial(_read_log_record, log) for log in stale],
+                        DEFAULT_MAX_CONCURRENCY,
+                    )
+                )
+            )
+            parsed = [r if r is not None else next(rebuilt) for r in parsed]
+        latest = {r.log_path: r for r in parsed if r is not None}
+        # The spool commits from its own thread, so it writes through its own
+        # table handles rather than sharing this store's. The backfill prints
+        # its progress, so it's left to this store's reads.
+        if self._spool_writer is None:
+            writer = DeltaLakeStore(
+                self._root_path,
+                log_filter=self._log_filter,
+                samples=self._index_samples,
+            )
+            writer._backfill = False
+            self._spool_writer = writer
+        self._spool_writer._add_logs(list(latest.values()), dry_run=False)
 
     @override
     def import_log_path(
@@ -345,9 +1039,9 @@ class DeltaLakeStore(FlowStoreInternal):
     ) -> None:
         if isinstance(log_path, str):
             log_path = [log_path]
-        # Collect dirs and logs to add
+        # Collect the files to import without reading any headers
         flow_print("\nImporting logs to store")
-        entries: list[LogEntry] = []
+        files: list[FileInfo | EvalLogInfo] = []
         for p in log_path:
             p = absolute_file_path(p)
             fs = filesystem(p)
@@ -356,19 +1050,67 @@ class DeltaLakeStore(FlowStoreInternal):
                 continue
             info = fs.info(p)
             if info.type == "file":
-                if verbose:
-                    flow_print(path(p))
-                entries.append(_file_to_log_entry(p))
+                files.append(info)
             else:
-                dir = to_uri(p)
-                _add_log_dir(
-                    log_dir=dir, recursive=recursive, entries=entries, verbose=verbose
-                )
-        num_added = self._add_logs(entries, dry_run=dry_run)
+                files.extend(_list_log_dir(to_uri(p), recursive=recursive))
+
+        files = list({to_uri(f.name): f for f in files}.values())
+
+        # Only read headers for files that are new or changed since they were
+        # last imported
+        changed = _changed_files(
+            self._read_columns(
+                ["log_path", "size", "mtime", "status", "valid_samples"],
+                self._read_table(latest=True),
+            ),
+            files,
+        )
+        if verbose:
+            for f in changed:
+                flow_print(path(f.name))
+        with ReadLogsProgress() as progress:
+            progress.before_reading_logs(len(changed))
+            headers = read_headers(
+                [f.name for f in changed],
+                infos=changed,
+                on_read=progress.after_read_log,
+            )
+        records = [
+            LogRecord.from_header(
+                header,
+                log_path=to_uri(f.name),
+                size=f.size,
+                mtime=f.mtime,
+                etag=f.etag if isinstance(f, FileInfo) else None,
+            )
+            for f, header in zip(changed, headers, strict=True)
+        ]
+        _count_valid_samples(records, changed)
+        if self._spool is not None and not dry_run:
+            self._spool.append(_records_table(records))
+            flow_print(
+                f"Queued {quantity(len(records), 'log')} for store",
+                format="success" if records else "warning",
+            )
+            if num_unchanged := len(files) - len(changed):
+                flow_print(f"Skipped {quantity(num_unchanged, 'unchanged log')}")
+            return
+        num_added = self._add_logs(records, dry_run=dry_run)
         flow_print(
             f"Imported {quantity(num_added, 'new log')} to store",
             format="success" if num_added > 0 else "warning",
         )
+        if num_unchanged := len(files) - len(changed):
+            flow_print(f"Skipped {quantity(num_unchanged, 'unchanged log')}")
+        if num_updated := len(changed) - num_added:
+            flow_print(f"Updated {quantity(num_updated, 'changed log')}")
+        if dry_run:
+            return
+        # Logs imported before the store had a sample index
+        if unindexed := self._unindexed_logs([to_uri(f.name) for f in files]):
+            with PathProgressDisplay("Indexing samples", len(unindexed)) as display:
+                num_indexed = self._add_samples(unindexed, on_read=display.advance)
+            flow_print(f"Indexed samples of {quantity(num_indexed, 'existing log')}")
 
     @override
     def remove_log_prefix(
@@ -379,29 +1121,22 @@ class DeltaLakeStore(FlowStoreInternal):
         dry_run: bool = False,
         verbose: bool = True,
         filter: LogFilter | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
     ) -> None:
         if isinstance(prefix, str):
             prefix = [prefix]
 
         flow_print("\nRemoving logs from store")
-        logs = self.get_logs()
+        logs = self._log_paths(self._read_table(latest=True))
         logs_to_remove: set[str] = set()
+        index = _PrefixIndex(logs)
         for p in prefix:
-            _remove_prefix(p, recursive, logs, logs_to_remove)
+            _remove_prefix(p, recursive, index, logs_to_remove)
         if missing:
-            logs_list = list(logs)
-            with PathProgressDisplay(
-                "Scanning for missing logs", len(logs_list)
-            ) as display:
-                for log in logs_list:
-                    try:
-                        if exists(log):
-                            continue
-                    except Exception as e:
-                        logger.warning(f"Failed to check existence of log {log}: {e}")
-                    finally:
-                        display.advance(log)
-                    logs_to_remove.add(log)
+            with PathProgressDisplay("Scanning for missing logs", len(logs)) as display:
+                logs_to_remove |= find_missing_logs(
+                    logs, max_concurrency=max_concurrency, on_checked=display.advance
+                )
 
         logs_to_remove = self._filter_logs(logs_to_remove, filter)
 
@@ -423,41 +1158,228 @@ class DeltaLakeStore(FlowStoreInternal):
                     format="success",
                 )
 
+    @override
+    def optimize(
+        self,
+        retention_hours: int = DEFAULT_RETENTION_HOURS,
+        dry_run: bool = False,
+        force: bool = False,
+    ) -> StoreOptimizeResult:
+        if retention_hours < DEFAULT_RETENTION_HOURS and not force:
+            raise ValueError(
+                f"A retention window of {retention_hours} hours is shorter than "
+                f"the default ({DEFAULT_RETENTION_HOURS} hours), so it may delete "
+                "files that concurrent runs or pinned reads still need. Use "
+                "force to allow it."
+            )
+        flow_print("\nOptimizing store")
+        dt = self._open_table(LOGS)
+        if not dry_run:
+            # Backfill first, so the task identifier column being clustered on
+            # is filled in
+            self._set_task_identifiers()
+        files_before = len(dt.file_uris())
+        scan_before = _time_scan(dt)
+        partition = _needs_partitioning(_LOGS_TABLE, dt)
+        if dry_run:
+            if partition:
+                flow_print("Would partition the store by task identifier hash")
+            files_vacuumed = len(
+                dt.vacuum(
+                    retention_hours=retention_hours,
+                    enforce_retention_duration=not force,
+                    dry_run=True,
+                )
+            )
+            return StoreOptimizeResult(
+                files_before=files_before,
+                files_after=files_before,
+                files_vacuumed=files_vacuumed,
+                scan_seconds_before=scan_before,
+                scan_seconds_after=scan_before,
+            )
+
+        if partition:
+            self._partition_table(_LOGS_TABLE)
+            dt = self._open_table(LOGS)
+        # Z-ordering rewrites the small files into target-sized ones, so it
+        # compacts as well as clusters rows for the same task together
+        dt.optimize.z_order([_task_id_col()])
+        dt.create_checkpoint()
+        dt.cleanup_metadata()
+        files_vacuumed = len(
+            dt.vacuum(
+                retention_hours=retention_hours,
+                enforce_retention_duration=not force,
+                dry_run=False,
+            )
+        )
+        if self._index_samples:
+            # The sample index is only scanned whole, so compacting is enough
+            sdt = self._open_table(SAMPLES)
+            sdt.optimize.compact()
+            sdt.create_checkpoint()
+            sdt.cleanup_metadata()
+            files_vacuumed += len(
+                sdt.vacuum(
+                    retention_hours=retention_hours,
+                    enforce_retention_duration=not force,
+                    dry_run=False,
+                )
+            )
+        dt = self._open_table(LOGS)
+        return StoreOptimizeResult(
+            files_before=files_before,
+            files_after=len(dt.file_uris()),
+            files_vacuumed=files_vacuumed,
+            scan_seconds_before=scan_before,
+            scan_seconds_after=_time_scan(dt),
+        )
+
+    @override
+    def dedupe(self, dry_run: bool = False) -> StoreDedupeResult:
+        flow_print("\nDeduplicating store")
+        table = self._read_columns(
+            ["log_path", "ts", "fingerprint"], self._read_table(latest=True)
+        )
+        fingerprints = dict(
+            zip(
+                table["log_path"].to_pylist(),
+                table["fingerprint"].to_pylist(),
+                strict=True,
+            )
+        )
+        if unknown := [p for p, f in fingerprints.items() if f is None]:
+            # Logs stored before fingerprints were recorded
+            with PathProgressDisplay("Reading logs", len(unknown)) as display:
+                records = run_coroutine(self._read_log_records(unknown, display))
+            fingerprints.update({r.log_path: r.fingerprint for r in records})
+            if not dry_run:
+                self._update_header_columns(records)
+        # Only logs with copies can be removed, so only they are checked
+        counts = Counter(f for f in fingerprints.values() if f is not None)
+        candidates = [p for p, f in fingerprints.items() if f and counts[f] > 1]
+        missing: set[str] = set()
+        if candidates:
+            with PathProgressDisplay(
+                "Checking copies exist", len(candidates)
+            ) as display:
+                missing = find_missing_logs(candidates, on_checked=display.advance)
+        # The copy added to the store first is kept, preferring one that still
+        # exists
+        table = table.sort_by([("ts", "ascending"), ("log_path", "ascending")])
+        log_paths = sorted(table["log_path"].to_pylist(), key=lambda p: p in missing)
+        kept: dict[str, str] = {}
+        copies: dict[str, list[str]] = {}
+        for log_path in log_paths:
+            if (fingerprint := fingerprints.get(log_path)) is None:
+                continue
+            if original := kept.get(fingerprint):
+                copies.setdefault(original, []).append(log_path)
+            else:
+                kept[fingerprint] = log_path
+        if not dry_run:
+            self._remove_logs([p for paths in copies.values() for p in paths])
+        return StoreDedupeResult(copies=copies)
+
+    def _partition_table(self, table: TableDef) -> None:
+        """Rewrite a table from before it was partitioned in the partitioned layout."""
+        flow_print("Partitioning store by task identifier hash")
+        dt = self._open_table(table.name)
+        # Overwriting through the table handle commits against the version
+        # read, so rows appended meanwhile are kept rather than dropped, but
+        # keep the old layout; rewrite until no rows were appended meanwhile
+        while True:
+            data = pa.table(dt.to_pyarrow_table())
+            # Rows appended by this code to an unpartitioned table already
+            # have the hash, but older rows don't
+            hashes = pa.array(
+                [_task_hash(t) for t in data[_task_id_col()].to_pylist()],
+                type=pa.string(),
+            )
+            if _TASK_HASH_COL in data.column_names:
+                data = data.drop_columns([_TASK_HASH_COL])
+            data = data.append_column(_TASK_HASH_COL, hashes)
+            write_deltalake(
+                dt,
+                data,
+                mode="overwrite",
+                schema_mode="overwrite",
+                partition_by=table.partition_by,
+                storage_options=self._storage_options,
+                commit_properties=_commit_properties(),
+            )
+            dt.update_incremental()
+            if dt.to_pyarrow_dataset().count_rows() == data.num_rows:
+                break
+        description = json.loads(dt.metadata().description or "{}")
+        description["version"] = table.version
+        dt.alter.set_table_description(json.dumps(description))
+
     def _remove_logs(self, logs_to_remove: Sequence[str]) -> int:
+        if self._index_samples:
+            self._delete_rows(SAMPLES, logs_to_remove)
+        return self._delete_rows(LOGS, logs_to_remove)
+
+    def _delete_rows(self, table_name: str, logs_to_remove: Sequence[str]) -> int:
+        """Delete the rows of a table for the given logs.
+
+        Returns:
+            The number of rows deleted.
+        """
         if not logs_to_remove:
             return 0
-        dt = self._open_table(LOGS)
-        quoted_logs = ", ".join(
-            f"'{_escape_sql_string(log)}'" for log in logs_to_remove
+        source = pa.table({"log_path": pa.array(logs_to_remove, type=pa.string())})
+        dt = self._open_table(table_name)
+        metrics = (
+            dt.merge(
+                source=source,
+                predicate="target.log_path = source.log_path",
+                source_alias="source",
+                target_alias="target",
+                commit_properties=_commit_properties(),
+            )
+            .when_matched_delete()
+            .execute()
         )
-        metrics = dt.delete(predicate=f"log_path IN ({quoted_logs})")
-        return metrics.get("num_deleted_rows", 0)
+        return metrics.get("num_target_rows_deleted", 0)
 
-    def _add_logs(self, entries: list[LogEntry], dry_run: bool) -> int:
-        if not entries:
-            return 0
-        task_ids = {e.task_identifier for e in entries}
-        existing_logs = self._get_logs(task_ids)
-        new_entries = [
-            e
-            for e in entries
-            if e.log_path not in existing_logs.get(e.task_identifier, set())
-        ]
-        if not new_entries:
+    def _add_logs(self, records: list[LogRecord], dry_run: bool) -> int:
+        """Append new logs and refresh the header columns of changed ones.
+
+        Returns:
+            The number of new logs.
+        """
+        if not records:
             return 0
+        task_ids = {r.task_identifier for r in records}
+        existing = self._get_log_table(
+            task_ids, ["status", "valid_samples", "size", "mtime", "etag"], latest=True
+        )
+        stored = {
+            (row[_task_id_col()], row["log_path"]): row for row in existing.to_pylist()
+        }
+        new_records: list[LogRecord] = []
+        changed_records: list[LogRecord] = []
+        for r in records:
+            row = stored.get((r.task_identifier, r.log_path))
+            if row is None:
+                new_records.append(r)
+            elif _is_stale(row, r):
+                changed_records.append(r)
         if dry_run:
-            return len(new_entries)
+            return len(new_records)
 
-        new_data = pa.Table.from_pylist(
-            [
-                LogRecord(
-                    log_path=e.log_path,
-                    task_identifier=e.task_identifier,
-                ).to_dict()
-                for e in new_entries
-            ],
-            schema=LogRecord.to_schema(),
+        if changed_records:
+            self._update_header_columns(changed_records)
+        self._add_samples(
+            [r.log_path for r in new_records + changed_records],
+            replace=[r.log_path for r in changed_records],
         )
+        if not new_records:
+            return 0
+
+        new_data = _records_table(new_records)
 
         write_deltalake(
             self._table_path(LOGS),
@@ -465,92 +1387,327 @@ class DeltaLakeStore(FlowStoreInternal):
             mode="append",
             schema_mode="merge",
             storage_options=self._storage_options,
+            commit_properties=_commit_properties(),
+        )
+        return len(new_records)
+
+    def _add_samples(
+        self,
+        log_paths: list[str],
+        replace: list[str] | None = None,
+        on_read: Callable[[str], None] | None = None,
+    ) -> int:
+        """Index the samples of logs, if the store has a sample index.
+
+        Args:
+            log_paths: The logs to index.
+            replace: Logs among `log_paths` that may already have indexed
+                samples, which are replaced.
+            on_read: Called after each log's samples are read.
+
+        Returns:
+            The number of logs whose samples were indexed.
+        """
+        if not self._index_samples or not log_paths:
+            return 0
+        records = run_coroutine(read_sample_records(log_paths, on_read=on_read))
+        if replace:
+            self._delete_rows(SAMPLES, replace)
+        rows = [s for p in log_paths for s in records.get(p, [])]
+        if rows:
+            write_deltalake(
+                self._table_path(SAMPLES),
+                samples_table(rows),
+                mode="append",
+                storage_options=self._storage_options,
+                commit_properties=_commit_properties(),
+            )
+        return len(records)
+
+    def _unindexed_logs(self, log_paths: list[str]) -> list[str]:
+        """The logs among `log_paths` in the store without indexed samples."""
+        if not self._index_samples or not log_paths:
+            return []
+        stored = self._log_paths(self._read_table(latest=True))
+        indexed = set(
+            self._open_table(SAMPLES)
+            .to_pyarrow_dataset()
+            .to_table(columns=["log_path"])["log_path"]
+            .to_pylist()
         )
-        return len(new_entries)
+        return [p for p in log_paths if p in stored and p not in indexed]
+
+    def _update_header_columns(self, records: list[LogRecord]) -> None:
+        logger.info(f"Updating header columns for {quantity(len(records), 'log')}")
+        source = _records_table(records)
+        dt = self._open_table(LOGS)
+        # merge_schema adds the header columns to stores written before they existed
+        dt.merge(
+            source=source,
+            predicate="target.log_path = source.log_path",
+            source_alias="source",
+            target_alias="target",
+            merge_schema=True,
+            commit_properties=_commit_properties(),
+        ).when_matched_update(
+            {
+                _task_id_col(): f"source.{_task_id_col()}",
+                **{col: f"source.{col}" for col in HEADER_COLUMNS},
+                _TASK_HASH_COL: f"source.{_TASK_HASH_COL}",
+            }
+        ).execute()
 
     @override
     def search_for_logs(self, task_ids: set[str]) -> dict[str, StoreLogMatch]:
-        results: dict[str, StoreLogMatch] = {}
-        indexed_logs = self._get_logs(set(task_ids))
-        for task_id in task_ids:
-            if task_id not in indexed_logs:
-                continue
-            logs = indexed_logs[task_id]
-            best_log: str | None = None
-            best_eval_log: EvalLog | None = None
-            task_duplicates: list[str] = []
-            for log in logs:
-                try:
-                    eval_log = read_eval_log(log, header_only=True)
-                except Exception as e:
-                    logger.info(
-                        f"Failed to read log {path_str(log)} referenced from the store. {e}"
-                    )
-                    continue
-                if self._log_filter and not self._log_filter(eval_log):
-                    continue
-                if is_better_log(eval_log, best_eval_log):
-                    if best_log:
-                        task_duplicates.append(best_log)
-                    best_log = log
-                    best_eval_log = eval_log
-                else:
-                    task_duplicates.append(log)
-            if best_log:
-                results[task_id] = StoreLogMatch(
-                    log_file=best_log, duplicate_logs=task_duplicates
+        return _best_matches(self._search_candidates(task_ids))
+
+    def _search_candidates(self, task_ids: set[str]) -> dict[str, list[_Candidate]]:
+        """The logs passing the filter for each task, best first."""
+        expr = self._log_filter if isinstance(self._log_filter, FilterExpr) else None
+        columns = ["status", "valid_samples", "completed_at", "fingerprint"]
+        if expr:
+            columns = _unique([*columns, *sorted(expr.columns())])
+        table = self._get_log_table(set(task_ids), columns)
+        has_columns = pc.field("status").is_valid()
+        if expr:
+            # Drop rows whose columns fail the filter; rows that predate the
+            # columns are checked against their headers
+            table = table.filter(~has_columns | expr.to_arrow())
+        if self._log_filter and not expr:
+            # A callable filter needs every header
+            rankable = pc.scalar(False)
+        else:
+            rankable = has_columns & pc.field("valid_samples").is_valid()
+
+        # Rank the rows with precomputed valid samples in one sort: most valid
+        # samples first, then the most recently completed (as log_rank)
+        ranked = table.filter(rankable).sort_by(
+            [
+                (_task_id_col(), "ascending"),
+                ("valid_samples", "descending"),
+                ("completed_at", "descending"),
+            ]
+        )
+        candidates: dict[str, list[_Candidate]] = {}
+        for task_id, log_path, valid_samples, completed_at, fingerprint in zip(
+            ranked[_task_id_col()].to_pylist(),
+            ranked["log_path"].to_pylist(),
+            ranked["valid_samples"].to_pylist(),
+            ranked["completed_at"].to_pylist(),
+            ranked["fingerprint"].to_pylist(),
+            strict=True,
+        ):
+            candidates.setdefault(task_id, []).append(
+                _Candidate(
+                    log_path, valid_samples, completed_at, fingerprint=fingerprint
                 )
-        return results
+            )
+        unranked = table.filter(~rankable)
+        rows = list(
+            zip(
+                unranked[_task_id_col()].to_pylist(),
+                unranked["log_path"].to_pylist(),
+                unranked["fingerprint"].to_pylist(),
+                strict=True,
+            )
+        )
+        read = run_coroutine(
+            tg_collect_bounded(
+                [
+                    partial(self._read_candidate, log_path, fingerprint)
+                    for _, log_path, fingerprint in rows
+                ],
+                DEFAULT_MAX_CONCURRENCY,
+            )
+        )
+        if rows:
+            evict_header_cache()
+        read_tasks: set[str] = set()
+        for (task_id, _, _), candidate in zip(rows, read, strict=True):
+            if candidate:
+                candidates.setdefault(task_id, []).append(candidate)
+                read_tasks.add(task_id)
+        for task_id in read_tasks:
+            candidates[task_id].sort(key=_Candidate.rank, reverse=True)
+        return candidates
+
+    async def _read_candidate(
+        self, log_path: str, fingerprint: str | None = None
+    ) -> "_Candidate | None":
+        """Rank a stored log whose columns can't, by reading its header."""
+        try:
+            cached = await read_header_async(log_path, valid_samples=True)
+        except Exception as e:
+            logger.info(
+                f"Failed to read log {path_str(log_path)} referenced from the store. {e}"
+            )
+            return None
+        header = cached.header
+        if self._log_filter and not self._log_filter(header):
+            return None
+        return _Candidate(
+            log_path=log_path,
+            valid_samples=(
+                cached.valid_samples
+                if cached.valid_samples is not None
+                else num_valid_samples(header)
+            ),
+            completed_at=_header_ts(header.stats.completed_at),
+            header=header,
+            fingerprint=fingerprint,
+        )
 
     @override
     def get_logs(self, filter: LogFilter | None = None) -> set[str]:
-        dt = self._open_table(LOGS)
-        table = dt.to_pyarrow_table()
-        logs = {path for path in table["log_path"].to_pylist() if path is not None}
-        return self._filter_logs(logs, filter)
+        return self._filter_logs(self._log_paths(), filter)
 
-    def _get_logs(self, task_ids: set[str]) -> dict[str, set[str]]:
-        self._set_task_identifiers()
+    @override
+    def scan(
+        self,
+        columns: Sequence[str] | None = None,
+        filter: LogFilter | None = None,
+        batch_size: int = DEFAULT_SCAN_BATCH_SIZE,
+    ) -> pa.RecordBatchReader:
+        columns = list(columns) if columns is not None else SCAN_COLUMNS
+        if unknown := [c for c in columns if c not in SCAN_COLUMNS]:
+            raise ValueError(
+                f"Unknown store columns: {', '.join(unknown)}. Columns are: {', '.join(SCAN_COLUMNS)}"
+            )
+        filter = self._resolve_filter(filter)
+        read = [_task_id_col() if c == "task_identifier" else c for c in columns]
+        if isinstance(filter, FilterExpr):
+            read += ["status", *sorted(filter.columns())]
+        table = self._filter_table(
+            self._read_columns(_unique(["log_path", *read])), filter
+        )
+        table = sort_log_table(table)
+        table = table.rename_columns(
+            [
+                "task_identifier" if c == _task_id_col() else c
+                for c in table.column_names
+            ]
+        )
+        # Rows must be sorted, so this reads the in-memory snapshot
+        return (
+            ds.dataset(table)
+            .scanner(columns=columns, batch_size=batch_size)
+            .to_reader()
+        )
+
+    @override
+    def scan_samples(
+        self,
+        columns: Sequence[str] | None = None,
+        filter: LogFilter | None = None,
+        batch_size: int = DEFAULT_SCAN_BATCH_SIZE,
+    ) -> pa.RecordBatchReader:
+        if not self._index_samples:
+            raise ValueError(
+                "The store has no sample index. Run `flow store import --samples` to create it."
+            )
+        columns = list(columns) if columns is not None else SAMPLE_SCAN_COLUMNS
+        if unknown := [c for c in columns if c not in SAMPLE_SCAN_COLUMNS]:
+            raise ValueError(
+                f"Unknown sample columns: {', '.join(unknown)}. Columns are: {', '.join(SAMPLE_SCAN_COLUMNS)}"
+            )
+        # Samples are ordered as their logs are by `scan`, then as in the log
+        logs = self.scan(["log_path", *_SAMPLE_LOG_COLUMNS], filter).read_all()
+        sample_columns = [c for c in columns if c not in _SAMPLE_LOG_COLUMNS]
+        samples = (
+            self._open_table(SAMPLES)
+            .to_pyarrow_dataset()
+            .to_table(columns=_unique(["log_path", *sample_columns]))
+        )
+        log_index = pc.index_in(samples["log_path"], value_set=logs["log_path"])
+        samples = samples.append_column("_log", log_index).append_column(
+            "_row", pa.array(range(len(samples)), type=pa.int64())
+        )
+        samples = samples.filter(pc.field("_log").is_valid()).sort_by(
+            [("_log", "ascending"), ("_row", "ascending")]
+        )
+        sample_logs = logs.take(samples["_log"])
+        table = pa.table(
+            {
+                c: sample_logs[c] if c in _SAMPLE_LOG_COLUMNS else samples[c]
+                for c in columns
+            }
+        )
+        return pa.RecordBatchReader.from_batches(
+            table.schema, table.to_batches(max_chunksize=batch_size)
+        )
+
+    def _get_log_table(
+        self, task_ids: set[str], columns: list[str], latest: bool = False
+    ) -> pa.Table:
+        """Read the rows for the given task identifiers.
+
+        The returned table has the task identifier column, `log_path`, and the
+        requested columns.
+
+        Args:
+            task_ids: The task identifiers to read rows for.
+            columns: The columns to read.
+            latest: Read the latest version even if reads are pinned.
+        """
+        if self._backfill and (latest or self._as_of is None):
+            # A pinned version is immutable, so rows it has without the
+            # current identifier can't be backfilled
+            try:
+                self._set_task_identifiers()
+            except Exception as e:
+                # Rows without the identifier are still found once it succeeds
+                logger.warning(f"Failed to update store task identifiers: {e}")
+        dt = self._read_table(latest=latest)
 
-        dt = self._open_table(LOGS)
         # deltalake 1.6 writes string columns as parquet `string_view`, and
         # pyarrow 24's Acero scanner has no comparison kernels for that type,
         # so every form of pushdown filter (isin, equal, cast.isin, deltalake's
-        # own `filters=` arg) fails. We materialize the two needed columns —
-        # Acero casts string_view→string during scan — then filter in Python.
+        # own `filters=` arg) fails. We materialize the needed columns —
+        # Acero casts string_view→string during scan — then filter in memory.
         # Retest with later pyarrow versions: once the missing kernels land
         # (or deltalake stops emitting string_view), switch back to passing
         # `filter=pc.field(_task_id_col()).isin(task_ids)` to to_table for
         # proper predicate pushdown.
-        table = dt.to_pyarrow_dataset().to_table(columns=[_task_id_col(), "log_path"])
-        mask = pc.is_in(table[_task_id_col()], value_set=pa.array(list(task_ids)))
-        table = table.filter(mask)
+        table = self._read_columns(
+            [_task_id_col(), "log_path", *columns], dt, task_ids=task_ids
+        )
+        return table.filter(
+            pc.field(_task_id_col()).isin(list(task_ids))
+            & pc.field("log_path").is_valid()
+        )
 
+    def _get_logs(self, task_ids: set[str]) -> dict[str, set[str]]:
+        table = self._get_log_table(task_ids, [])
         result: dict[str, set[str]] = {}
         for task_id, log_path in zip(
             table[_task_id_col()].to_pylist(),
             table["log_path"].to_pylist(),
             strict=True,
         ):
-            if task_id is None or log_path is None:
-                continue
-            if task_id not in result:
-                result[task_id] = set()
-            result[task_id].add(log_path)
+            result.setdefault(task_id, set()).add(log_path)
         return result
 
     def _ensure_task_id_col(self) -> DeltaTable:
-        """Add the current task identifier column to a store written by older code."""
-        dt = self._open_table(LOGS)
+        """Add the current task identifier column to a store written by older code.
+
+        Returns:
+            The logs table to read from.
+        """
+        dt = self._read_table(latest=True)
         if _task_id_col() not in [f.name for f in dt.schema().fields]:
-            dt.alter.add_columns(Field(_task_id_col(), PrimitiveType("string")))
-            dt = self._open_table(LOGS)
+            self._open_table(LOGS).alter.add_columns(
+                Field(_task_id_col(), PrimitiveType("string"))
+            )
+            dt = self._read_table(latest=True)
         return dt
 
     def _set_task_identifiers(self) -> None:
         """Find logs with missing task_identifier and compute it from the log header."""
         dt = self._ensure_task_id_col()
-        table = dt.to_pyarrow_table()
+        if _backfill_complete(dt):
+            return
+        table_version = dt.version()
+        table = self._read_columns([_task_id_col(), "log_path"], dt)
 
         # Find entries with empty or null task_identifier
         task_ids = table[_task_id_col()].to_pylist()
@@ -562,43 +1719,46 @@ class DeltaLakeStore(FlowStoreInternal):
             if not task_id and log_path is not None
         ]
 
-        if not log_paths_to_update:
-            return
-
-        flow_print("\nUpdating store task identifiers")
-        logs_to_update: list[tuple[str, str]] = []
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            TextColumn("[progress.percentage]{task.completed}/{task.total}"),
-            console=console,
-            transient=True,
-        ) as progress:
-            progress_task = progress.add_task(
-                "Updating", total=len(log_paths_to_update)
-            )
-            for log_path in log_paths_to_update:
-                try:
-                    entry = _file_to_log_entry(log_path)
-                    logs_to_update.append((log_path, entry.task_identifier))
-                except Exception as e:
-                    logger.info(f"Failed to read log {path_str(log_path)}: {e}")
-                progress.advance(progress_task)
-
-        if not logs_to_update:
-            return
-
-        # Update using merge
-        update_table = pa.Table.from_pydict(
-            {
-                "log_path": [log_path for log_path, _ in logs_to_update],
-                _task_id_col(): [task_id for _, task_id in logs_to_update],
-            }
+        if log_paths_to_update:
+            flow_print("\nUpdating store task identifiers")
+            with PathProgressDisplay("Updating", len(log_paths_to_update)) as display:
+                for start in range(0, len(log_paths_to_update), _BACKFILL_CHUNK_SIZE):
+                    chunk = log_paths_to_update[start : start + _BACKFILL_CHUNK_SIZE]
+                    records = run_coroutine(self._read_log_records(chunk, display))
+                    # The headers have been read anyway, so fill in the header
+                    # columns too
+                    if records:
+                        self._update_header_columns(records)
+            evict_header_cache()
+
+        # Rows whose log can't be read keep a null identifier (they can never
+        # match a task) until they are re-imported or removed.
+        self._mark_backfill_complete(table_version)
+
+    async def _read_log_records(
+        self, log_paths: list[str], display: PathProgressDisplay
+    ) -> list[LogRecord]:
+        async def _read(log_path: str) -> LogRecord | None:
+            record = await _read_log_record(log_path)
+            display.advance(log_path)
+            return record
+
+        records = await tg_collect_bounded(
+            [partial(_read, log_path) for log_path in log_paths],
+            DEFAULT_MAX_CONCURRENCY,
         )
+        return [r for r in records if r is not None]
 
-        dt.merge(
-            source=update_table,
-            predicate="target.log_path = source.log_path",
-            source_alias="source",
-            target_alias="target",
-        ).when_matched_update({_task_id_col(): f"source.{_task_id_col()}"}).execute()
+    def _mark_backfill_complete(self, table_version: int) -> None:
+        """Record that all rows as of `table_version` have a task identifier."""
+        dt = self._open_table(LOGS)
+        description = json.loads(dt.metadata().description or "{}")
+        description[_BACKFILL_MARKER] = {
+            "task_identifier_version": TASK_IDENTIFIER_VERSION,
+            "table_version": table_version,
+        }
+        try:
+            dt.alter.set_table_description(json.dumps(description))
+        except Exception as e:
+            # Only an optimization: the next read will scan again
+            logger.info(f"Failed to record task identifier backfill: {e}")
@@ -0,0 +1,212 @@
+"""Read across several stores, writing to one.
+
+A federated store answers lookups from a primary store plus any number of
+read-only stores (e.g. per-team stores alongside a shared one), querying them
+concurrently and merging the results. Everything that writes goes to the
+primary store only.
+"""
+
+from collections.abc import Callable, Sequence
+from functools import partial
+from typing import TypeVar
+
+import anyio
+import pyarrow as pa
+import pyarrow.compute as pc
+from inspect_ai._util._async import run_coroutine, tg_collect
+from inspect_ai.log import EvalLog
+from typing_extensions import override
+
+from inspect_flow._store.deltalake import (
+    DeltaLakeStore,
+    _best_matches,
+    _Candidate,
+)
+from inspect_flow._store.store import (
+    DEFAULT_RETENTION_HOURS,
+    DEFAULT_SCAN_BATCH_SIZE,
+    FlowStoreInternal,
+    StoreDedupeResult,
+    StoreLogMatch,
+    StoreOptimizeResult,
+)
+from inspect_flow._types.flow_types import LogFilter
+from inspect_flow._util.constants import DEFAULT_MAX_CONCURRENCY
+from inspect_flow._util.logs import sort_log_table
+
+T = TypeVar("T")
+
+
+class FederatedStore(FlowStoreInternal):
+    """A primary store that also reads logs from other stores.
+
+    Args:
+        primary: The store that writes go to, and that is read first.
+        secondary: Stores that are only read from.
+    """
+
+    def __init__(
+        self, primary: DeltaLakeStore, secondary: Sequence[DeltaLakeStore]
+    ) -> None:
+        self._primary = primary
+        self._stores = [primary, *secondary]
+
+    def _fan_out(self, read: Callable[[DeltaLakeStore], T]) -> list[T]:
+        """Run a read on every store concurrently, in store order."""
+
+        async def _read(store: DeltaLakeStore) -> T:
+            return await anyio.to_thread.run_sync(read, store)
+
+        return run_coroutine(tg_collect([partial(_read, s) for s in self._stores]))
+
+    @property
+    @override
+    def store_path(self) -> str:
+        return self._primary.store_path
+
+    @property
+    @override
+    def version(self) -> str:
+        return self._primary.version
+
+    @override
+    def import_log_path(
+        self,
+        log_path: str | Sequence[str],
+        recursive: bool = False,
+        dry_run: bool = False,
+        verbose: bool = False,
+    ) -> None:
+        self._primary.import_log_path(
+            log_path, recursive=recursive, dry_run=dry_run, verbose=verbose
+        )
+
+    @override
+    def get_logs(self, filter: LogFilter | None = None) -> set[str]:
+        return set().union(*self._fan_out(lambda s: s.get_logs(filter)))
+
+    @override
+    def scan(
+        self,
+        columns: Sequence[str] | None = None,
+        filter: LogFilter | None = None,
+        batch_size: int = DEFAULT_SCAN_BATCH_SIZE,
+    ) -> pa.RecordBatchReader:
+        # Deduplicating and sorting need the log path
+        read = None if columns is None else list(dict.fromkeys(["log_path", *columns]))
+        tables = self._fan_out(lambda s: s.scan(read, filter).read_all())
+        table = pa.concat_tables(tables)
+        # A log indexed in several stores is returned once, from the first
+        # store that has it
+        first = (
+            table.append_column("row", pa.array(range(len(table)), type=pa.int64()))
+            .group_by("log_path", use_threads=False)
+            .aggregate([("row", "min")])
+        )
+        table = sort_log_table(table.take(first["row_min"]))
+        if columns is not None:
+            table = table.select(list(columns))
+        return pa.RecordBatchReader.from_batches(
+            table.schema, table.to_batches(max_chunksize=batch_size)
+        )
+
+    @override
+    def scan_samples(
+        self,
+        columns: Sequence[str] | None = None,
+        filter: LogFilter | None = None,
+        batch_size: int = DEFAULT_SCAN_BATCH_SIZE,
+    ) -> pa.RecordBatchReader:
+        if not any(s._index_samples for s in self._stores):
+            return self._primary.scan_samples(columns, filter, batch_size)
+        read = None if columns is None else list(dict.fromkeys(["log_path", *columns]))
+        # Stores without a sample index are skipped
+        tables = self._fan_out(
+            lambda s: (
+                s.scan_samples(read, filter).read_all() if s._index_samples else None
+            )
+        )
+        # Samples of a log indexed in several stores come from the first
+        # store that has it
+        seen: set[str] = set()
+        unique: list[pa.Table] = []
+        for table in tables:
+            if table is None:
+                continue
+            seen_logs = pa.array(list(seen), type=pa.string())
+            unique.append(table.filter(~pc.field("log_path").isin(seen_logs)))
+            seen.update(table["log_path"].to_pylist())
+        table = pa.concat_tables(unique)
+        # Keep each log's samples in order while ordering the logs
+        order = sort_log_table(pa.table({"log_path": pc.unique(table["log_path"])}))[
+            "log_path"
+        ]
+        table = (
+            table.append_column("_log", pc.index_in(table["log_path"], order))
+            .append_column("_row", pa.array(range(len(table)), type=pa.int64()))
+            .sort_by([("_log", "ascending"), ("_row", "ascending")])
+        )
+        table = table.drop_columns(["_log", "_row"])
+        if columns is not None:
+            table = table.select(list(columns))
+        return pa.RecordBatchReader.from_batches(
+            table.schema, table.to_batches(max_chunksize=batch_size)
+        )
+
+    @override
+    def remove_log_prefix(
+        self,
+        prefix: str | Sequence[str],
+        missing: bool = False,
+        recursive: bool = False,
+        dry_run: bool = False,
+        verbose: bool = True,
+        filter: LogFilter | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        self._primary.remove_log_prefix(
+            prefix,
+            missing=missing,
+            recursive=recursive,
+            dry_run=dry_run,
+            verbose=verbose,
+            filter=filter,
+            max_concurrency=max_concurrency,
+        )
+
+    @override
+    def optimize(
+        self,
+        retention_hours: int = DEFAULT_RETENTION_HOURS,
+        dry_run: bool = False,
+        force: bool = False,
+    ) -> StoreOptimizeResult:
+        return self._primary.optimize(
+            retention_hours=retention_hours, dry_run=dry_run, force=force
+        )
+
+    @override
+    def dedupe(self, dry_run: bool = False) -> StoreDedupeResult:
+        return self._primary.dedupe(dry_run=dry_run)
+
+    @override
+    def search_for_logs(self, task_ids: set[str]) -> dict[str, StoreLogMatch]:
+        merged: dict[str, list[_Candidate]] = {}
+        for candidates in self._fan_out(lambda s: s._search_candidates(task_ids)):
+            for task_id, task_candidates in candidates.items():
+                merged.setdefault(task_id, []).extend(task_candidates)
+        for task_id, task_candidates in merged.items():
+            unique: dict[str, _Candidate] = {}
+            for c in task_candidates:
+                unique.setdefault(c.log_path, c)
+            # The sort is stable, so ties go to the earlier store
+            merged[task_id] = sorted(unique.values(), key=_Candidate.rank, reverse=True)
+        return _best_matches(merged)
+
+    @override
+    def add_run_logs(self, eval_logs: list[EvalLog]) -> None:
+        self._primary.add_run_logs(eval_logs)
+
+    @override
+    def flush(self) -> None:
+        self._primary.flush()
@@ -0,0 +1,174 @@
+"""Local read-through mirror of a remote Delta table.
+
+The mirror keeps a copy of the table's transaction log and data files under
+`user_data_dir()`, so reads of a remote store run against local Parquet. Delta
+commit, checkpoint and data files are immutable once written, so a sync only
+fetches the commits newer than the last one mirrored (probing for each by
+name, without listing the log) and the data files those commits add. Writes
+always go to the remote table; the mirror picks them up on its next sync.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from logging import getLogger
+from pathlib import Path
+
+from deltalake import DeltaTable
+from inspect_ai._util.file import filesystem
+
+from inspect_flow._util.data import user_data_dir
+
+logger = getLogger(__name__)
+
+_MIRROR_DIR = "store_mirrors"
+_DELTA_LOG = "_delta_log"
+_LAST_CHECKPOINT = "_last_checkpoint"
+# Unreferenced data files are kept this long, as another process sharing the
+# mirror may still be reading an older version, or have fetched a newer one
+_PRUNE_AFTER_SECONDS = 60 * 60
+
+
+def _commit_file(version: int) -> str:
+    return f"{version:020d}.json"
+
+
+def _checkpoint_files(checkpoint: dict[str, int]) -> list[str]:
+    version = checkpoint["version"]
+    if parts := checkpoint.get("parts"):
+        return [
+            f"{version:020d}.checkpoint.{i:010d}.{parts:010d}.parquet"
+            for i in range(1, parts + 1)
+        ]
+    return [f"{version:020d}.checkpoint.parquet"]
+
+
+def mirror_dir(table_uri: str) -> Path:
+    """The local directory mirroring a remote table."""
+    key = hashlib.sha256(table_uri.encode()).hexdigest()[:16]
+    return user_data_dir() / _MIRROR_DIR / key
+
+
+class TableMirror:
+    """A local copy of a remote Delta table, synced incrementally."""
+
+    def __init__(self, table_uri: str) -> None:
+        self._remote = table_uri.rstrip("/")
+        self._fs = filesystem(self._remote)
+        self._local = mirror_dir(self._remote)
+        self._table: DeltaTable | None = None
+
+    def _fetch(self, name: str, dest: Path) -> bool:
+        """Copy a remote file into the mirror.
+
+        Returns:
+            False if the remote file does not exist.
+        """
+        try:
+            data = self._fs.read_bytes(f"{self._remote}/{name}")
+        except FileNotFoundError:
+            return False
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so an interrupted sync never leaves a partial file
+        # that a later sync would take to be complete
+        tmp = dest.with_name(f"{dest.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, dest)
+        return True
+
+    def _latest_local_version(self) -> int:
+        log = self._local / _DELTA_LOG
+        versions = [
+            int(p.name.split(".")[0])
+            for p in log.glob("*.json")
+            if p.name.split(".")[0].isdigit()
+        ]
+        return max(versions, default=-1)
+
+    def _is_replaced(self, version: int) -> bool:
+        """Whether the remote table was deleted or recreated since the last sync.
+
+        The latest commit is never removed by log cleanup, so it is missing or
+        different only if the table has been replaced.
+        """
+        local = self._local / _DELTA_LOG / _commit_file(version)
+        try:
+            info = self._fs.info(f"{self._remote}/{_DELTA_LOG}/{local.name}")
+        except FileNotFoundError:
+            return True
+        return info.size != local.stat().st_size
+
+    def _sync_log(self) -> int:
+        """Fetch the commits newer than the mirror's latest.
+
+        Returns:
+            The latest mirrored version.
+        """
+        log = self._local / _DELTA_LOG
+        version = self._latest_local_version()
+        if version >= 0 and self._is_replaced(version):
+            logger.info(f"Store table {self._remote} was replaced, resetting mirror")
+            shutil.rmtree(self._local, ignore_errors=True)
+            self._table = None
+            version = -1
+        # The remote log may have been cleaned up past the commits the mirror
+        # has, so start from the latest checkpoint if it is newer
+        checkpoint_path = log / _LAST_CHECKPOINT
+        if self._fetch(f"{_DELTA_LOG}/{_LAST_CHECKPOINT}", checkpoint_path):
+            checkpoint = json.loads(checkpoint_path.read_text())
+            for name in _checkpoint_files(checkpoint):
+                if not (log / name).exists():
+                    self._fetch(f"{_DELTA_LOG}/{name}", log / name)
+            version = max(version, checkpoint["version"])
+        while self._fetch(
+            f"{_DELTA_LOG}/{_commit_file(version + 1)}",
+            log / _commit_file(version + 1),
+        ):
+            version += 1
+        return version
+
+    def _sync_files(self, dt: DeltaTable) -> None:
+        """Fetch the data files of the table version that are not yet mirrored.
+
+        Data files the version no longer references (removed by compaction or
+        deletes) are pruned.
+        """
+        actions = dt.get_add_actions(flatten=True)
+        names = set(actions.column("path").to_pylist())
+        for name in names:
+            dest = self._local / name
+            if not dest.exists() and not self._fetch(name, dest):
+                raise FileNotFoundError(f"{self._remote}/{name}")
+        self._prune_files(names)
+
+    def _prune_files(self, names: set[str]) -> None:
+        """Delete mirrored data files not among `names` that have aged out."""
+        cutoff = time.time() - _PRUNE_AFTER_SECONDS
+        for path in self._local.rglob("*"):
+            relative = path.relative_to(self._local)
+            if (
+                relative.parts[0] == _DELTA_LOG
+                or not path.is_file()
+                or relative.as_posix() in names
+            ):
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                # Pruned by another process sharing the mirror
+                pass
+
+    def sync(self) -> DeltaTable:
+        """Bring the mirror up to date and open it at the latest version."""
+        if self._sync_log() < 0:
+            raise FileNotFoundError(f"No Delta table at {self._remote}")
+        if self._table is None:
+            self._table = DeltaTable(str(self._local))
+        else:
+            self._table.update_incremental()
+        self._sync_files(self._table)
+        return self._table
@@ -0,0 +1,103 @@
+"""Find store entries whose log files no longer exist.
+
+Logs are grouped by directory so that a directory holding several logs costs
+one listing rather than one existence check per log. Directories that can't be
+listed (e.g. no list permission on a bucket) fall back to checking each log.
+"""
+
+from collections.abc import Callable, Iterable
+from functools import partial
+from logging import getLogger
+
+import anyio
+from inspect_ai._util._async import run_coroutine
+from inspect_ai._util.file import exists, filesystem
+
+from inspect_flow._util.constants import DEFAULT_MAX_CONCURRENCY
+from inspect_flow._util.util import tg_collect_bounded
+
+logger = getLogger(__name__)
+
+
+def _split(log: str) -> tuple[str, str]:
+    # Store paths are URIs, so the separator is always "/"
+    directory, _, name = log.rpartition("/")
+    return directory, name
+
+
+async def _missing_in_dir(
+    directory: str, logs: list[str], on_checked: Callable[[str], None] | None
+) -> tuple[set[str], list[str]]:
+    """List a directory and diff it against the logs expected in it.
+
+    Returns:
+        The missing logs, and the logs that could not be checked by listing.
+    """
+    fs = filesystem(directory)
+    try:
+        listing = await anyio.to_thread.run_sync(fs.ls, directory)
+        names = {_split(info.name)[1] for info in listing if info.type == "file"}
+    except FileNotFoundError:
+        names = set()
+    except Exception as e:
+        logger.debug(f"Failed to list {directory}, checking logs individually: {e}")
+        return set(), logs
+    if on_checked:
+        for log in logs:
+            on_checked(log)
+    return {log for log in logs if _split(log)[1] not in names}, []
+
+
+async def _missing_log(
+    log: str, on_checked: Callable[[str], None] | None
+) -> tuple[set[str], list[str]]:
+    try:
+        if await anyio.to_thread.run_sync(exists, log):
+            return set(), []
+    except Exception as e:
+        logger.warning(f"Failed to check existence of log {log}: {e}")
+    finally:
+        if on_checked:
+            on_checked(log)
+    return {log}, []
+
+
+def find_missing_logs(
+    logs: Iterable[str],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    on_checked: Callable[[str], None] | None = None,
+) -> set[str]:
+    """Find the logs that no longer exist.
+
+    Directories with more than one log are listed once; other logs are checked
+    with an existence check. Logs whose existence can't be determined count as
+    missing.
+
+    Args:
+        logs: Log paths (URIs) to check.
+        max_concurrency: Maximum number of listings or checks in flight at once.
+        on_checked: Called with each log once it has been checked.
+    """
+    by_dir: dict[str, list[str]] = {}
+    for log in logs:
+        by_dir.setdefault(_split(log)[0], []).append(log)
+
+    async def _find() -> set[str]:
+        checks = [
+            partial(_missing_in_dir, directory, dir_logs, on_checked)
+            if len(dir_logs) > 1
+            else partial(_missing_log, dir_logs[0], on_checked)
+            for directory, dir_logs in by_dir.items()
+        ]
+        results = await tg_collect_bounded(checks, max_concurrency)
+        missing = set().union(*(found for found, _ in results))
+        unlisted = [log for _, unchecked in results for log in unchecked]
+        if unlisted:
+            results = await tg_collect_bounded(
+                [partial(_missing_log, log, on_checked) for log in unlisted],
+                max_concurrency,
+            )
+            missing.update(*(found for found, _ in results))
+        return missing
+
+    return run_coroutine(_find())
@@ -0,0 +1,150 @@
+"""Rows of the store's sample index.
+
+The sample index is an optional second table with one row per sample of each
+indexed log, built from the log's sample summaries so the samples themselves
+are never read. It answers cross-log sample questions (e.g. which samples
+failed for every model) with a columnar scan instead of opening every log.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from logging import getLogger
+from typing import Any
+
+import pyarrow as pa
+from inspect_ai.log import EvalSampleSummary
+from inspect_ai.log._file import read_eval_log_sample_summaries_async
+from inspect_ai.scorer import value_to_float
+
+from inspect_flow._util.constants import DEFAULT_MAX_CONCURRENCY
+from inspect_flow._util.path_util import path_str
+from inspect_flow._util.util import tg_collect_bounded
+
+logger = getLogger(__name__)
+
+_to_float = value_to_float()
+
+
+def _score_values(summary: EvalSampleSummary) -> dict[str, float]:
+    """Numeric score values by scorer, with `C`/`I`-style values as 1.0/0.0.
+
+    Dict-valued scores contribute one entry per key (`scorer/key`); values
+    with no numeric interpretation are left out.
+    """
+    values: dict[str, float] = {}
+    for scorer, score in (summary.scores or {}).items():
+        items = (
+            {f"{scorer}/{k}": v for k, v in score.value.items()}
+            if isinstance(score.value, dict)
+            else {scorer: score.value}
+        )
+        for name, value in items.items():
+            if isinstance(value, (str, int, float, bool)):
+                values[name] = _to_float(value)
+    return values
+
+
+def _summary_ts(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+@dataclass
+class SampleRecord:
+    log_path: str
+    sample_id: str
+    epoch: int
+    scores: dict[str, float]
+    completed: bool
+    error: str | None = None
+    limit: str | None = None
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    total_tokens: int | None = None
+    total_time: float | None = None
+    working_time: float | None = None
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+
+    @classmethod
+    def from_summary(cls, log_path: str, summary: EvalSampleSummary) -> "SampleRecord":
+        usage = summary.model_usage.values()
+        return cls(
+            log_path=log_path,
+            sample_id=str(summary.id),
+            epoch=summary.epoch,
+            scores=_score_values(summary),
+            completed=summary.completed,
+            error=summary.error,
+            limit=summary.limit,
+            input_tokens=sum(u.input_tokens for u in usage) if usage else None,
+            output_tokens=sum(u.output_tokens for u in usage) if usage else None,
+            total_tokens=sum(u.total_tokens for u in usage) if usage else None,
+            total_time=summary.total_time,
+            working_time=summary.working_time,
+            started_at=_summary_ts(summary.started_at),
+            completed_at=_summary_ts(summary.completed_at),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **self.__dict__,
+            # Arrow builds map columns from key/value pairs
+            "scores": list(self.scores.items()),
+        }
+
+    @classmethod
+    def to_schema(cls) -> pa.Schema:
+        return pa.schema(
+            [
+                ("log_path", pa.string()),
+                ("sample_id", pa.string()),
+                ("epoch", pa.int64()),
+                ("scores", pa.map_(pa.string(), pa.float64())),
+                ("completed", pa.bool_()),
+                ("error", pa.string()),
+                ("limit", pa.string()),
+                ("input_tokens", pa.int64()),
+                ("output_tokens", pa.int64()),
+                ("total_tokens", pa.int64()),
+                ("total_time", pa.float64()),
+                ("working_time", pa.float64()),
+                ("started_at", pa.timestamp("us", tz="UTC")),
+                ("completed_at", pa.timestamp("us", tz="UTC")),
+            ]
+        )
+
+
+def samples_table(records: list[SampleRecord]) -> pa.Table:
+    return pa.Table.from_pylist(
+        [r.to_dict() for r in records], schema=SampleRecord.to_schema()
+    )
+
+
+async def read_sample_records(
+    log_paths: list[str],
+    on_read: Callable[[str], None] | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> dict[str, list[SampleRecord]]:
+    """Read the sample summaries of logs.
+
+    Returns:
+        The sample records of each log that could be read.
+    """
+
+    async def _read(log_path: str) -> tuple[str, list[SampleRecord] | None]:
+        try:
+            summaries = await read_eval_log_sample_summaries_async(log_path)
+            return log_path, [SampleRecord.from_summary(log_path, s) for s in summaries]
+        except Exception as e:
+            logger.info(f"Failed to read samples of {path_str(log_path)}: {e}")
+            return log_path, None
+        finally:
+            if on_read:
+                on_read(log_path)
+
+    results = await tg_collect_bounded(
+        [partial(_read, p) for p in log_paths], max_concurrency
+    )
+    return {p: records for p, records in results if records is not None}
@@ -0,0 +1,223 @@
+"""Write-behind spool for store appends.
+
+Each run that finishes (and each step that writes logs) would otherwise commit
+its own append to the store, and concurrent commits to one table contend and
+retry. With the spool, records are written to a local file and a background
+thread commits everything pending in one append, at most `max_delay` seconds
+later. Processes on the same machine share a spool directory per table, so one
+flush can commit the records of several runs.
+
+Records are on disk before `append` returns, and a spool file is only deleted
+once its commit succeeds. A file is claimed for a flush by renaming it, so two
+flushers never commit the same file. Files left behind by a process that exited
+before flushing (or whose claim went stale) are committed by the next spool
+opened on the same table. Committing a record the store already has does not
+add a row, so replaying a file whose commit succeeded just before a crash is
+harmless.
+"""
+
+import atexit
+import hashlib
+import os
+import random
+import threading
+import time
+import uuid
+import weakref
+from collections.abc import Callable
+from logging import getLogger
+from pathlib import Path
+
+import pyarrow as pa
+from deltalake.exceptions import CommitFailedError
+
+from inspect_flow._util.data import user_data_dir
+
+logger = getLogger(__name__)
+
+DEFAULT_SPOOL_DELAY = 5.0
+"""Default maximum seconds between spooling a record and committing it."""
+
+_SPOOL_DIR = "store_spools"
+_PENDING = ".arrow"
+_CLAIMED = ".claimed"
+# A flush that has held its claim this long is assumed to have died with its
+# process
+_STALE_CLAIM_SECONDS = 600
+_COMMIT_ATTEMPTS = 5
+_COMMIT_BACKOFF_SECONDS = 0.5
+
+# Open spools by directory, closed by one exit handler per directory
+_open_spools: dict[Path, "weakref.WeakSet[LogSpool]"] = {}
+_open_spools_lock = threading.Lock()
+
+
+def spool_dir(table_uri: str) -> Path:
+    """The local directory spooling appends to a table."""
+    key = hashlib.sha256(table_uri.rstrip("/").encode()).hexdigest()[:16]
+    return user_data_dir() / _SPOOL_DIR / key
+
+
+class LogSpool:
+    """Local journal of pending appends, committed in batches in the background.
+
+    Args:
+        table_uri: The table the records are appended to.
+        commit: Commits a batch of spooled records to the table. Raises
+            `CommitFailedError` if the commit conflicted with another writer.
+        max_delay: Maximum seconds to wait before committing spooled records.
+    """
+
+    def __init__(
+        self,
+        table_uri: str,
+        commit: Callable[[pa.Table], None],
+        max_delay: float = DEFAULT_SPOOL_DELAY,
+    ) -> None:
+        self._dir = spool_dir(table_uri)
+        self._commit = commit
+        self._max_delay = max_delay
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._release_stale_claims()
+        if self._pending():
+            # Replay records spooled by earlier processes
+            logger.info(f"Replaying spooled store records from {self._dir}")
+            self._start()
+        with _open_spools_lock:
+            if self._dir not in _open_spools:
+                _open_spools[self._dir] = weakref.WeakSet()
+                atexit.register(_close_spools, self._dir)
+            _open_spools[self._dir].add(self)
+
+    def append(self, records: pa.Table) -> None:
+        """Spool records to be committed by the next flush."""
+        if records.num_rows == 0:
+            return
+        self._dir.mkdir(parents=True, exist_ok=True)
+        name = f"{time.time_ns():020d}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        dest = self._dir / f"{name}{_PENDING}"
+        # Write then rename so a flush never claims a partial file
+        tmp = dest.with_name(dest.name + ".tmp")
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with pa.ipc.new_file(sink, records.schema) as writer:
+                writer.write_table(records)
+        os.replace(tmp, dest)
+        self._start()
+
+    def flush(self) -> int:
+        """Commit all spooled records now.
+
+        Returns:
+            The number of records committed.
+        """
+        with self._flush_lock:
+            claimed = self._claim()
+            if not claimed:
+                return 0
+            tables = [t for t in (self._read(p) for p in claimed) if t is not None]
+            records = (
+                pa.concat_tables(tables, promote_options="default") if tables else None
+            )
+            if records is not None and not self._commit_with_retry(records):
+                self._release(claimed)
+                return 0
+            for p in claimed:
+                p.unlink(missing_ok=True)
+            return records.num_rows if records is not None else 0
+
+    def close(self) -> None:
+        """Stop the background flush and commit anything still spooled."""
+        with _open_spools_lock:
+            _open_spools.get(self._dir, weakref.WeakSet()).discard(self)
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _start(self) -> None:
+        if self._thread is None and not self._stop.is_set():
+            self._thread = threading.Thread(
+                target=self._run, name="flow-store-spool", daemon=True
+            )
+            self._thread.start()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            # Let records from other runs accumulate, up to the bounded delay
+            self._stop.wait(self._max_delay)
+            self._wake.clear()
+            self.flush()
+
+    def _pending(self) -> list[Path]:
+        return sorted(self._dir.glob(f"*{_PENDING}"))
+
+    def _claim(self) -> list[Path]:
+        claimed: list[Path] = []
+        for p in self._pending():
+            dest = p.with_name(f"{p.stem}.{os.getpid()}{_CLAIMED}")
+            try:
+                os.rename(p, dest)
+            except FileNotFoundError:
+                # Claimed by another process
+                continue
+            # Renaming keeps the mtime, which dates the claim for staleness
+            os.utime(dest)
+            claimed.append(dest)
+        return claimed
+
+    def _release(self, claimed: list[Path]) -> None:
+        for p in claimed:
+            name = p.name.removesuffix(_CLAIMED).rsplit(".", 1)[0]
+            try:
+                os.rename(p, p.with_name(f"{name}{_PENDING}"))
+            except FileNotFoundError:
+                continue
+
+    def _release_stale_claims(self) -> None:
+        cutoff = time.time() - _STALE_CLAIM_SECONDS
+        stale = []
+        for p in self._dir.glob(f"*{_CLAIMED}"):
+            try:
+                if p.stat().st_mtime < cutoff:
+                    stale.append(p)
+            except FileNotFoundError:
+                continue
+        self._release(stale)
+
+    def _read(self, p: Path) -> pa.Table | None:
+        try:
+            with pa.memory_map(str(p)) as source:
+                return pa.ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowInvalid) as e:
+            logger.warning(f"Discarding unreadable store spool file {p}: {e}")
+            return None
+
+    def _commit_with_retry(self, records: pa.Table) -> bool:
+        for attempt in range(_COMMIT_ATTEMPTS):
+            try:
+                self._commit(records)
+                return True
+            except CommitFailedError as e:
+                if attempt == _COMMIT_ATTEMPTS - 1:
+                    logger.warning(f"Failed to commit spooled store records: {e}")
+                    return False
+                # Back off with jitter so conflicting writers spread out
+                delay = _COMMIT_BACKOFF_SECONDS * 2**attempt
+                time.sleep(delay * random.uniform(0.5, 1.5))
+            except Exception as e:
+                logger.warning(f"Failed to commit spooled store records: {e}")
+                return False
+        return False
+
+
+def _close_spools(dir: Path) -> None:
+    with _open_spools_lock:
+        spools = list(_open_spools.get(dir, ()))
+    for spool in spools:
+        spool.close()
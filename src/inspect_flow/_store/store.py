@@ -1,8 +1,12 @@
+import os
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from logging import getLogger
 from pathlib import Path
 from typing import NamedTuple, Sequence
 
+import pyarrow as pa
 from inspect_ai._util.file import filesystem
 from inspect_ai.log import EvalLog
 
@@ -15,6 +19,7 @@ from inspect_flow._types.flow_types import (
 )
 from inspect_flow._types.log_filter import resolve_log_filter
 from inspect_flow._util.console import path
+from inspect_flow._util.constants import DEFAULT_MAX_CONCURRENCY
 from inspect_flow._util.data import user_data_dir
 from inspect_flow._util.logs import num_valid_samples
 from inspect_flow._util.path_util import absolute_path_relative_to
@@ -22,6 +27,42 @@ from inspect_flow._util.path_util import absolute_path_relative_to
 logger = getLogger(__name__)
 
 
+DEFAULT_RETENTION_HOURS = 168
+"""Default age of unreferenced files that `FlowStore.optimize()` deletes."""
+
+
+DEFAULT_SCAN_BATCH_SIZE = 65536
+"""Default maximum number of rows in each batch returned by `FlowStore.scan()`."""
+
+
+@dataclass
+class StoreOptimizeResult:
+    """Result of optimizing a flow store."""
+
+    files_before: int
+    """Number of data files before optimizing."""
+
+    files_after: int
+    """Number of data files after optimizing."""
+
+    files_vacuumed: int
+    """Number of unreferenced data files deleted (or that would be, for a dry run)."""
+
+    scan_seconds_before: float
+    """Time to scan the logs table before optimizing."""
+
+    scan_seconds_after: float
+    """Time to scan the logs table after optimizing."""
+
+
+@dataclass
+class StoreDedupeResult:
+    """Result of deduplicating a flow store."""
+
+    copies: dict[str, list[str]]
+    """Log paths removed from the store (or that would be, for a dry run), by the log path kept."""
+
+
 class FlowStore(ABC):
     """Interface for flow store implementations."""
 
@@ -69,6 +110,64 @@ class FlowStore(ABC):
         """
         pass
 
+    @abstractmethod
+    def scan(
+        self,
+        columns: Sequence[str] | None = None,
+        filter: LogFilter | None = None,
+        batch_size: int = DEFAULT_SCAN_BATCH_SIZE,
+    ) -> pa.RecordBatchReader:
+        """Read the logs in the store as Arrow record batches.
+
+        Rows are ordered as `list_logs()` orders log paths: grouped by
+        directory, directories ordered by most recent log file, and logs within
+        each directory by filename timestamp descending.
+
+        Args:
+            columns: Columns to read. Defaults to `log_path`, `task_identifier`,
+                `ts` (when the log was added to the store) and the log header
+                columns (`status`, `task`, `model`, `tags`, `completed_samples`,
+                `total_samples`, `started_at`, `completed_at`, `invalidated`,
+                `valid_samples`, `size`, `mtime`, `etag` and `fingerprint`,
+                which is shared by copies of the same log file).
+            filter: Optional filter to apply to log headers. Only logs passing
+                the filter are included. It is an error to specify both a
+                per-call filter and a store-level filter.
+            batch_size: Maximum number of rows in each batch.
+        """
+        pass
+
+    @abstractmethod
+    def scan_samples(
+        self,
+        columns: Sequence[str] | None = None,
+        filter: LogFilter | None = None,
+        batch_size: int = DEFAULT_SCAN_BATCH_SIZE,
+    ) -> pa.RecordBatchReader:
+        """Read the store's sample index as Arrow record batches.
+
+        The sample index has a row per sample (and epoch) of each log, read from
+        the log's sample summaries. It is only kept if enabled (see
+        `FlowStoreConfig.samples`). Rows are ordered by log as `scan()` orders
+        them, then as the samples are in the log.
+
+        Args:
+            columns: Columns to read. Defaults to `log_path`, the log's
+                `task_identifier`, `task` and `model`, and the sample columns
+                (`sample_id`, `epoch`, `scores` (a map of numeric score values
+                by scorer), `completed`, `error`, `limit`, `input_tokens`,
+                `output_tokens`, `total_tokens`, `total_time`, `working_time`,
+                `started_at` and `completed_at`).
+            filter: Optional filter to apply to log headers. Only samples of
+                logs passing the filter are included. It is an error to specify
+                both a per-call filter and a store-level filter.
+            batch_size: Maximum number of rows in each batch.
+
+        Raises:
+            ValueError: If the store has no sample index.
+        """
+        pass
+
     @abstractmethod
     def remove_log_prefix(
         self,
@@ -78,6 +177,7 @@ class FlowStore(ABC):
         dry_run: bool = False,
         verbose: bool = True,
         filter: LogFilter | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
     ) -> None:
         """Remove logs matching the given prefixes.
 
@@ -90,6 +190,51 @@ class FlowStore(ABC):
             filter: Optional filter to narrow which matched logs are removed.
                 Each candidate log's header is read and only those passing
                 the filter are removed.
+            max_concurrency: Maximum number of concurrent file system requests
+                when checking for missing logs.
+        """
+        pass
+
+    @abstractmethod
+    def optimize(
+        self,
+        retention_hours: int = DEFAULT_RETENTION_HOURS,
+        dry_run: bool = False,
+        force: bool = False,
+    ) -> StoreOptimizeResult:
+        """Compact the store's data files and delete files it no longer uses.
+
+        Small files are rewritten into larger ones clustered by task identifier,
+        the transaction log is checkpointed, and data files no longer referenced
+        by the store are deleted once older than the retention window.
+
+        Args:
+            retention_hours: Only delete unreferenced files older than this.
+                Readers of older store versions (e.g. concurrent runs or reads
+                pinned to a version) need those files, so keep this longer
+                than any run.
+            dry_run: Report what would be done without changing the store.
+            force: Allow a retention window shorter than the default
+                (`DEFAULT_RETENTION_HOURS`).
+
+        Raises:
+            ValueError: If `retention_hours` is shorter than the default and
+                `force` isn't set.
+        """
+        pass
+
+    @abstractmethod
+    def dedupe(self, dry_run: bool = False) -> StoreDedupeResult:
+        """Remove stored logs that are copies of another stored log.
+
+        The same log file is often stored under several paths, e.g. copies
+        made when a stored log is reused, or by the `copy` step. Copies are
+        recognized by the `fingerprint` column, which is computed for logs
+        stored without one. Of each set of copies, the log first added to the
+        store is kept. Only store rows are removed, never log files.
+
+        Args:
+            dry_run: Report what would be removed without changing the store.
         """
         pass
 
@@ -109,6 +254,18 @@ class FlowStoreInternal(FlowStore):
     def add_run_logs(self, eval_logs: list[EvalLog]) -> None:
         pass
 
+    def flush(self) -> None:
+        """Commit any appends still pending in the write-behind spool."""
+        pass
+
+
+def log_rank(valid_samples: int, completed_at: datetime | None) -> tuple[int, datetime]:
+    """The key ranking the logs of a task, greatest best.
+
+    More valid samples wins, then the most recently completed.
+    """
+    return (valid_samples, completed_at or datetime.min.replace(tzinfo=timezone.utc))
+
 
 def is_better_log(candidate: EvalLog, best: EvalLog | None) -> bool:
     """Compare two logs and determine if candidate is better than best.
@@ -122,14 +279,15 @@ def is_better_log(candidate: EvalLog, best: EvalLog | None) -> bool:
     """
     if best is None:
         return True
-    candidate_samples = num_valid_samples(candidate)
-    best_samples = num_valid_samples(best)
-    if best_samples > candidate_samples:
-        return False
-    if candidate_samples > best_samples:
-        return True
-    # If completed samples are equal, take the more recently completed one
-    return candidate.stats.completed_at > best.stats.completed_at
+    return _header_rank(candidate) > _header_rank(best)
+
+
+def _header_rank(log: EvalLog) -> tuple[int, datetime]:
+    completed_at = log.stats.completed_at
+    return log_rank(
+        num_valid_samples(log),
+        datetime.fromisoformat(completed_at) if completed_at else None,
+    )
 
 
 def _get_default_store_dir() -> Path:
@@ -151,6 +309,7 @@ def store_factory(
     base_dir: str,
     create: bool = False,
     quiet: bool = False,
+    samples: bool = False,
 ) -> FlowStoreInternal | None:
     store = spec_or_store if isinstance(spec_or_store, str) else spec_or_store.store
     if isinstance(store, NotGiven):
@@ -158,9 +317,22 @@ def store_factory(
 
     log_filter: LogFilter | None = None
     store_config: FlowStoreConfig | None = None
+    mirror = os.environ.get("INSPECT_FLOW_STORE_MIRROR", "").lower() in ("1", "true")
+    spool = os.environ.get("INSPECT_FLOW_STORE_SPOOL", "").lower() in ("1", "true")
+    samples = samples or os.environ.get("INSPECT_FLOW_STORE_SAMPLES", "").lower() in (
+        "1",
+        "true",
+    )
+    read_from: Sequence[str] = []
+    as_of: int | str | None = None
     if isinstance(store, FlowStoreConfig):
         store_config = store
         log_filter = resolve_log_filter(store.filter, base_dir=base_dir)
+        mirror = mirror or store.mirror
+        spool = spool or store.spool
+        samples = samples or store.samples
+        read_from = store.read_from or []
+        as_of = store.as_of
         store = store.path
 
     if store is None or store.lower() == "none":
@@ -172,17 +344,55 @@ def store_factory(
         return None
 
     # Import here to avoid circular imports
-    from inspect_flow._store.deltalake import DeltaLakeStore
+    from inspect_flow._store.deltalake import DeltaLakeStore, parse_as_of
 
     store_path = absolute_path_relative_to(store, base_dir=base_dir)
-    dl_store = DeltaLakeStore(store_path, create=create, log_filter=log_filter)
+    dl_store = DeltaLakeStore(
+        store_path,
+        create=create,
+        log_filter=log_filter,
+        mirror=mirror,
+        spool=spool,
+        samples=samples,
+        as_of=as_of,
+    )
     if dl_store.exists and not quiet:
         display().print(
             f"Using store{_store_mode_label(store_config)}:",
             path(store_path),
             action_key="logs",
         )
-    return dl_store if dl_store.exists else None
+    if not dl_store.exists:
+        return None
+    # Other stores are only read from, so skip any that don't exist
+    secondary: list[DeltaLakeStore] = []
+    # Version numbers are per store, so only a timestamp pins the other stores
+    read_as_of = (
+        as_of if as_of is not None and not isinstance(parse_as_of(as_of), int) else None
+    )
+    for read_path in read_from:
+        read_path = resolve_store_path(read_path, base_dir=base_dir)
+        if read_path == store_path:
+            continue
+        read_store = DeltaLakeStore(
+            read_path,
+            log_filter=log_filter,
+            mirror=mirror,
+            as_of=read_as_of,
+            read_only=True,
+        )
+        if read_store.exists:
+            secondary.append(read_store)
+        else:
+            logger.warning(f"Store to read from not found: {read_path}")
+    if not secondary:
+        return dl_store
+    from inspect_flow._store.federated import FederatedStore
+
+    if not quiet:
+        for s in secondary:
+            display().print("Reading store:", path(s.store_path), action_key="logs")
+    return FederatedStore(dl_store, secondary)
 
 
 def resolve_store_path(store: str | None, base_dir: str = ".") -> str:
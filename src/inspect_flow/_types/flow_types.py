@@ -953,7 +953,7 @@ class FlowDependencies(FlowBase):
     )
 
 
-InstantiateMode: TypeAlias = Literal["serial", "by_task", "parallel"]
+InstantiateMode: TypeAlias = Literal["serial", "by_task", "parallel", "process"]
 
 
 class InstantiateConfig(FlowBase):
@@ -961,7 +961,7 @@ class InstantiateConfig(FlowBase):
 
     mode: InstantiateMode = Field(
         default="serial",
-        description="`'serial'` instantiates one task at a time. `'by_task'` parallelizes across distinct task names but serializes instances that share a name. `'parallel'` instantiates everything concurrently.",
+        description="`'serial'` instantiates one task at a time. `'by_task'` parallelizes across distinct task names but serializes instances that share a name. `'parallel'` instantiates everything concurrently. `'process'` describes tasks in worker processes; runs then build only the tasks that need to run in the runner, in threads. Falls back to `'parallel'` if worker processes can't import the registered objects (e.g. tasks defined in a flow config file).",
     )
 
     max_threads: int = Field(
@@ -969,6 +969,21 @@ class InstantiateConfig(FlowBase):
         description="Maximum worker threads to use for instantiation.",
     )
 
+    max_processes: int | None = Field(
+        default=None,
+        description="Maximum worker processes to use for `'process'` instantiation. Defaults to the number of CPUs.",
+    )
+
+    cache_tasks: bool = Field(
+        default=False,
+        description="Load a task once per distinct factory and args (e.g. across the model variants of a matrix) and give each variant a shallow copy. Only enable for task factories that don't depend on the active model, model roles or generate config, and whose solvers, scorers and metadata can be shared between variants.",
+    )
+
+    skip_complete: bool = Field(
+        default=False,
+        description="Don't instantiate flow tasks that the task manifest written to `log_dir` by a previous run shows are complete. Runs reuse their logs without passing them to `eval_set`. The manifest's sample counts are trusted, so only enable when task code (e.g. a dataset) doesn't change without a change to its flow config.",
+    )
+
 
 class FlowInternal(FlowBase):
     """State populated by the spec loader. Not intended for direct user configuration.
@@ -1012,11 +1027,36 @@ class FlowStoreConfig(FlowBase):
         description="Whether to match existing logs from the store. Default is `False`.",
     )
 
+    read_from: Sequence[str] | None = Field(
+        default=None,
+        description="Additional stores to match existing logs from, e.g. other teams' stores. They are searched concurrently with `path` and only read; completed logs are only indexed in `path`. Default is `None`.",
+    )
+
     write: bool = Field(
         default=True,
         description="Whether to index completed logs in the store. Default is `True`.",
     )
 
+    mirror: bool = Field(
+        default=False,
+        description="Whether to read a remote store through a local mirror that syncs only new changes. Writes still go to the remote store. Can also be enabled with the `INSPECT_FLOW_STORE_MIRROR` environment variable. Default is `False`.",
+    )
+
+    spool: bool = Field(
+        default=False,
+        description="Whether to spool completed logs locally and add them to the store in batches from a background thread, so that concurrent runs make fewer commits. Spooled logs are added within a few seconds and when the run finishes, and logs spooled by a run that exits early are added by the next run. Can also be enabled with the `INSPECT_FLOW_STORE_SPOOL` environment variable. Default is `False`.",
+    )
+
+    as_of: int | str | None = Field(
+        default=None,
+        description="Read the store as of a version (an integer) or a timestamp (ISO 8601, e.g. `'2026-01-15T12:00:00Z'`), rather than its latest version. Every read in a run then sees the same snapshot, so logs written to the store by other runs meanwhile don't change which logs are reused. Completed logs are still written to the latest version. Default is `None` (read the latest version).",
+    )
+
+    samples: bool = Field(
+        default=False,
+        description="Whether to keep a sample index in the store: a table with a row per sample of each log (scores, errors, token usage and timings), read with `FlowStore.scan_samples()`. Once a store has a sample index it is kept up to date by every write. Can also be enabled with the `INSPECT_FLOW_STORE_SAMPLES` environment variable. Default is `False`.",
+    )
+
 
 class FlowSpec(FlowBase, arbitrary_types_allowed=True):
     """Top-level flow specification: the tasks to run plus how to run them.
@@ -1100,7 +1140,7 @@ class FlowSpec(FlowBase, arbitrary_types_allowed=True):
 
     instantiate: InstantiateMode | InstantiateConfig | None | NotGiven = Field(
         default=not_given,
-        description="How to instantiate tasks before running. `'serial'` (default) instantiates one task at a time. `'by_task'` parallelizes across distinct task names but serializes instances that share a name. `'parallel'` instantiates everything concurrently. Pass an `InstantiateConfig` to also set `max_threads`.",
+        description="How to instantiate tasks before running. `'serial'` (default) instantiates one task at a time. `'by_task'` parallelizes across distinct task names but serializes instances that share a name. `'parallel'` instantiates everything concurrently. `'process'` instantiates in worker processes for CPU-bound factories. Pass an `InstantiateConfig` to also set `max_threads` or `max_processes`.",
     )
 
     internal: FlowInternal | None | NotGiven = Field(
@@ -0,0 +1,247 @@
+"""Datasets that report their size without loading their samples."""
+
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from logging import getLogger
+from typing import (
+    TYPE_CHECKING,
+    Protocol,
+    TypeAlias,
+    Union,
+    overload,
+    runtime_checkable,
+)
+
+from inspect_ai._util.error import pip_dependency_error
+from inspect_ai._util.file import file
+from inspect_ai.dataset import Dataset, MemoryDataset, Sample
+from inspect_ai.dataset._dataset import sample_input_len
+from typing_extensions import override
+
+if TYPE_CHECKING:
+    from _typeshed import SupportsRichComparison
+
+logger = getLogger(__name__)
+
+DatasetLoader: TypeAlias = Callable[[], Dataset | Sequence[Sample]]
+
+SampleCountFn: TypeAlias = Callable[[], int | None]
+
+
+@runtime_checkable
+class SampleCount(Protocol):
+    """A dataset that can report how many samples it has without loading them.
+
+    Flow uses the count (rather than `len()`) to show `X/Y samples` and to
+    decide whether existing logs are complete, so dry runs and checks don't
+    load the samples of datasets that implement it.
+    """
+
+    def sample_count(self) -> int | None:
+        """Number of samples, or `None` if it isn't known without loading them."""
+        ...
+
+
+def dataset_samples(dataset: Dataset) -> int:
+    """Number of samples in a dataset, without loading it if it reports a count."""
+    if isinstance(dataset, SampleCount):
+        count = dataset.sample_count()
+        if count is not None:
+            return count
+    return len(dataset)
+
+
+def lazy_dataset(
+    load: DatasetLoader,
+    count: int | SampleCountFn | None = None,
+    *,
+    name: str | None = None,
+    location: str | None = None,
+) -> Dataset:
+    """Dataset that loads its samples the first time they are accessed.
+
+    Return it from a task factory so that flows can count its samples without
+    loading them, e.g. `lazy_dataset(lambda: json_dataset(path), count=lambda:
+    file_sample_count(path))`. Until the samples are loaded, `len()` returns
+    `count`, and a warning is logged if the loaded dataset has a different
+    number of samples. Slicing doesn't load the samples.
+
+    Args:
+        load: Function that loads the dataset (or a sequence of samples).
+        count: Number of samples in the loaded dataset, or a function that
+            returns it (called at most once). If `None` (or the function returns
+            `None`), counting the samples loads them.
+        name: Dataset name. Defaults to the name of the loaded dataset.
+        location: Dataset location. Defaults to the location of the loaded
+            dataset.
+
+    Returns:
+        The lazy dataset.
+    """
+    return LazyDataset(load, count, name=name, location=location)
+
+
+class LazyDataset(Dataset):
+    def __init__(
+        self,
+        load: DatasetLoader,
+        count: int | SampleCountFn | None = None,
+        name: str | None = None,
+        location: str | None = None,
+    ) -> None:
+        self._load = load
+        self._count = count
+        self._name = name
+        self._location = location
+        self._dataset: Dataset | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._dataset is not None
+
+    def _loaded(self) -> Dataset:
+        with self._lock:
+            if self._dataset is None:
+                dataset = self._load()
+                self._dataset = (
+                    dataset
+                    if isinstance(dataset, Dataset)
+                    else MemoryDataset(list(dataset))
+                )
+                self._check_count(self._dataset)
+            return self._dataset
+
+    def _check_count(self, dataset: Dataset) -> None:
+        # A count that was never used isn't computed just to check it
+        if isinstance(self._count, int) and self._count != len(dataset):
+            name = self._name if self._name is not None else dataset.name
+            logger.warning(
+                f"Dataset {name or '(unnamed)'} has {len(dataset)} samples but "
+                f"its count is {self._count}, so sample totals and completeness "
+                "checks made before it was loaded may be wrong"
+            )
+
+    def sample_count(self) -> int | None:
+        if self._dataset is not None:
+            return len(self._dataset)
+        with self._lock:
+            if callable(self._count):
+                self._count = self._count()
+            return self._count
+
+    @property
+    @override
+    def name(self) -> str | None:
+        return self._name if self._name is not None else self._loaded().name
+
+    @property
+    @override
+    def location(self) -> str | None:
+        return self._location if self._location is not None else self._loaded().location
+
+    @property
+    @override
+    def shuffled(self) -> bool:
+        return self._loaded().shuffled
+
+    @overload
+    def __getitem__(self, index: int) -> Sample: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Dataset: ...
+
+    @override
+    def __getitem__(self, index: Union[int, slice]) -> Union[Sample, Dataset]:
+        if isinstance(index, int) or self._dataset is not None:
+            return self._loaded()[index]
+        return LazyDataset(
+            lambda: self._loaded()[index],
+            lambda: self._slice_count(index),
+            name=self._name,
+            location=self._location,
+        )
+
+    def _slice_count(self, index: slice) -> int | None:
+        count = self.sample_count()
+        return len(range(count)[index]) if count is not None else None
+
+    @override
+    def __len__(self) -> int:
+        count = self.sample_count()
+        return count if count is not None else len(self._loaded())
+
+    @override
+    def __iter__(self) -> Iterator[Sample]:
+        return iter(self._loaded())
+
+    @override
+    def sort(
+        self,
+        reverse: bool = False,
+        key: Callable[[Sample], "SupportsRichComparison"] = sample_input_len,
+    ) -> None:
+        self._loaded().sort(reverse=reverse, key=key)
+
+    @override
+    def filter(
+        self, predicate: Callable[[Sample], bool], name: str | None = None
+    ) -> Dataset:
+        return self._loaded().filter(predicate, name=name)
+
+    @override
+    def shuffle(self, seed: int | None = None) -> None:
+        self._loaded().shuffle(seed)
+
+    @override
+    def shuffle_choices(self, seed: int | None = None) -> None:
+        self._loaded().shuffle_choices(seed)
+
+
+def file_sample_count(path: str, header: bool = False) -> int:
+    """Number of samples in a JSON lines or CSV file, counted from its lines.
+
+    Reads the file without parsing it, so it's much cheaper than loading the
+    dataset. Blank lines aren't counted. CSV files with quoted values that span
+    lines are over-counted.
+
+    Args:
+        path: Path or URL of the file.
+        header: Whether the first line is a header (as in CSV files).
+
+    Returns:
+        The number of samples.
+    """
+    with file(path, "rb") as f:
+        count = sum(1 for line in f if line.strip())
+    return max(count - 1, 0) if header else count
+
+
+def hf_sample_count(
+    path: str, split: str, name: str | None = None, revision: str | None = None
+) -> int | None:
+    """Number of samples in a Hugging Face dataset split, from its metadata.
+
+    Only downloads the dataset's metadata. Datasets without split metadata
+    return `None`. Counts rows, so it doesn't match datasets whose
+    `sample_fields` returns several samples (or none) per row.
+
+    Args:
+        path: Path or name of the dataset.
+        split: Split of the dataset.
+        name: Name of the dataset configuration.
+        revision: Revision of the dataset.
+
+    Returns:
+        The number of samples, or `None` if the metadata doesn't include it.
+    """
+    try:
+        import datasets  # type: ignore
+    except ImportError as ex:
+        raise pip_dependency_error("Hugging Face sample counts", ["datasets"]) from ex
+
+    builder = datasets.load_dataset_builder(path, name=name, revision=revision)
+    splits = builder.info.splits
+    if not splits or split not in splits:
+        return None
+    return splits[split].num_examples
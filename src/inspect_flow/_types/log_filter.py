@@ -13,6 +13,7 @@ from inspect_ai._util.registry import (
 from inspect_ai.log import EvalLog
 
 from inspect_flow._types.flow_types import LogFilter
+from inspect_flow._types.log_filter_expr import FilterExpr, all_of
 from inspect_flow._util.path_util import absolute_path_relative_to, find_auto_includes
 
 LOG_FILTER_TYPE = "log_filter"
@@ -121,4 +122,8 @@ def resolve_log_filter(
     if len(named) == 1:
         return named[0].fn
     fns = [nf.fn for nf in named]
+    # Keep expressions declarative so stores can evaluate them on columns
+    exprs = [f for f in fns if isinstance(f, FilterExpr)]
+    if len(exprs) == len(fns):
+        return all_of(*exprs)
     return lambda log: all(f(log) for f in fns)
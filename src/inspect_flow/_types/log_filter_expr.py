@@ -0,0 +1,392 @@
+"""Declarative log filter expressions.
+
+A `FilterExpr` is a `LogFilter` (it can be called with a log header), but it
+can also be compiled to a `pyarrow.compute` expression over the columns the
+store keeps for each log, so stores can answer it without reading log files.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Literal
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from inspect_ai.log import EvalLog
+
+from inspect_flow._util.logs import total_samples
+
+CompareOp = Literal["==", "!=", "<", "<=", ">", ">="]
+
+
+def _ts(value: str) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+# Header accessors for each filterable field. The names and types match the
+# header columns of the store's logs table.
+_FIELDS: dict[str, Callable[[EvalLog], Any]] = {
+    "status": lambda log: log.status,
+    "task": lambda log: log.eval.task,
+    "model": lambda log: log.eval.model,
+    "tags": lambda log: list(log.tags),
+    "completed_samples": lambda log: (
+        log.results.completed_samples if log.results else None
+    ),
+    "total_samples": total_samples,
+    "started_at": lambda log: _ts(log.stats.started_at),
+    "completed_at": lambda log: _ts(log.stats.completed_at),
+    "invalidated": lambda log: log.invalidated,
+}
+
+_LIST_FIELDS = {"tags"}
+_TIMESTAMP_FIELDS = {"started_at", "completed_at"}
+# Joins list values into a single string so list fields can be matched with a
+# regex that anchors on element boundaries.
+_LIST_SEP = "\x1f"
+
+
+def _check_field(name: str) -> None:
+    if name not in _FIELDS:
+        raise ValueError(
+            f"Unknown log filter field '{name}'. Valid fields: {', '.join(_FIELDS)}."
+        )
+
+
+def _scalar(name: str, value: Any) -> pa.Scalar:
+    if name in _TIMESTAMP_FIELDS:
+        return pa.scalar(_utc(value), type=pa.timestamp("us", tz="UTC"))
+    return pa.scalar(value)
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _glob_regex(pattern: str, any_char: str) -> str:
+    """Translate a glob pattern to a regex understood by both `re` and RE2."""
+    out: list[str] = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        i += 1
+        if c == "*":
+            out.append(f"{any_char}*")
+        elif c == "?":
+            out.append(any_char)
+        elif c == "[":
+            j = pattern.find("]", i + 1 if pattern[i : i + 1] in ("!", "]") else i)
+            if j == -1:
+                out.append(re.escape(c))
+                continue
+            body = pattern[i:j].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            elif body.startswith("^"):
+                body = "\\" + body
+            out.append(f"[{body}]")
+            i = j + 1
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+def _coalesce(expr: pc.Expression) -> pc.Expression:
+    # Null columns never match, mirroring the Python side where a missing
+    # value compares False. This keeps `not_` consistent between the two.
+    return pc.coalesce(expr, pa.scalar(False))
+
+
+class FilterExpr(ABC):
+    """A log filter that can be evaluated against a log header or store columns.
+
+    Build expressions with `log_field()` and combine them with `&`, `|` and `~`.
+    """
+
+    def __call__(self, log: EvalLog) -> bool:
+        return self.matches(log)
+
+    @abstractmethod
+    def matches(self, log: EvalLog) -> bool:
+        """Evaluate the expression against a log header."""
+        ...
+
+    @abstractmethod
+    def to_arrow(self) -> pc.Expression:
+        """Compile the expression to a `pyarrow.compute` expression over store columns."""
+        ...
+
+    @abstractmethod
+    def columns(self) -> set[str]:
+        """The store columns the expression reads."""
+        ...
+
+    def __and__(self, other: "FilterExpr") -> "FilterExpr":
+        return all_of(self, other)
+
+    def __or__(self, other: "FilterExpr") -> "FilterExpr":
+        return any_of(self, other)
+
+    def __invert__(self) -> "FilterExpr":
+        return not_(self)
+
+
+@dataclass(frozen=True)
+class _Compare(FilterExpr):
+    field: str
+    op: CompareOp
+    value: Any
+
+    def matches(self, log: EvalLog) -> bool:
+        actual = _FIELDS[self.field](log)
+        if actual is None:
+            return False
+        value = _utc(self.value) if self.field in _TIMESTAMP_FIELDS else self.value
+        match self.op:
+            case "==":
+                return bool(actual == value)
+            case "!=":
+                return bool(actual != value)
+            case "<":
+                return bool(actual < value)
+            case "<=":
+                return bool(actual <= value)
+            case ">":
+                return bool(actual > value)
+            case ">=":
+                return bool(actual >= value)
+
+    def to_arrow(self) -> pc.Expression:
+        f = pc.field(self.field)
+        value = _scalar(self.field, self.value)
+        match self.op:
+            case "==":
+                expr = f == value
+            case "!=":
+                expr = f != value
+            case "<":
+                expr = f < value
+            case "<=":
+                expr = f <= value
+            case ">":
+                expr = f > value
+            case ">=":
+                expr = f >= value
+        return _coalesce(expr)
+
+    def columns(self) -> set[str]:
+        return {self.field}
+
+
+@dataclass(frozen=True)
+class _In(FilterExpr):
+    field: str
+    values: frozenset[Any]
+
+    def matches(self, log: EvalLog) -> bool:
+        actual = _FIELDS[self.field](log)
+        if self.field in _LIST_FIELDS:
+            return any(v in self.values for v in actual)
+        return actual in self.values
+
+    def to_arrow(self) -> pc.Expression:
+        if self.field in _LIST_FIELDS:
+            alternatives = "|".join(re.escape(v) for v in sorted(self.values))
+            return _list_regex(self.field, f"(?:{alternatives})")
+        return _coalesce(pc.field(self.field).isin(list(self.values)))
+
+    def columns(self) -> set[str]:
+        return {self.field}
+
+
+@dataclass(frozen=True)
+class _Glob(FilterExpr):
+    field: str
+    patterns: tuple[str, ...]
+
+    def matches(self, log: EvalLog) -> bool:
+        actual = _FIELDS[self.field](log)
+        if actual is None:
+            return False
+        values = actual if self.field in _LIST_FIELDS else [actual]
+        regexes = [re.compile(_glob_regex(p, "."), re.DOTALL) for p in self.patterns]
+        return any(r.fullmatch(v) for v in values for r in regexes)
+
+    def to_arrow(self) -> pc.Expression:
+        if self.field in _LIST_FIELDS:
+            any_char = f"[^{_LIST_SEP}]"
+            alternatives = "|".join(_glob_regex(p, any_char) for p in self.patterns)
+            return _list_regex(self.field, f"(?:{alternatives})")
+        alternatives = "|".join(_glob_regex(p, ".") for p in self.patterns)
+        return _coalesce(
+            pc.match_substring_regex(pc.field(self.field), f"^(?s:{alternatives})$")
+        )
+
+    def columns(self) -> set[str]:
+        return {self.field}
+
+
+def _list_regex(field: str, element_regex: str) -> pc.Expression:
+    """Match list rows where any element fully matches `element_regex`."""
+    joined = pc.binary_join(pc.field(field), _LIST_SEP)
+    matched = pc.match_substring_regex(
+        joined, f"(?s)(?:^|{_LIST_SEP}){element_regex}(?:{_LIST_SEP}|$)"
+    )
+    # An empty list joins to "", which would match patterns like "*"
+    return _coalesce((pc.list_value_length(pc.field(field)) > 0) & matched)
+
+
+@dataclass(frozen=True)
+class _AllOf(FilterExpr):
+    exprs: tuple[FilterExpr, ...]
+
+    def matches(self, log: EvalLog) -> bool:
+        return all(e.matches(log) for e in self.exprs)
+
+    def to_arrow(self) -> pc.Expression:
+        result = pc.scalar(True)
+        for e in self.exprs:
+            result = result & e.to_arrow()
+        return result
+
+    def columns(self) -> set[str]:
+        return set().union(*(e.columns() for e in self.exprs))
+
+
+@dataclass(frozen=True)
+class _AnyOf(FilterExpr):
+    exprs: tuple[FilterExpr, ...]
+
+    def matches(self, log: EvalLog) -> bool:
+        return any(e.matches(log) for e in self.exprs)
+
+    def to_arrow(self) -> pc.Expression:
+        result = pc.scalar(False)
+        for e in self.exprs:
+            result = result | e.to_arrow()
+        return result
+
+    def columns(self) -> set[str]:
+        return set().union(*(e.columns() for e in self.exprs))
+
+
+@dataclass(frozen=True)
+class _Not(FilterExpr):
+    expr: FilterExpr
+
+    def matches(self, log: EvalLog) -> bool:
+        return not self.expr.matches(log)
+
+    def to_arrow(self) -> pc.Expression:
+        return ~self.expr.to_arrow()
+
+    def columns(self) -> set[str]:
+        return self.expr.columns()
+
+
+def all_of(*exprs: FilterExpr) -> FilterExpr:
+    """Match logs that match all of the expressions."""
+    flat: list[FilterExpr] = []
+    for e in exprs:
+        flat.extend(e.exprs if isinstance(e, _AllOf) else [e])
+    return flat[0] if len(flat) == 1 else _AllOf(tuple(flat))
+
+
+def any_of(*exprs: FilterExpr) -> FilterExpr:
+    """Match logs that match any of the expressions."""
+    flat: list[FilterExpr] = []
+    for e in exprs:
+        flat.extend(e.exprs if isinstance(e, _AnyOf) else [e])
+    return flat[0] if len(flat) == 1 else _AnyOf(tuple(flat))
+
+
+def not_(expr: FilterExpr) -> FilterExpr:
+    """Match logs that do not match the expression."""
+    return expr.expr if isinstance(expr, _Not) else _Not(expr)
+
+
+@dataclass(frozen=True)
+class LogField:
+    """A log header field to build filter expressions on.
+
+    Create with `log_field()`.
+    """
+
+    name: str
+
+    def eq(self, value: Any) -> FilterExpr:
+        """Match logs where the field equals `value`."""
+        return self._compare("==", value)
+
+    def ne(self, value: Any) -> FilterExpr:
+        """Match logs where the field does not equal `value`."""
+        return self._compare("!=", value)
+
+    def lt(self, value: Any) -> FilterExpr:
+        """Match logs where the field is less than `value`."""
+        return self._compare("<", value)
+
+    def le(self, value: Any) -> FilterExpr:
+        """Match logs where the field is less than or equal to `value`."""
+        return self._compare("<=", value)
+
+    def gt(self, value: Any) -> FilterExpr:
+        """Match logs where the field is greater than `value`."""
+        return self._compare(">", value)
+
+    def ge(self, value: Any) -> FilterExpr:
+        """Match logs where the field is greater than or equal to `value`."""
+        return self._compare(">=", value)
+
+    def isin(self, values: Iterable[Any]) -> FilterExpr:
+        """Match logs where the field (or, for `tags`, any tag) is one of `values`."""
+        return _In(self.name, frozenset(values))
+
+    def glob(self, *patterns: str) -> FilterExpr:
+        """Match logs where the field (or, for `tags`, any tag) matches a glob pattern."""
+        if not patterns:
+            raise ValueError("glob() requires at least one pattern.")
+        return _Glob(self.name, patterns)
+
+    def between(
+        self, since: datetime | None = None, until: datetime | None = None
+    ) -> FilterExpr:
+        """Match logs where the field is within `[since, until]`.
+
+        Naive datetimes are treated as UTC.
+        """
+        exprs: list[FilterExpr] = []
+        if since is not None:
+            exprs.append(self.ge(since))
+        if until is not None:
+            exprs.append(self.le(until))
+        if not exprs:
+            raise ValueError("between() requires `since`, `until`, or both.")
+        return all_of(*exprs)
+
+    def _compare(self, op: CompareOp, value: Any) -> FilterExpr:
+        if self.name in _LIST_FIELDS:
+            raise ValueError(
+                f"Field '{self.name}' is a list; use isin() or glob() instead."
+            )
+        return _Compare(self.name, op, value)
+
+
+def log_field(name: str) -> LogField:
+    """Reference a log header field in a filter expression.
+
+    Valid fields are `status`, `task`, `model`, `tags`, `completed_samples`,
+    `total_samples`, `started_at`, `completed_at` and `invalidated`.
+
+    Example:
+        ```python
+        log_field("status").eq("success") & log_field("model").glob("openai/*")
+        ```
+
+    Args:
+        name: The field name.
+    """
+    _check_field(name)
+    return LogField(name)
@@ -10,3 +10,7 @@ DEFAULT_LOG_LEVEL = "warning"
 # conventional usage-error code), so scripts can tell an incomplete run apart
 # from a malformed invocation.
 EXIT_INCOMPLETE = 3
+
+# Default cap on concurrent log file operations (header reads, existence
+# checks) so large stores don't open thousands of connections at once.
+DEFAULT_MAX_CONCURRENCY = 64
@@ -1,4 +1,5 @@
 import json
+import os
 from pathlib import Path
 from typing import Any
 
@@ -10,6 +11,8 @@ _DATA_FILE = "flow_data.json"
 
 LAST_LOG_DIR_KEY = "last_log_dir"
 
+BUCKET_REGIONS_KEY = "bucket_regions"
+
 
 def user_data_dir() -> Path:
     return Path(platformdirs.user_data_dir(PKG_NAME))
@@ -44,8 +47,18 @@ def write_data(key: str, value: Any) -> None:
     """
     path = _data_path()
     path.parent.mkdir(parents=True, exist_ok=True)
+    # Not locked: a concurrent write of another key between this read and the
+    # rename below is lost. The file only holds caches and conveniences, which
+    # are recomputed when missing.
     data: dict[str, Any] = {}
     if path.exists():
-        data = json.loads(path.read_text())
+        try:
+            data = json.loads(path.read_text())
+        except ValueError:
+            # Replace a corrupt file rather than failing every write
+            data = {}
     data[key] = value
-    path.write_text(json.dumps(data, indent=2) + "\n")
+    # Write then rename so a concurrent reader never sees a partial file
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n")
+    os.replace(tmp, path)
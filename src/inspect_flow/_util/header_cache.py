@@ -0,0 +1,303 @@
+"""Persistent local cache of log headers.
+
+Headers (and their valid-sample counts) are cached in a SQLite database under
+`user_data_dir()`, keyed by log path and validated against the file's size,
+mtime and etag so that a rewritten log is always re-read. Like the store, the
+cache is purely an accelerator: any failure to use it falls back to reading
+the log.
+"""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import partial
+from logging import getLogger
+from pathlib import Path
+
+import anyio
+from inspect_ai._eval.evalset import Log, task_identifier
+from inspect_ai._util._async import run_coroutine, tg_collect
+from inspect_ai._util.file import FileInfo, filesystem
+from inspect_ai.log import EvalLog, list_eval_logs, read_eval_log_async
+from inspect_ai.log._file import EvalLogInfo, ReadEvalLogsProgress
+
+from inspect_flow._util.data import user_data_dir
+from inspect_flow._util.logs import num_valid_samples_async
+
+logger = getLogger(__name__)
+
+_CACHE_FILE = "header_cache.sqlite"
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+"""Default cap on the total size of cached headers, in bytes."""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS headers (
+    log_path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime REAL,
+    etag TEXT,
+    header TEXT NOT NULL,
+    valid_samples INTEGER,
+    accessed REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class CachedHeader:
+    header: EvalLog
+    valid_samples: int | None = None
+
+
+@dataclass
+class HeaderCacheStats:
+    path: Path
+    entries: int
+    size: int
+    max_size: int
+
+
+class HeaderCache:
+    """SQLite-backed cache of log headers with a least-recently-used size cap."""
+
+    def __init__(self, path: Path, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self._path = path
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get(
+        self, log_path: str, size: int | None, mtime: float | None, etag: str | None
+    ) -> CachedHeader | None:
+        """Get the cached header for a log if the file has not changed."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT size, mtime, etag, header, valid_samples FROM headers WHERE log_path = ?",
+                (log_path,),
+            ).fetchone()
+            # Directory listings don't carry etags, so only compare them when
+            # both sides have one
+            if (
+                row is None
+                or (row[0], row[1]) != (size, mtime)
+                or (etag and row[2] and etag != row[2])
+            ):
+                return None
+            conn.execute(
+                "UPDATE headers SET accessed = ? WHERE log_path = ?",
+                (time.time(), log_path),
+            )
+            conn.commit()
+        header = EvalLog.model_validate_json(row[3])
+        header.location = log_path
+        header.etag = etag
+        return CachedHeader(header=header, valid_samples=row[4])
+
+    def put(
+        self,
+        log_path: str,
+        size: int | None,
+        mtime: float | None,
+        etag: str | None,
+        entry: CachedHeader,
+    ) -> None:
+        """Cache the header for a log, replacing any previous entry."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO headers VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    log_path,
+                    size,
+                    mtime,
+                    etag,
+                    entry.header.model_dump_json(),
+                    entry.valid_samples,
+                    time.time(),
+                ),
+            )
+            conn.commit()
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache is within its size cap.
+
+        Returns:
+            The number of entries removed.
+        """
+        with self._lock:
+            conn = self._connect()
+            total = conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(header)), 0) FROM headers"
+            ).fetchone()[0]
+            if total <= self._max_size:
+                return 0
+            removed = 0
+            rows = conn.execute(
+                "SELECT log_path, LENGTH(header) FROM headers ORDER BY accessed"
+            ).fetchall()
+            for log_path, length in rows:
+                if total <= self._max_size:
+                    break
+                conn.execute("DELETE FROM headers WHERE log_path = ?", (log_path,))
+                total -= length
+                removed += 1
+            conn.commit()
+            return removed
+
+    def clear(self) -> int:
+        """Remove all entries.
+
+        Returns:
+            The number of entries removed.
+        """
+        with self._lock:
+            conn = self._connect()
+            removed = conn.execute("DELETE FROM headers").rowcount
+            conn.commit()
+            conn.execute("VACUUM")
+            return removed
+
+    def stats(self) -> HeaderCacheStats:
+        with self._lock:
+            entries, size = (
+                self._connect()
+                .execute(
+                    "SELECT COUNT(*), COALESCE(SUM(LENGTH(header)), 0) FROM headers"
+                )
+                .fetchone()
+            )
+        return HeaderCacheStats(
+            path=self._path, entries=entries, size=size, max_size=self._max_size
+        )
+
+
+_caches: dict[Path, HeaderCache] = {}
+
+
+def header_cache() -> HeaderCache:
+    """The header cache for the current user."""
+    path = user_data_dir() / _CACHE_FILE
+    if path not in _caches:
+        _caches[path] = HeaderCache(path)
+    return _caches[path]
+
+
+async def _file_version(
+    log_path: str, info: FileInfo | EvalLogInfo | None
+) -> tuple[int | None, float | None, str | None]:
+    """The size, mtime and etag used to validate a cache entry."""
+    fs = filesystem(log_path)
+    if fs.is_local():
+        # inspect's file info truncates mtimes to whole seconds, which would miss
+        # a local log rewritten within the same second. Stat is cheap locally.
+        raw = fs.fs.info(log_path)
+        return raw["size"], raw["mtime"], None
+    if info is None:
+        info = await anyio.to_thread.run_sync(fs.info, log_path)
+    etag = info.etag if isinstance(info, FileInfo) else None
+    return info.size, info.mtime, etag
+
+
+async def read_header_async(
+    log_path: str,
+    info: FileInfo | EvalLogInfo | None = None,
+    valid_samples: bool = False,
+) -> CachedHeader:
+    """Read a log header, using the header cache when the file is unchanged.
+
+    Args:
+        log_path: The log to read.
+        info: File info for a remote log, if already known (e.g. from a
+            directory listing). Otherwise it is fetched with `fs.info()`.
+        valid_samples: Whether to also compute the number of valid samples.
+    """
+    size, mtime, etag = await _file_version(log_path, info)
+    cache = header_cache()
+    cached: CachedHeader | None = None
+    try:
+        cached = cache.get(log_path, size, mtime, etag)
+    except Exception as e:
+        logger.debug(f"Header cache read failed for {log_path}: {e}")
+    if cached is not None and (not valid_samples or cached.valid_samples is not None):
+        return cached
+
+    if cached is None:
+        header = await read_eval_log_async(log_path, header_only=True)
+        cached = CachedHeader(header=header)
+    if valid_samples:
+        cached.valid_samples = await num_valid_samples_async(cached.header)
+    try:
+        cache.put(log_path, size, mtime, etag, cached)
+    except Exception as e:
+        logger.debug(f"Header cache write failed for {log_path}: {e}")
+    return cached
+
+
+def evict_header_cache() -> None:
+    """Trim the header cache to its size cap, ignoring failures."""
+    try:
+        header_cache().evict()
+    except Exception as e:
+        logger.debug(f"Header cache eviction failed: {e}")
+
+
+def list_logs_with_headers(
+    log_dir: str,
+    recursive: bool = True,
+    progress: ReadEvalLogsProgress | None = None,
+) -> list[Log]:
+    """Cached equivalent of inspect's `list_all_eval_logs`."""
+    log_files = list_eval_logs(log_dir, recursive=recursive)
+    if progress:
+        progress.before_reading_logs(len(log_files))
+    headers = read_headers(
+        [info.name for info in log_files],
+        infos=log_files,
+        on_read=progress.after_read_log if progress else None,
+    )
+    return [
+        Log(info=info, header=header, task_identifier=task_identifier(header, None))
+        for info, header in zip(log_files, headers, strict=True)
+    ]
+
+
+def read_headers(
+    log_paths: Sequence[str],
+    infos: Sequence[FileInfo | EvalLogInfo] | None = None,
+    on_read: Callable[[str], None] | None = None,
+) -> list[EvalLog]:
+    """Batch-read log headers through the header cache.
+
+    Raises the first read error, like inspect's `read_eval_log_headers`.
+    """
+
+    async def _read(log_path: str, info: FileInfo | EvalLogInfo | None) -> EvalLog:
+        header = (await read_header_async(log_path, info)).header
+        if on_read:
+            on_read(log_path)
+        return header
+
+    info_list = infos or [None] * len(log_paths)
+    headers = run_coroutine(
+        tg_collect(
+            [
+                partial(_read, log_path, info)
+                for log_path, info in zip(log_paths, info_list, strict=True)
+            ]
+        )
+    )
+    evict_header_cache()
+    return headers
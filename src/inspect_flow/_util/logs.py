@@ -5,6 +5,8 @@ from collections.abc import Collection, Iterable
 from datetime import datetime, timezone
 from logging import getLogger
 
+import pyarrow as pa
+import pyarrow.compute as pc
 from fsspec.core import split_protocol
 from inspect_ai._util.file import absolute_file_path, copy_file, filesystem
 from inspect_ai.log import (
@@ -52,7 +54,8 @@ def sort_logs(log_paths: Collection[str]) -> list[str]:
     Within each directory, logs are sorted by filename timestamp descending.
     Logs without a timestamp prefix sort at the end.
     """
-    return [p for group in group_logs_by_dir(log_paths) for p in group]
+    table = pa.table({"log_path": pa.array(list(log_paths), type=pa.string())})
+    return sort_log_table(table)["log_path"].to_pylist()
 
 
 def group_logs_by_dir(log_paths: Collection[str]) -> list[list[str]]:
@@ -61,38 +64,74 @@ def group_logs_by_dir(log_paths: Collection[str]) -> list[list[str]]:
     Within each directory, logs are sorted by filename timestamp descending.
     Logs without a timestamp prefix sort at the end.
     """
-    groups: dict[str, list[str]] = {}
-    for log_path in log_paths:
-        dir_path = log_path.rsplit("/", 1)[0] if "/" in log_path else ""
-        groups.setdefault(dir_path, []).append(log_path)
-
-    sorted_groups = [_sort_within_dir(paths) for paths in groups.values()]
-
-    ts_groups: list[list[str]] = []
-    non_ts_groups: list[list[str]] = []
-    for group in sorted_groups:
-        if _TIMESTAMP_RE.match(group[0].rsplit("/", 1)[-1]):
-            ts_groups.append(group)
-        else:
-            non_ts_groups.append(group)
+    table = pa.table({"log_path": pa.array(list(log_paths), type=pa.string())})
+    table = sort_log_table(table)
+    groups: list[list[str]] = []
+    last_dir: str | None = None
+    for log_path, dir_path in zip(
+        table["log_path"].to_pylist(),
+        _log_dirs(table["log_path"]).to_pylist(),
+        strict=True,
+    ):
+        if not groups or dir_path != last_dir:
+            groups.append([])
+            last_dir = dir_path
+        groups[-1].append(log_path)
+    return groups
+
+
+def _log_dirs(log_paths: pa.ChunkedArray) -> pa.ChunkedArray:
+    return pc.if_else(
+        pc.match_substring(log_paths, "/"),
+        pc.replace_substring_regex(log_paths, "/[^/]*$", ""),
+        "",
+    )
 
-    ts_groups.sort(key=lambda g: g[0].rsplit("/", 1)[-1], reverse=True)
-    non_ts_groups.sort(key=lambda g: g[0].rsplit("/", 1)[-1])
-    return ts_groups + non_ts_groups
 
+def sort_log_table(table: pa.Table, column: str = "log_path") -> pa.Table:
+    """Sort a table of logs the way `sort_logs` sorts log paths, with Arrow kernels.
 
-def _sort_within_dir(logs: Collection[str]) -> list[str]:
-    with_ts: list[str] = []
-    without_ts: list[str] = []
-    for log in logs:
-        basename = log.rsplit("/", 1)[-1]
-        if _TIMESTAMP_RE.match(basename):
-            with_ts.append(log)
-        else:
-            without_ts.append(log)
-    with_ts.sort(key=lambda p: p.rsplit("/", 1)[-1], reverse=True)
-    without_ts.sort(key=lambda p: p.rsplit("/", 1)[-1])
-    return with_ts + without_ts
+    Args:
+        table: Table with a log path column. Rows with a null path are dropped.
+        column: The log path column.
+    """
+    table = table.filter(pc.field(column).is_valid())
+    paths = table[column].cast(pa.string())
+    names = pc.replace_substring_regex(paths, "^.*/", "")
+    has_ts = pc.match_substring_regex(names, "^" + _TIMESTAMP_RE.pattern)
+    null = pa.scalar(None, pa.string())
+    # Timestamped names sort descending, the rest ascending after them
+    keys = pa.table(
+        {
+            "row": pa.array(range(len(table)), type=pa.int64()),
+            "dir": _log_dirs(paths),
+            "ts_name": pc.if_else(has_ts, names, null),
+            "name": pc.if_else(has_ts, null, names),
+        }
+    )
+    # A directory is ordered by its most recent timestamped name, or if it has
+    # none, after those by its first name
+    aggregated = keys.group_by("dir").aggregate([("ts_name", "max"), ("name", "min")])
+    dir_has_ts = pc.is_valid(aggregated["ts_name_max"])
+    dirs = pa.table(
+        {
+            "dir": aggregated["dir"],
+            "dir_has_ts": dir_has_ts,
+            "dir_ts_name": aggregated["ts_name_max"],
+            "dir_name": pc.if_else(dir_has_ts, null, aggregated["name_min"]),
+        }
+    )
+    order = keys.join(dirs, "dir").sort_by(
+        [
+            ("dir_has_ts", "descending"),
+            ("dir_ts_name", "descending"),
+            ("dir_name", "ascending"),
+            ("dir", "ascending"),
+            ("ts_name", "descending"),
+            ("name", "ascending"),
+        ]
+    )
+    return table.take(order["row"])
 
 
 def copy_all_logs(src_dir: str, dest_dir: str, dry_run: bool, recursive: bool) -> None:
@@ -128,6 +167,14 @@ def copy_all_logs(src_dir: str, dest_dir: str, dry_run: bool, recursive: bool) -
             copy_file(log_file.name, destination)
 
 
+def total_samples(header: EvalLog) -> int | None:
+    """Expected sample count (dataset samples * epochs), or None if unknown."""
+    if header.results:
+        return header.results.total_samples
+    total = (header.eval.dataset.samples or 0) * (header.eval.config.epochs or 1)
+    return total or None
+
+
 def num_valid_samples(header: EvalLog) -> int:
     if header.results and not header.invalidated:
         return header.results.completed_samples
@@ -1,6 +1,13 @@
 import json
+from collections.abc import Awaitable, Callable, Iterable
 from datetime import datetime, timezone
-from typing import Any
+from functools import partial
+from typing import Any, TypeVar
+
+import anyio
+from inspect_ai._util._async import tg_collect
+
+T = TypeVar("T")
 
 
 def now() -> datetime:
@@ -17,3 +24,16 @@ def maybe_json(value: str) -> Any:
         return json.loads(value)
     except (json.JSONDecodeError, ValueError):
         return value
+
+
+async def tg_collect_bounded(
+    funcs: Iterable[Callable[[], Awaitable[T]]], max_concurrency: int
+) -> list[T]:
+    """`tg_collect` with at most `max_concurrency` functions running at once."""
+    limiter = anyio.CapacityLimiter(max_concurrency)
+
+    async def run(func: Callable[[], Awaitable[T]]) -> T:
+        async with limiter:
+            return await func()
+
+    return await tg_collect([partial(run, func) for func in funcs])
@@ -18,7 +18,7 @@ from inspect_flow._steps.run import run_step
 from inspect_flow._steps.scan import scan, scan_step
 from inspect_flow._steps.step import StepResult
 from inspect_flow._steps.tag import metadata, tag
-from inspect_flow._store.store import FlowStore, delete_store
+from inspect_flow._store.store import FlowStore, StoreOptimizeResult, delete_store
 from inspect_flow._util.logs import copy_all_logs
 
 __all__ = [
@@ -28,6 +28,7 @@ __all__ = [
     "FlowStore",
     "RunResult",
     "StepResult",
+    "StoreOptimizeResult",
     "check",
     "config",
     "copy",
@@ -18,6 +18,7 @@ from unittest.mock import MagicMock, patch
 import boto3
 import pytest
 from botocore.client import BaseClient
+from inspect_ai._util import registry
 from inspect_ai._util.logger import LogHandlerVar, _logHandler
 from inspect_flow._util.constants import DEFAULT_LOG_LEVEL
 from inspect_flow._util.logging import init_flow_logging
@@ -288,6 +289,22 @@ def mock_eval_set() -> Generator[MagicMock, None, None]:
         yield mock
 
 
+@pytest.fixture
+def importable_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Leave the objects registered by flow config files in earlier tests out of the registry.
+
+    Worker processes can't import them, so `'process'` instantiation falls
+    back to threads while they are registered.
+    """
+    entries = {
+        key: obj
+        for key, obj in registry._registry.items()
+        if getattr(inspect.unwrap(obj) if callable(obj) else obj, "__module__", None)
+        != "__flow__"
+    }
+    monkeypatch.setattr(registry, "_registry", entries)
+
+
 @pytest.fixture
 def recording_console() -> Generator[Console, None, None]:
     """Fixture that replaces the global Rich console with a recording console.
@@ -1,8 +1,11 @@
 import shutil
 from pathlib import Path
 
+import pyarrow as pa
+import pytest
 from botocore.client import BaseClient
-from inspect_flow.api import FlowStore, store_get
+from inspect_flow import log_field
+from inspect_flow.api import FlowStore, list_logs, store_get
 
 parent = str(Path.cwd() / "tests/test_logs")
 dir1base = str(Path.cwd() / "tests/test_logs/logs1")
@@ -63,6 +66,36 @@ def test_store_remove() -> None:
     assert len(store.get_logs()) == 0
 
 
+def test_store_remove_prefix_recursive() -> None:
+    store: FlowStore = store_get()
+    store.import_log_path(parent, recursive=True)
+    assert len(store.get_logs()) == 4
+    store.remove_log_prefix(dir2, recursive=False)
+    assert len(store.get_logs()) == 3
+    store.remove_log_prefix([dir1, dir2], recursive=True)
+    assert len(store.get_logs()) == 0
+
+
+def test_store_scan() -> None:
+    store: FlowStore = store_get()
+    store.import_log_path(parent, recursive=True)
+
+    reader = store.scan(["log_path", "task_identifier", "status"], batch_size=1)
+    assert reader.schema.names == ["log_path", "task_identifier", "status"]
+    batches = list(reader)
+    assert [b.num_rows for b in batches] == [1, 1, 1, 1]
+    table = pa.Table.from_batches(batches)
+    assert table["log_path"].to_pylist() == list_logs(store=store)
+    assert all(table["task_identifier"].to_pylist())
+
+    table = store.scan(filter=log_field("model").eq("openai/gpt-5")).read_all()
+    assert "valid_samples" in table.column_names
+    assert table["model"].to_pylist() == ["openai/gpt-5", "openai/gpt-5"]
+
+    with pytest.raises(ValueError, match="Unknown store columns"):
+        store.scan(["task_hash"])
+
+
 def test_store_trailing_slash() -> None:
     store: FlowStore = store_get()
     store.import_log_path(dir1 + "/")
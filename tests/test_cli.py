@@ -193,6 +193,18 @@ def test_check_command_disables_log_dir_create_unique() -> None:
         assert not spec.log_dir_create_unique
 
 
+def test_check_command_from_manifest() -> None:
+    runner = CliRunner()
+    with patch("inspect_flow._cli.check.launch_check") as mock_check:
+        mock_check.return_value = CheckLaunchResult(is_complete=True, find_result=None)
+        result = runner.invoke(
+            check_command, [CONFIG_FILE, "--from-manifest"], catch_exceptions=False
+        )
+
+        assert result.exit_code == 0
+        assert mock_check.call_args.kwargs["from_manifest"]
+
+
 def test_config_command_overrides() -> None:
     runner = CliRunner()
     with (
@@ -521,7 +533,7 @@ def test_store_info() -> None:
     assert result.exit_code == 0
     assert "2 logs" in result.output
     assert "1 log dir" in result.output
-    assert "0.2.0" in result.output
+    assert "0.3.1" in result.output
 
 
 def test_store_info_empty() -> None:
@@ -1,23 +1,38 @@
 import json
+import shutil
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Any
 
 import pyarrow as pa
 import pytest
-from deltalake import write_deltalake
+from deltalake import DeltaTable, write_deltalake
 from inspect_ai._util.file import to_uri
+from inspect_flow import FlowSpec, FlowStoreConfig, log_field
+from inspect_flow._config.load import ConfigOptions, expand_spec
 from inspect_flow._store.deltalake import (
+    _TASK_HASH_COL,
     LOGS,
     TABLES,
     DeltaLakeStore,
     LogRecord,
     TableDef,
+    _backfill_complete,
     _check_table_description,
     _create_table_description,
-    _file_to_log_entry,
+    _get_bucket_region,
+    _task_hash,
     _task_id_col,
+    parse_as_of,
 )
+from inspect_flow._store.missing import find_missing_logs
+from inspect_flow._util.data import BUCKET_REGIONS_KEY, user_data_dir
+from inspect_flow._util.header_cache import read_header_async
+from inspect_flow.api import list_logs
 from semver import Version
 
+from tests.test_helpers.log_helpers import read_log_record
+
 parent = str(Path.cwd() / "tests/test_logs")
 dir1base = str(Path.cwd() / "tests/test_logs/logs1")
 dir2base = str(Path.cwd() / "tests/test_logs/logs2")
@@ -90,7 +105,7 @@ def test_missing_task_identifier(tmp_path: Path) -> None:
         storage_options=store._storage_options,
     )
 
-    entry = _file_to_log_entry(log1_path)
+    entry = read_log_record(log1_path)
 
     logs = store.search_for_logs({entry.task_identifier})
     assert logs[entry.task_identifier].log_file == log1_path
@@ -116,7 +131,7 @@ def test_task_identifier_version_bump(
     store = DeltaLakeStore(store_path=store_path, create=True)
     store.import_log_path(dir1base, recursive=True)
 
-    entry = _file_to_log_entry(log1_path)
+    entry = read_log_record(log1_path)
 
     dt = store._open_table(LOGS)
     old_table = dt.to_pyarrow_table()
@@ -159,11 +174,412 @@ def test_task_identifier_version_bump(
     store.import_log_path(dir2base, recursive=True)
     log2_name = "2026-01-09T18-27-59+00-00_mmlu-0-shot_AaMwC64MK8EccYgfhUqy3n.eval"
     log2_path = dir2 + "/" + log2_name
-    entry2 = _file_to_log_entry(log2_path)
+    entry2 = read_log_record(log2_path)
     logs2 = store.search_for_logs({entry2.task_identifier})
     assert logs2[entry2.task_identifier].log_file == log2_path
 
 
+def test_header_columns_populated(tmp_path: Path) -> None:
+    """Importing a log stores its header fields as table columns."""
+    store = DeltaLakeStore(store_path=str(tmp_path), create=True)
+    store.import_log_path(dir1base, recursive=True)
+
+    table = store._open_table(LOGS).to_pyarrow_table()
+    rows = {row["log_path"]: row for row in table.to_pylist()}
+    row = rows[log1_path]
+    entry = read_log_record(log1_path)
+    assert row["status"] == entry.status
+    assert row["task"] == entry.task
+    assert row["model"] == entry.model
+    assert row["completed_samples"] == entry.completed_samples
+    assert row["completed_at"] == entry.completed_at
+    assert entry.valid_samples is not None
+    assert row["valid_samples"] == entry.valid_samples
+    assert row["size"] == Path(dir1base, log1_name).stat().st_size
+
+
+def test_search_uses_header_columns(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """search_for_logs ranks from the table without reading log headers."""
+    store = DeltaLakeStore(store_path=str(tmp_path), create=True)
+    store.import_log_path(dir1base, recursive=True)
+    entry = read_log_record(log1_path)
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("header read")
+
+    monkeypatch.setattr("inspect_flow._store.deltalake.read_header_async", fail)
+    logs = store.search_for_logs({entry.task_identifier})
+    assert logs[entry.task_identifier].log_file == log1_path
+
+
+def test_search_ranks_precomputed_valid_samples(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Best-log selection uses the stored valid sample counts."""
+    store = DeltaLakeStore(store_path=str(tmp_path), create=True)
+    log2_path = (
+        dir1 + "/2026-01-09T18-27-59+00-00_gpqa-diamond_nbjF337MtumE8dao4wZ3vj.eval"
+    )
+    completed_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    records = [
+        # An invalidated log whose valid samples were counted at import
+        LogRecord(
+            log_path=log1_path,
+            task_identifier="task",
+            status="success",
+            invalidated=True,
+            valid_samples=10,
+            completed_at=completed_at,
+        ),
+        LogRecord(
+            log_path=log2_path,
+            task_identifier="task",
+            status="error",
+            valid_samples=5,
+            completed_at=completed_at + timedelta(days=1),
+        ),
+    ]
+    store._add_logs(records, dry_run=False)
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("log read")
+
+    monkeypatch.setattr("inspect_flow._store.deltalake.read_header_async", fail)
+    monkeypatch.setattr("inspect_flow._store.deltalake.num_valid_samples", fail)
+    match = store.search_for_logs({"task"})["task"]
+    assert match.log_file == log1_path
+    assert match.duplicate_logs == [log2_path]
+
+
+def test_search_checks_winners_together(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Winners are checked for existence in one batch, then their runners-up."""
+    store = DeltaLakeStore(store_path=str(tmp_path), create=True)
+    gone = dir1 + "/2026-02-01T00-00-00+00-00_gpqa-diamond_gone.eval"
+    records = [
+        LogRecord(
+            log_path=gone, task_identifier="a", status="success", valid_samples=9
+        ),
+        LogRecord(
+            log_path=log1_path, task_identifier="a", status="success", valid_samples=1
+        ),
+        LogRecord(
+            log_path=dir2
+            + "/2026-01-09T18-27-59+00-00_mmlu-0-shot_AaMwC64MK8EccYgfhUqy3n.eval",
+            task_identifier="b",
+            status="success",
+            valid_samples=1,
+        ),
+    ]
+    store._add_logs(records, dry_run=False)
+    checks: list[set[str]] = []
+    real_find = find_missing_logs
+
+    def find(logs: Any, *args: Any, **kwargs: Any) -> set[str]:
+        checks.append(set(logs))
+        return real_find(logs, *args, **kwargs)
+
+    monkeypatch.setattr("inspect_flow._store.deltalake.find_missing_logs", find)
+    matches = store.search_for_logs({"a", "b"})
+    assert matches["a"].log_file == log1_path
+    assert matches["b"].log_file == records[2].log_path
+    assert checks == [{gone, records[2].log_path}, {log1_path}]
+
+
+def test_task_identifier_backfill_marker(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The backfill commits in chunks and later reads skip the table scan."""
+    monkeypatch.setattr("inspect_flow._store.deltalake._BACKFILL_CHUNK_SIZE", 1)
+    store = DeltaLakeStore(store_path=str(tmp_path), create=True)
+    log2_name = "2026-01-09T18-27-59+00-00_mmlu-0-shot_AaMwC64MK8EccYgfhUqy3n.eval"
+    rows = []
+    for log_path in [log1_path, dir2 + "/" + log2_name]:
+        row = LogRecord(log_path=to_uri(log_path), task_identifier="").to_dict()
+        row.pop(_task_id_col())
+        rows.append(row)
+
+    def append_untagged(rows: list[dict[str, object]]) -> None:
+        write_deltalake(
+            store._table_path(LOGS),
+            pa.Table.from_pylist(rows, schema=LogRecord.to_schema()),
+            mode="append",
+        )
+
+    append_untagged(rows)
+    version = store._open_table(LOGS).version()
+
+    entry = read_log_record(log1_path)
+    logs = store.search_for_logs({entry.task_identifier})
+    assert logs[entry.task_identifier].log_file == log1_path
+
+    dt = store._open_table(LOGS)
+    merges = [c for c in dt.history() if c["operation"] == "MERGE"]
+    assert len(merges) == 2
+    marker = json.loads(dt.metadata().description)["task_identifiers_complete"]
+    assert marker["table_version"] == version
+    assert _backfill_complete(dt)
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("table scan")
+
+    # Tagged commits keep the marker valid
+    store.import_log_path(dir1base, recursive=True)
+    with monkeypatch.context() as m:
+        m.setattr(DeltaLakeStore, "_read_columns", fail)
+        store._set_task_identifiers()
+
+    # A commit from code that doesn't tag its rows invalidates it
+    append_untagged(rows[:1])
+    assert not _backfill_complete(store._open_table(LOGS))
+    store._set_task_identifiers()
+    assert _backfill_complete(store._open_table(LOGS))
+
+
+def test_task_identifier_backfill_failure_not_fatal(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = DeltaLakeStore(store_path=str(tmp_path), create=True)
+    store.import_log_path(dir1base, recursive=True)
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise PermissionError("read-only store")
+
+    monkeypatch.setattr(DeltaLakeStore, "_set_task_identifiers", fail)
+    entry = read_log_record(log1_path)
+    logs = store.search_for_logs({entry.task_identifier})
+    assert logs[entry.task_identifier].log_file == log1_path
+
+
+def test_table_handle_and_snapshot_reused(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Repeated reads reuse the table handle and read each version once."""
+    store = DeltaLakeStore(store_path=str(tmp_path), create=True)
+    store.import_log_path(dir1base, recursive=True)
+    entry = read_log_record(log1_path)
+
+    dt = store._open_table(LOGS)
+    reads: list[int] = []
+    to_pyarrow_dataset = DeltaTable.to_pyarrow_dataset
+
+    def count_reads(self: DeltaTable, *args: Any, **kwargs: Any) -> Any:
+        if self is dt:
+            reads.append(self.version())
+        return to_pyarrow_dataset(self, *args, **kwargs)
+
+    monkeypatch.setattr(DeltaTable, "to_pyarrow_dataset", count_reads)
+    for _ in range(3):
+        assert len(store.get_logs()) == 2
+        assert store.search_for_logs({entry.task_identifier})
+    assert store._open_table(LOGS) is dt
+    assert reads == [dt.version()]
+
+    # A commit from another writer is picked up incrementally
+    other = DeltaLakeStore(store_path=str(tmp_path))
+    other.import_log_path(dir2base, recursive=True)
+    assert len(store.get_logs()) == 4
+    assert store._open_table(LOGS) is dt
+    assert len(reads) == 2
+
+
+def test_lookup_reads_only_task_partitions(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A lookup on a partitioned store reads only its tasks' partitions."""
+    DeltaLakeStore(store_path=str(tmp_path), create=True).import_log_path(
+        parent, recursive=True
+    )
+    entry = read_log_record(log1_path)
+    partitions: list[Any] = []
+    to_pyarrow_dataset = DeltaTable.to_pyarrow_dataset
+
+    def record_partitions(self: DeltaTable, *args: Any, **kwargs: Any) -> Any:
+        partitions.append(kwargs.get("partitions"))
+        return to_pyarrow_dataset(self, *args, **kwargs)
+
+    monkeypatch.setattr(DeltaTable, "to_pyarrow_dataset", record_partitions)
+    store = DeltaLakeStore(store_path=str(tmp_path))
+    logs = store.search_for_logs({entry.task_identifier})
+    assert logs[entry.task_identifier].log_file == log1_path
+    assert partitions == [[(_TASK_HASH_COL, "in", [_task_hash(entry.task_identifier)])]]
+
+
+def test_optimize_dry_run_does_not_commit(tmp_path: Path) -> None:
+    store = DeltaLakeStore(store_path=str(tmp_path), create=True)
+    row = LogRecord(log_path=to_uri(log1_path), task_identifier="").to_dict()
+    row.pop(_task_id_col())
+    write_deltalake(
+        store._table_path(LOGS),
+        pa.Table.from_pylist([row], schema=LogRecord.to_schema()),
+        mode="append",
+    )
+    version = store._open_table(LOGS).version()
+
+    store.optimize(dry_run=True)
+    dt = store._open_table(LOGS)
+    assert dt.version() == version
+    assert not _backfill_complete(dt)
+
+
+def test_optimize_short_retention_needs_force(tmp_path: Path) -> None:
+    store = DeltaLakeStore(store_path=str(tmp_path), create=True)
+    store.import_log_path(dir1base)
+    with pytest.raises(ValueError, match="force"):
+        store.optimize(retention_hours=0)
+    assert store.optimize(retention_hours=0, force=True).files_after >= 1
+
+
+def test_optimize_partitions_older_store(tmp_path: Path) -> None:
+    """Optimize rewrites a store from before partitioning in the new layout."""
+    table_path = str(tmp_path / "flow_store" / LOGS)
+    entry = read_log_record(log1_path)
+    row = entry.to_dict()
+    row.pop(_TASK_HASH_COL)
+    write_deltalake(
+        table_path,
+        pa.Table.from_pylist([row]),
+        description=json.dumps({"name": LOGS, "version": "0.2.2", "other": "kept"}),
+    )
+    store = DeltaLakeStore(store_path=str(tmp_path))
+    assert store.search_for_logs({entry.task_identifier})
+
+    store.optimize()
+    metadata = store._open_table(LOGS).metadata()
+    assert metadata.partition_columns == [_TASK_HASH_COL]
+    description = json.loads(metadata.description)
+    assert description["version"] == TABLES[0].version
+    assert description["other"] == "kept"
+    logs = DeltaLakeStore(store_path=str(tmp_path)).search_for_logs(
+        {entry.task_identifier}
+    )
+    assert logs[entry.task_identifier].log_file == log1_path
+
+
+def test_partition_keeps_concurrent_appends(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Rows appended while optimize partitions a store are not dropped."""
+    table_path = str(tmp_path / "flow_store" / LOGS)
+    entry = read_log_record(log1_path)
+    row = entry.to_dict()
+    row.pop(_TASK_HASH_COL)
+    write_deltalake(
+        table_path,
+        pa.Table.from_pylist([row]),
+        description=json.dumps({"name": LOGS, "version": "0.2.2"}),
+    )
+    log2_path = (
+        dir2 + "/2026-01-09T18-27-59+00-00_mmlu-0-shot_AaMwC64MK8EccYgfhUqy3n.eval"
+    )
+    appended = read_log_record(log2_path).to_dict()
+    appended.pop(_TASK_HASH_COL)
+    real_write = write_deltalake
+    calls: list[str] = []
+
+    def write(table: Any, data: Any, **kwargs: Any) -> None:
+        if kwargs.get("mode") == "overwrite" and not calls:
+            # Another process appends between the migration's read and write
+            real_write(table_path, pa.Table.from_pylist([appended]), mode="append")
+        calls.append(kwargs.get("mode", "error"))
+        real_write(table, data, **kwargs)
+
+    monkeypatch.setattr("inspect_flow._store.deltalake.write_deltalake", write)
+    store = DeltaLakeStore(store_path=str(tmp_path))
+    store.optimize()
+
+    assert calls == ["overwrite", "overwrite"]
+    dt = store._open_table(LOGS)
+    files = pa.table(dt.get_add_actions(flatten=True))
+    assert files[f"partition.{_TASK_HASH_COL}"].null_count == 0
+    log_files = pa.table(dt.to_pyarrow_table())["log_path"].to_pylist()
+    assert sorted(log_files) == sorted([log1_path, log2_path])
+
+
+def test_scan_filter_reads_only_unknown_headers(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A filter expression is answered from the table, except for rows without headers."""
+    store = DeltaLakeStore(store_path=str(tmp_path), create=True)
+    store.import_log_path(dir1base)
+    # Mark the log as imported before the store kept header columns
+    store._open_table(LOGS).update(
+        updates={"status": "NULL"}, predicate=f"log_path = '{log1_path}'"
+    )
+    read: list[str] = []
+    real_read = read_header_async
+
+    async def read_header(log: str, *args: Any, **kwargs: Any) -> Any:
+        read.append(log)
+        return await real_read(log, *args, **kwargs)
+
+    monkeypatch.setattr("inspect_flow._store.deltalake.read_header_async", read_header)
+    all_logs = store.scan(["log_path"]).read_all()["log_path"].to_pylist()
+    assert log1_path in all_logs and len(all_logs) > 1
+
+    reader = store.scan(["log_path"], filter=log_field("status").eq("success"))
+    assert reader.schema.names == ["log_path"]
+    assert reader.read_all()["log_path"].to_pylist() == all_logs
+    assert read == [log1_path]
+
+    read.clear()
+    reader = store.scan(["log_path"], filter=lambda log: log.eval.task_id != "")
+    assert reader.read_all()["log_path"].to_pylist() == all_logs
+    assert sorted(read) == sorted(all_logs)
+
+
+def test_bucket_region_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Bucket regions are looked up once and cached in the flow data file."""
+    lookups: list[str] = []
+
+    def lookup(bucket_name: str) -> str:
+        lookups.append(bucket_name)
+        return "eu-west-2"
+
+    monkeypatch.setattr("inspect_flow._store.deltalake._lookup_bucket_region", lookup)
+    monkeypatch.setattr("inspect_flow._store.deltalake._bucket_regions", {})
+    assert _get_bucket_region("bucket") == "eu-west-2"
+    assert _get_bucket_region("bucket") == "eu-west-2"
+    assert lookups == ["bucket"]
+
+    # A new process reads the cached region until it expires
+    monkeypatch.setattr("inspect_flow._store.deltalake._bucket_regions", {})
+    assert _get_bucket_region("bucket") == "eu-west-2"
+    assert lookups == ["bucket"]
+    monkeypatch.setattr("inspect_flow._store.deltalake._BUCKET_REGION_TTL_SECONDS", 0)
+    monkeypatch.setattr("inspect_flow._store.deltalake._bucket_regions", {})
+    assert _get_bucket_region("bucket") == "eu-west-2"
+    assert lookups == ["bucket", "bucket"]
+
+
+def test_bucket_region_corrupt_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An unreadable or malformed cache is a miss, and is replaced."""
+    lookups: list[str] = []
+
+    def lookup(bucket_name: str) -> str:
+        lookups.append(bucket_name)
+        return "eu-west-2"
+
+    monkeypatch.setattr("inspect_flow._store.deltalake._lookup_bucket_region", lookup)
+    path = user_data_dir() / "flow_data.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for contents in [
+        "{not json",
+        json.dumps({BUCKET_REGIONS_KEY: {"bucket": {"region": "x"}}}),
+    ]:
+        path.write_text(contents)
+        monkeypatch.setattr("inspect_flow._store.deltalake._bucket_regions", {})
+        assert _get_bucket_region("bucket") == "eu-west-2"
+    assert lookups == ["bucket", "bucket"]
+
+    monkeypatch.setattr("inspect_flow._store.deltalake._bucket_regions", {})
+    assert _get_bucket_region("bucket") == "eu-west-2"
+    assert lookups == ["bucket", "bucket"]
+
+
 class TestCheckTableDescription:
     """Tests for _check_table_description version validation."""
 
@@ -219,3 +635,92 @@ class TestCheckTableDescription:
         # Opening with current (lower) code version should fail
         with pytest.raises(ValueError, match="upgrade required"):
             DeltaLakeStore(store_path=str(tmp_path))
+
+
+def test_copies_collapsed_and_deduped(tmp_path: Path) -> None:
+    copy_dir = tmp_path / "copies"
+    copy_dir.mkdir()
+    shutil.copy(Path(dir1base) / log1_name, copy_dir / log1_name)
+    copy_path = "file://" + str(copy_dir / log1_name)
+
+    store = DeltaLakeStore(str(tmp_path / "store"), create=True)
+    store.import_log_path(dir1base)
+    store.import_log_path(str(copy_dir))
+    task_id = read_log_record(log1_path).task_identifier
+    match = store.search_for_logs({task_id})[task_id]
+    assert match.log_file in (log1_path, copy_path)
+    assert match.duplicate_logs == []
+
+    logs = store.get_logs()
+    assert {log1_path, copy_path} <= logs
+    assert len(list_logs(store=store)) == len(logs) - 1
+    assert len(list_logs(store=store, copies=True)) == len(logs)
+
+    # Rows stored before fingerprints were recorded have them computed
+    store._open_table(LOGS).update({"fingerprint": "NULL"})
+    result = store.dedupe(dry_run=True)
+    assert result.copies == {log1_path: [copy_path]}
+    assert store.get_logs() == logs
+
+    assert store.dedupe().copies == {log1_path: [copy_path]}
+    assert store.get_logs() == logs - {copy_path}
+    assert store.dedupe().copies == {}
+
+
+def test_dedupe_keeps_existing_copy(tmp_path: Path) -> None:
+    original_dir, copy_dir = tmp_path / "original", tmp_path / "copies"
+    for d in (original_dir, copy_dir):
+        d.mkdir()
+        shutil.copy(Path(dir1base) / log1_name, d / log1_name)
+    original_path = "file://" + str(original_dir / log1_name)
+    copy_path = "file://" + str(copy_dir / log1_name)
+
+    store = DeltaLakeStore(str(tmp_path / "store"), create=True)
+    store.import_log_path(str(original_dir))
+    store.import_log_path(str(copy_dir))
+    # The copy added first no longer exists, so the other one is kept
+    (original_dir / log1_name).unlink()
+    assert store.dedupe().copies == {copy_path: [original_path]}
+    assert store.get_logs() == {copy_path}
+
+
+def test_reads_pinned_to_version(tmp_path: Path) -> None:
+    store = DeltaLakeStore(str(tmp_path), create=True)
+    store.import_log_path(dir1base)
+    version = store._open_table(LOGS).version()
+    logs1 = store.get_logs()
+    pinned_at = datetime.now(timezone.utc)
+    store.import_log_path(dir2base)
+    log2_path = (
+        dir2 + "/2026-01-09T18-27-59+00-00_mmlu-0-shot_AaMwC64MK8EccYgfhUqy3n.eval"
+    )
+    task_id = read_log_record(log2_path).task_identifier
+
+    pinned = DeltaLakeStore(str(tmp_path), as_of=str(version))
+    assert pinned.get_logs() == logs1
+    assert pinned.search_for_logs({task_id}) == {}
+    assert set(pinned.scan(["log_path"]).read_all()["log_path"].to_pylist()) == logs1
+
+    # Writes compare against the latest version, so nothing is added twice
+    pinned.import_log_path(dir2base)
+    latest = store._open_table(LOGS).to_pyarrow_dataset().to_table()
+    assert len(latest) == len(store.get_logs())
+
+    assert DeltaLakeStore(str(tmp_path), as_of=pinned_at.isoformat()).get_logs() == (
+        logs1
+    )
+    with pytest.raises(ValueError, match="no version"):
+        DeltaLakeStore(str(tmp_path), as_of=1000).get_logs()
+    with pytest.raises(ValueError, match="Invalid store version"):
+        parse_as_of("yesterday")
+
+
+def test_store_version_option() -> None:
+    spec = expand_spec(
+        FlowSpec(store="auto"),
+        base_dir=".",
+        options=ConfigOptions(store_version="12"),
+    )
+    assert isinstance(spec.store, FlowStoreConfig)
+    assert spec.store.as_of == "12"
+    assert parse_as_of(spec.store.as_of) == 12
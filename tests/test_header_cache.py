@@ -0,0 +1,84 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from inspect_ai._util._async import run_coroutine
+from inspect_flow._cli.cache import cache_command
+from inspect_flow._util.header_cache import (
+    CachedHeader,
+    HeaderCache,
+    header_cache,
+    read_header_async,
+    read_headers,
+)
+
+log_name = "2025-12-11T18-00-43+00-00_gpqa-diamond_NL3aygdanSgqAJfzoMFuH6.eval"
+log_path = f"tests/test_logs/logs1/{log_name}"
+
+
+def _copy_log(tmp_path: Path) -> str:
+    dest = tmp_path / log_name
+    shutil.copy(log_path, dest)
+    return str(dest)
+
+
+def _fail(*args: object, **kwargs: object) -> None:
+    raise AssertionError("header read")
+
+
+def test_cache_hit_skips_read(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    log = _copy_log(tmp_path)
+    first = run_coroutine(read_header_async(log, valid_samples=True))
+    assert first.valid_samples is not None
+
+    monkeypatch.setattr("inspect_flow._util.header_cache.read_eval_log_async", _fail)
+    second = run_coroutine(read_header_async(log, valid_samples=True))
+    assert second.header.eval.task == first.header.eval.task
+    assert second.header.location == log
+    assert second.valid_samples == first.valid_samples
+    assert header_cache().stats().entries == 1
+
+
+def test_changed_file_is_reread(tmp_path: Path) -> None:
+    log = _copy_log(tmp_path)
+    read_headers([log])
+    cache = header_cache()
+    info = Path(log).stat()
+    entry = cache.get(log, info.st_size, info.st_mtime, None)
+    assert entry is not None
+
+    # A cached entry for a different size is not returned
+    assert cache.get(log, info.st_size + 1, info.st_mtime, None) is None
+    cache.put(log, info.st_size, info.st_mtime, "etag-1", entry)
+    assert cache.get(log, info.st_size, info.st_mtime, "etag-2") is None
+    assert cache.get(log, info.st_size, info.st_mtime, "etag-1") is not None
+
+
+def test_evict_least_recently_used(tmp_path: Path) -> None:
+    log = _copy_log(tmp_path)
+    header = run_coroutine(read_header_async(log)).header
+    size = len(header.model_dump_json())
+    cache = HeaderCache(tmp_path / "cache.sqlite", max_size=size * 2)
+    for name in ["a", "b", "c"]:
+        cache.put(name, 1, 1.0, None, CachedHeader(header=header))
+    assert cache.get("a", 1, 1.0, None) is not None
+
+    assert cache.evict() == 1
+    assert cache.get("b", 1, 1.0, None) is None
+    assert cache.get("a", 1, 1.0, None) is not None
+    assert cache.get("c", 1, 1.0, None) is not None
+
+
+def test_cache_cli(tmp_path: Path) -> None:
+    read_headers([_copy_log(tmp_path)])
+    runner = CliRunner()
+
+    result = runner.invoke(cache_command, ["stats", "--json"])
+    assert result.exit_code == 0
+    assert '"entries": 1' in result.output
+
+    result = runner.invoke(cache_command, ["clear"])
+    assert result.exit_code == 0
+    assert "Removed 1 cached header" in result.output
+    assert header_cache().stats().entries == 0
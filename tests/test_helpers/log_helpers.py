@@ -2,9 +2,11 @@ import shutil
 from pathlib import Path
 
 from inspect_ai import Task
+from inspect_ai._util._async import run_coroutine
 from inspect_ai.log import list_eval_logs, read_eval_log
 from inspect_flow import FlowSpec, FlowTask
 from inspect_flow._runner.instantiate import get_task_name
+from inspect_flow._store.deltalake import LogRecord, _read_log_record
 from inspect_flow._types.flow_types import NotGiven
 
 
@@ -17,6 +19,13 @@ def init_test_logs() -> str:
     return str(log_dir)
 
 
+def read_log_record(log_file: str) -> LogRecord:
+    """The store record for a log file, as an import would write it."""
+    record = run_coroutine(_read_log_record(log_file))
+    assert record is not None
+    return record
+
+
 def init_test_store() -> str:
     relative_db_dir = "logs/test_store"
     db_dir = (Path.cwd() / relative_db_dir).resolve()
@@ -1,14 +1,18 @@
 import threading
 import time
+from pathlib import Path
 from typing import Any
 
 import pytest
 from botocore.client import BaseClient
 from inspect_ai import Task, task
+from inspect_ai._util import registry
 from inspect_ai.agent import Agent, AgentState, agent
+from inspect_ai.dataset import Sample
 from inspect_ai.model import Model, get_model
 from inspect_ai.util import CheckpointConfig, TokenInterval
-from inspect_flow._runner.instantiate import instantiate_tasks
+from inspect_flow._runner.instantiate import build_tasks, instantiate_tasks
+from inspect_flow._runner.logs import find_existing_logs, get_task_ids_to_tasks
 from inspect_flow._types.flow_types import (
     FlowAgent,
     FlowDefaults,
@@ -22,6 +26,7 @@ from inspect_flow._types.flow_types import (
     FlowTask,
     InstantiateConfig,
 )
+from inspect_flow._util.module_util import execute_file_and_get_last_result
 from inspect_flow._util.pydantic_util import model_dump
 from rich.console import Console
 
@@ -370,7 +375,9 @@ def test_534_instantiate_error(recording_console: Console) -> None:
     assert "instantiate_error_task" in out
 
 
-@pytest.mark.parametrize("instantiate", ["serial", "by_task", "parallel", None])
+@pytest.mark.parametrize(
+    "instantiate", ["serial", "by_task", "parallel", "process", None]
+)
 def test_instantiate_modes_preserve_order(instantiate: Any) -> None:
     tasks_in = [FlowTask(name=task_name, tags=[f"tag-{i}"]) for i in range(5)]
     spec = FlowSpec(tasks=tasks_in, instantiate=instantiate)
@@ -490,3 +497,141 @@ def test_instantiate_config_max_threads() -> None:
     )
     tasks_out = instantiate_tasks(spec=spec, base_dir=".")
     assert len(tasks_out) == 3
+
+
+@pytest.mark.usefixtures("importable_registry")
+def test_instantiate_process_describes_tasks(tmp_path: Path) -> None:
+    def spec(mode: str) -> FlowSpec:
+        return FlowSpec(
+            log_dir=str(tmp_path),
+            tasks=[
+                FlowTask(name=task_name, model=FlowModel(name=f"mockllm/m{i}"))
+                for i in range(3)
+            ],
+            instantiate=mode,
+        )
+
+    serial = instantiate_tasks(spec=spec("serial"), base_dir=".")
+    process = instantiate_tasks(spec=spec("process"), base_dir=".")
+    # Workers return descriptions; the tasks are only rebuilt when accessed
+    assert all(t.description and t.loaded_task is None for t in process)
+    serial_ids = get_task_ids_to_tasks(serial, spec("serial"))
+    process_ids = get_task_ids_to_tasks(process, spec("process"))
+    assert list(process_ids) == list(serial_ids)
+
+    serial_info = find_existing_logs(serial_ids, spec("serial"), None).task_log_info
+    process_info = find_existing_logs(process_ids, spec("process"), None).task_log_info
+    assert [i.task_samples for i in process_info.values()] == [
+        i.task_samples for i in serial_info.values()
+    ]
+    assert [i.name for i in process_info.values()] == [
+        i.name for i in serial_info.values()
+    ]
+    assert all(t.loaded_task is None for t in process)
+
+    assert process[1].task.model and process[1].task.model.name == "m1"
+    assert process[0].loaded_task is None
+
+
+@pytest.mark.usefixtures("importable_registry")
+def test_instantiate_process_keeps_callables_local() -> None:
+    spec = FlowSpec(
+        tasks=[
+            FlowTask(factory=lambda: Task(name="in_memory")),
+            FlowTask(name=task_name),
+        ],
+        instantiate="process",
+    )
+    local, remote = instantiate_tasks(spec=spec, base_dir=".")
+    assert local.description is None and local.task.name == "in_memory"
+    assert remote.description and remote.loaded_task is None
+
+
+@pytest.mark.usefixtures("importable_registry")
+def test_instantiate_process_builds_tasks_to_run() -> None:
+    spec = FlowSpec(
+        tasks=[
+            FlowTask(name=task_name, model=FlowModel(name=f"mockllm/m{i}"))
+            for i in range(3)
+        ],
+        instantiate="process",
+    )
+    tasks_out = instantiate_tasks(spec=spec, base_dir=".")
+    build_tasks(tasks_out[1:], spec)
+    assert tasks_out[0].loaded_task is None
+    assert all(t.description and t.loaded_task for t in tasks_out[1:])
+    assert [t.task.model and t.task.model.name for t in tasks_out] == ["m0", "m1", "m2"]
+
+
+def test_instantiate_process_falls_back_for_config_tasks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Keep the config's task out of the registry of later tests
+    monkeypatch.setattr(registry, "_registry", dict(registry._registry))
+    # Tasks defined in a flow config can't be imported by workers
+    config_file = tmp_path / "process_config.py"
+    config_file.write_text(
+        "from inspect_ai import Task, task\n\n\n"
+        "@task\n"
+        "def process_config_task() -> Task:\n"
+        '    return Task(name="process_config_task")\n'
+    )
+    execute_file_and_get_last_result(str(config_file), args={})
+    spec = FlowSpec(tasks=[FlowTask(name="process_config_task")], instantiate="process")
+    [instantiated] = instantiate_tasks(spec=spec, base_dir=".")
+    assert instantiated.description is None
+    assert instantiated.task.name == "process_config_task"
+
+
+@pytest.mark.usefixtures("importable_registry")
+def test_instantiate_process_error(recording_console: Console) -> None:
+    spec = FlowSpec(
+        tasks=[FlowTask(name=task_name), FlowTask(name="instantiate_error_task")],
+        instantiate=InstantiateConfig(mode="process", max_processes=2),
+    )
+    with pytest.raises(ValueError) as e:
+        instantiate_tasks(spec=spec, base_dir=".")
+    assert "Instantiation Error" in str(e.value)
+    assert "instantiate_error_task" in recording_console.export_text()
+
+
+factory_calls: list[dict[str, Any]] = []
+
+
+@task
+def counted_task(n: int = 3) -> Task:
+    factory_calls.append({"n": n})
+    return Task(dataset=[Sample(input=str(i), id=i) for i in range(n)])
+
+
+@pytest.mark.parametrize("instantiate", ["serial", "parallel"])
+def test_task_factory_called_once_per_args(instantiate: str) -> None:
+    factory_calls.clear()
+    spec = FlowSpec(
+        tasks=[
+            *[
+                FlowTask(name="counted_task", model=FlowModel(name=f"mockllm/m{i}"))
+                for i in range(3)
+            ],
+            FlowTask(name="counted_task", args={"n": 4}, sample_id=[1, 2]),
+            FlowTask(name="counted_task", args={"n": 4}),
+        ],
+        instantiate=InstantiateConfig(mode=instantiate, cache_tasks=True),
+    )
+    tasks_out = instantiate_tasks(spec=spec, base_dir=".")
+    assert sorted(call["n"] for call in factory_calls) == [3, 4]
+    assert [t.task.model and t.task.model.name for t in tasks_out[:3]] == [
+        "m0",
+        "m1",
+        "m2",
+    ]
+    # Variants get their own copies of the task and its dataset
+    assert len({id(t.task) for t in tasks_out}) == 5
+    assert [len(t.task.dataset) for t in tasks_out] == [3, 3, 3, 2, 4]
+
+
+def test_task_cache_off_by_default() -> None:
+    factory_calls.clear()
+    spec = FlowSpec(tasks=[FlowTask(name="counted_task") for _ in range(3)])
+    instantiate_tasks(spec=spec, base_dir=".")
+    assert len(factory_calls) == 3
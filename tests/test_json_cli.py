@@ -177,7 +177,7 @@ def test_store_info_json(tmp_path: Path) -> None:
     data = _invoke_json(store_command, ["info", "--json"])
     assert data["logs"] == 2
     assert data["log_dirs"] == 1
-    assert data["version"] == "0.2.0"
+    assert data["version"] == "0.3.1"
     assert data["path"]
 
 
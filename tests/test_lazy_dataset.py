@@ -0,0 +1,92 @@
+import logging
+from pathlib import Path
+
+import pytest
+from inspect_ai import Task, task
+from inspect_ai.dataset import Sample
+from inspect_flow import FlowSpec, FlowTask, file_sample_count, lazy_dataset
+from inspect_flow._runner.run import run_eval_set
+from inspect_flow._types.lazy_dataset import LazyDataset, dataset_samples
+from inspect_flow.api import check
+
+loads: list[int] = []
+
+
+def _samples(n: int) -> list[Sample]:
+    loads.append(n)
+    return [Sample(id=i, input=str(i), target=str(i)) for i in range(n)]
+
+
+@task
+def lazy_task(n: int = 3) -> Task:
+    return Task(dataset=lazy_dataset(lambda: _samples(n), count=n))
+
+
+def test_lazy_dataset_counts_without_loading() -> None:
+    loads.clear()
+    dataset = lazy_dataset(lambda: _samples(10), count=lambda: 10, name="lazy")
+    assert isinstance(dataset, LazyDataset)
+    task = Task(dataset=dataset)
+    clone = task.dataset[2:5]
+    assert len(task.dataset) == 10
+    assert dataset_samples(clone) == 3
+    assert dataset.name == "lazy"
+    assert loads == []
+
+    assert [s.id for s in clone] == [2, 3, 4]
+    assert loads == [10]
+    assert dataset[9].id == 9
+    assert loads == [10]
+
+
+def test_lazy_dataset_without_count_loads() -> None:
+    loads.clear()
+    dataset = lazy_dataset(lambda: _samples(4))
+    assert dataset_samples(dataset) == 4
+    assert loads == [4]
+
+
+def test_lazy_dataset_wrong_count_warns(caplog: pytest.LogCaptureFixture) -> None:
+    loads.clear()
+    dataset = lazy_dataset(lambda: _samples(3), count=5, name="lazy")
+    assert len(dataset) == 5
+    with caplog.at_level(logging.WARNING):
+        assert len(list(dataset)) == 3
+    assert "lazy has 3 samples but its count is 5" in caplog.text
+    assert len(dataset) == 3
+
+
+def test_lazy_dataset_unused_count_not_computed() -> None:
+    def count() -> int:
+        raise AssertionError("count computed")
+
+    dataset = lazy_dataset(lambda: _samples(3), count=count)
+    assert [s.id for s in dataset] == [0, 1, 2]
+    assert len(dataset) == 3
+
+
+def test_file_sample_count(tmp_path: Path) -> None:
+    jsonl = tmp_path / "samples.jsonl"
+    jsonl.write_text('{"input": "a"}\n{"input": "b"}\n\n')
+    assert file_sample_count(str(jsonl)) == 2
+    csv = tmp_path / "samples.csv"
+    csv.write_text("input,target\na,b\nc,d\n")
+    assert file_sample_count(str(csv), header=True) == 2
+
+
+def test_dry_run_and_check_do_not_load(tmp_path: Path) -> None:
+    spec = FlowSpec(
+        log_dir=str(tmp_path),
+        tasks=[
+            FlowTask(name="lazy_task", args={"n": n}, model="mockllm/mock-llm")
+            for n in (2, 3)
+        ],
+    )
+    loads.clear()
+    run_eval_set(spec, base_dir=".", dry_run=True)
+    result = check(spec, base_dir=".")
+    assert loads == []
+    assert [t.total_samples for t in result.tasks] == [2, 3]
+
+    assert run_eval_set(spec, base_dir=".").success
+    assert sorted(loads) == [2, 3]
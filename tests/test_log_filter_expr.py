@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+from inspect_ai.log import EvalLog, read_eval_log
+from inspect_flow import FilterExpr, log_field
+from inspect_flow._store.deltalake import DeltaLakeStore, LogRecord, to_uri
+from inspect_flow._types.log_filter import resolve_log_filter
+
+log_dir = "tests/test_logs/logs1"
+log_path = (
+    f"{log_dir}/2025-12-11T18-00-43+00-00_gpqa-diamond_NL3aygdanSgqAJfzoMFuH6.eval"
+)
+
+
+def _header() -> EvalLog:
+    header = read_eval_log(log_path, header_only=True)
+    header.tags = ["baseline", "reviewed"]
+    return header
+
+
+EXPRS: list[FilterExpr] = [
+    log_field("status").eq("success"),
+    log_field("status").ne("success"),
+    log_field("status").isin(["error", "cancelled"]),
+    log_field("task").glob("*/gpqa_*"),
+    log_field("task").glob("gpqa*"),
+    log_field("model").glob("openai/gpt-[45]"),
+    log_field("model").glob("openai/gpt-[!5]"),
+    log_field("tags").glob("rev*"),
+    log_field("tags").glob("rev"),
+    log_field("tags").isin(["baseline", "other"]),
+    log_field("completed_samples").gt(0),
+    log_field("completed_samples").le(0),
+    log_field("completed_at").between(since=datetime(2025, 12, 1)),
+    log_field("completed_at").between(until=datetime(2025, 12, 1)),
+    log_field("started_at").lt(datetime(2030, 1, 1, tzinfo=timezone.utc)),
+    log_field("invalidated").eq(True),
+    ~log_field("model").glob("anthropic/*") & log_field("status").eq("success"),
+    log_field("model").glob("anthropic/*") | log_field("tags").isin(["reviewed"]),
+    ~(log_field("status").eq("error") | log_field("completed_samples").lt(1)),
+]
+
+
+@pytest.mark.parametrize("expr", EXPRS)
+def test_arrow_matches_python(expr: FilterExpr) -> None:
+    """The compiled arrow expression agrees with the Python predicate."""
+    header = _header()
+    record = LogRecord.from_header(header, log_path=to_uri(log_path))
+    table = pa.Table.from_pylist([record.to_dict()], schema=LogRecord.to_schema())
+    assert table.filter(expr.to_arrow()).num_rows == int(expr(header))
+
+
+def test_empty_tags_do_not_match() -> None:
+    header = _header()
+    header.tags = []
+    expr = log_field("tags").glob("*")
+    record = LogRecord.from_header(header, log_path=to_uri(log_path))
+    table = pa.Table.from_pylist([record.to_dict()], schema=LogRecord.to_schema())
+    assert not expr(header)
+    assert table.filter(expr.to_arrow()).num_rows == 0
+
+
+def test_unknown_field_raises() -> None:
+    with pytest.raises(ValueError, match="Unknown log filter field"):
+        log_field("nope")
+
+
+def test_list_field_compare_raises() -> None:
+    with pytest.raises(ValueError, match="is a list"):
+        log_field("tags").eq("a")
+
+
+def test_resolve_keeps_expressions() -> None:
+    resolved = resolve_log_filter(
+        [log_field("status").eq("success"), log_field("model").glob("openai/*")]
+    )
+    assert isinstance(resolved, FilterExpr)
+    assert resolved.columns() == {"status", "model"}
+
+
+def test_store_answers_expression_from_columns(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Stores evaluate filter expressions without reading log headers."""
+    store = DeltaLakeStore(store_path=str(tmp_path), create=True)
+    store.import_log_path(log_dir)
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("header read")
+
+    monkeypatch.setattr("inspect_flow._store.deltalake.read_header_async", fail)
+
+    assert store.get_logs(log_field("task").glob("*gpqa*")) == store.get_logs()
+    assert store.get_logs(log_field("status").eq("error")) == set()
+    assert to_uri(log_path) in store.get_logs(
+        log_field("completed_at").between(since=datetime(2025, 12, 11))
+    )
@@ -0,0 +1,158 @@
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from inspect_ai import Task, task
+from inspect_ai._util.error import PrerequisiteError
+from inspect_ai.dataset import Sample
+from inspect_flow import FlowOptions, FlowSpec, FlowTask, InstantiateConfig
+from inspect_flow._runner.manifest import MANIFEST_FILE, read_manifest
+from inspect_flow._runner.run import run_eval_set
+from inspect_flow.api import check
+
+factory_calls: list[int] = []
+
+
+@task
+def manifest_task(n: int = 2) -> Task:
+    factory_calls.append(n)
+    return Task(dataset=[Sample(input=str(i), target=str(i)) for i in range(n)])
+
+
+def _spec(log_dir: Path, *ns: int, **kwargs: Any) -> FlowSpec:
+    return FlowSpec(
+        log_dir=str(log_dir),
+        tasks=[
+            FlowTask(name="manifest_task", args={"n": n}, model="mockllm/mock-llm")
+            for n in ns
+        ],
+        **kwargs,
+    )
+
+
+def _skip_complete(log_dir: Path, *ns: int, **kwargs: Any) -> FlowSpec:
+    return _spec(
+        log_dir, *ns, instantiate=InstantiateConfig(skip_complete=True), **kwargs
+    )
+
+
+def test_complete_tasks_not_instantiated(tmp_path: Path) -> None:
+    factory_calls.clear()
+    result = run_eval_set(_skip_complete(tmp_path, 2, 3), base_dir=".")
+    assert result.success
+    assert sorted(factory_calls) == [2, 3]
+    manifest = read_manifest(str(tmp_path))
+    assert manifest
+    samples = [d.dataset_samples for ds in manifest.tasks.values() for d in ds]
+    assert sorted(samples) == [2, 3]
+
+    factory_calls.clear()
+    run_eval_set(_skip_complete(tmp_path, 2, 3, 4), base_dir=".", dry_run=True)
+    assert factory_calls == [4]
+
+    factory_calls.clear()
+    check_result = check(_skip_complete(tmp_path, 2, 3, 4), base_dir=".")
+    assert not check_result.is_complete
+    assert factory_calls == [4]
+    assert [t.total_samples for t in check_result.tasks] == [2, 3, 4]
+
+
+def test_run_skips_complete_tasks(tmp_path: Path) -> None:
+    run_eval_set(_skip_complete(tmp_path, 2, 3), base_dir=".")
+
+    factory_calls.clear()
+    result = run_eval_set(_skip_complete(tmp_path, 2, 3, 4), base_dir=".")
+    assert result.success
+    assert factory_calls == [4]
+    assert len(result.logs) == 3
+    assert len(list(tmp_path.glob("*.eval"))) == 3
+    # The eval set info still lists every task
+    eval_set = json.loads((tmp_path / "eval-set.json").read_text())
+    task_ids = {log.eval.task_id for log in result.logs}
+    assert {t["task_id"] for t in eval_set["tasks"]} == task_ids
+
+    # With every task complete, eval_set isn't run at all
+    factory_calls.clear()
+    result = run_eval_set(_skip_complete(tmp_path, 2, 3, 4), base_dir=".")
+    assert result.success
+    assert factory_calls == []
+    assert {log.eval.task_id for log in result.logs} == task_ids
+    assert len(list(tmp_path.glob("*.eval"))) == 3
+    eval_set = json.loads((tmp_path / "eval-set.json").read_text())
+    assert {t["task_id"] for t in eval_set["tasks"]} == task_ids
+
+
+def test_run_keeps_unexpected_log_check(tmp_path: Path) -> None:
+    run_eval_set(_skip_complete(tmp_path, 2, 3), base_dir=".")
+    with pytest.raises(PrerequisiteError, match="not associated with a task"):
+        run_eval_set(_skip_complete(tmp_path, 2), base_dir=".")
+
+
+def test_incomplete_tasks_instantiated(tmp_path: Path) -> None:
+    run_eval_set(_spec(tmp_path, 3, options=FlowOptions(limit=1)), base_dir=".")
+
+    factory_calls.clear()
+    check(_skip_complete(tmp_path, 3), base_dir=".")
+    assert factory_calls == [3]
+
+
+def test_skip_complete_off_by_default(tmp_path: Path) -> None:
+    run_eval_set(_spec(tmp_path, 2), base_dir=".")
+
+    factory_calls.clear()
+    check(_spec(tmp_path, 2), base_dir=".")
+    assert factory_calls == [2]
+
+
+def test_manifest_from_other_version_ignored(tmp_path: Path) -> None:
+    run_eval_set(_spec(tmp_path, 2), base_dir=".")
+    manifest_file = tmp_path / MANIFEST_FILE
+    data = json.loads(manifest_file.read_text())
+    data["versions"]["inspect_ai"] = "0.0.0"
+    manifest_file.write_text(json.dumps(data))
+
+    factory_calls.clear()
+    check(_skip_complete(tmp_path, 2), base_dir=".")
+    assert factory_calls == [2]
+
+
+def test_manifest_write_failure_not_fatal(tmp_path: Path) -> None:
+    with patch(
+        "inspect_flow._runner.manifest.file", side_effect=PermissionError("denied")
+    ):
+        result = run_eval_set(_spec(tmp_path, 2), base_dir=".")
+    assert result.success
+    assert read_manifest(str(tmp_path)) is None
+
+
+def test_check_from_manifest(tmp_path: Path) -> None:
+    run_eval_set(_spec(tmp_path, 2, 3), base_dir=".")
+
+    factory_calls.clear()
+    result = check(_spec(tmp_path, 2, 3), base_dir=".", from_manifest=True)
+    assert factory_calls == []
+    assert result.is_complete
+    assert [t.total_samples for t in result.tasks] == [2, 3]
+
+
+def test_check_from_manifest_missing_tasks(tmp_path: Path) -> None:
+    with pytest.raises(PrerequisiteError, match="No task manifest"):
+        check(_spec(tmp_path, 2), base_dir=".", from_manifest=True)
+
+    run_eval_set(_spec(tmp_path, 2), base_dir=".")
+    with pytest.raises(PrerequisiteError, match="1 task of the spec: manifest_task"):
+        check(_spec(tmp_path, 2, 4), base_dir=".", from_manifest=True)
+
+
+@pytest.mark.usefixtures("importable_registry")
+def test_process_run_builds_only_tasks_to_run(tmp_path: Path) -> None:
+    run_eval_set(_spec(tmp_path, 2, 3), base_dir=".")
+
+    # Workers describe every task; this process only builds the one to run
+    factory_calls.clear()
+    result = run_eval_set(_spec(tmp_path, 2, 3, 4, instantiate="process"), base_dir=".")
+    assert result.success
+    assert factory_calls == [4]
+    assert len(result.logs) == 3
@@ -0,0 +1,46 @@
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+from inspect_flow._store.deltalake import to_uri
+from inspect_flow._store.missing import find_missing_logs
+
+log_dir = Path("tests/test_logs/logs1")
+
+
+def _logs(tmp_path: Path) -> list[str]:
+    for log in log_dir.iterdir():
+        shutil.copy(log, tmp_path)
+    return sorted(to_uri(str(p)) for p in tmp_path.iterdir())
+
+
+def test_lists_each_directory_once(tmp_path: Path) -> None:
+    logs = _logs(tmp_path)
+    Path(logs[0].removeprefix("file://")).unlink()
+    gone_dir = to_uri(str(tmp_path / "gone"))
+    missing_dir = [f"{gone_dir}/a.eval", f"{gone_dir}/b.eval"]
+
+    checked: list[str] = []
+    with patch("inspect_flow._store.missing.exists") as exists:
+        missing = find_missing_logs(
+            [*logs, *missing_dir], max_concurrency=2, on_checked=checked.append
+        )
+    exists.assert_not_called()
+    assert missing == {logs[0], *missing_dir}
+    assert sorted(checked) == sorted([*logs, *missing_dir])
+
+
+def test_single_log_uses_exists(tmp_path: Path) -> None:
+    logs = _logs(tmp_path)
+    with patch("inspect_ai._util.file.FileSystem.ls") as ls:
+        assert find_missing_logs(logs[:1]) == set()
+    ls.assert_not_called()
+
+
+def test_falls_back_when_listing_fails(tmp_path: Path) -> None:
+    logs = _logs(tmp_path)
+    Path(logs[1].removeprefix("file://")).unlink()
+    with patch(
+        "inspect_ai._util.file.FileSystem.ls", side_effect=PermissionError("denied")
+    ):
+        assert find_missing_logs(logs) == {logs[1]}
@@ -211,7 +211,7 @@ class TestNumLogSamples:
 
 
 class TestFindExistingLogs:
-    @patch("inspect_flow._runner.logs.list_all_eval_logs")
+    @patch("inspect_flow._runner.logs.list_logs_with_headers")
     def test_unexpected_log_raises_prerequisite_error(
         self, mock_list_logs: MagicMock, recording_console: Console
     ) -> None:
@@ -224,7 +224,7 @@ class TestFindExistingLogs:
         with pytest.raises(PrerequisiteError, match="not associated with a task"):
             find_existing_logs(task_id_to_task={}, spec=spec, store=None)
 
-    @patch("inspect_flow._runner.logs.list_all_eval_logs")
+    @patch("inspect_flow._runner.logs.list_logs_with_headers")
     def test_unexpected_log_allowed_when_dirty(
         self, mock_list_logs: MagicMock, recording_console: Console
     ) -> None:
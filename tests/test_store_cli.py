@@ -1,3 +1,4 @@
+import json
 from unittest.mock import patch
 
 from click.testing import CliRunner
@@ -32,6 +33,24 @@ def test_store_import_shows_progress(recording_console: Console) -> None:
     assert "Imported 2 new logs" in captured
 
 
+def test_store_reimport_skips_unchanged(recording_console: Console) -> None:
+    runner = CliRunner()
+    _import_logs(runner)
+    recording_console.export_text()  # Clear previous output
+
+    with patch(
+        "inspect_flow._store.deltalake.read_headers", return_value=[]
+    ) as read_headers:
+        result = runner.invoke(
+            store_command, ["import", LOG_DIR], catch_exceptions=False
+        )
+    assert result.exit_code == 0
+    assert read_headers.call_args.args[0] == []
+    captured = recording_console.export_text()
+    assert "Imported 0 new logs" in captured
+    assert "Skipped 2 unchanged logs" in captured
+
+
 def test_store_import_dry_run(recording_console: Console) -> None:
     runner = CliRunner()
     result = runner.invoke(
@@ -83,7 +102,8 @@ def test_store_remove_missing_shows_progress(recording_console: Console) -> None
     runner = CliRunner()
     _import_logs(runner)
 
-    with patch("inspect_flow._store.deltalake.exists", return_value=False):
+    # Both logs are in one directory, so they are checked with one listing
+    with patch("inspect_ai._util.file.FileSystem.ls", return_value=[]) as ls:
         result = runner.invoke(
             store_command,
             ["remove", "--missing", "--dry-run"],
@@ -97,6 +117,33 @@ def test_store_remove_missing_shows_progress(recording_console: Console) -> None
     assert "2/2" in captured
     assert "gpqa-diamond" in captured
     assert "Removed 2 logs" in captured
+    assert ls.call_count == 1
+
+
+def test_store_optimize() -> None:
+    runner = CliRunner()
+    _import_logs(runner)
+    runner.invoke(store_command, ["import", "tests/test_logs/logs2"])
+    result = runner.invoke(store_command, ["list", "--json"], catch_exceptions=False)
+    logs = json.loads(result.output)["logs"]
+
+    result = runner.invoke(
+        store_command, ["optimize", "--dry-run", "--json"], catch_exceptions=False
+    )
+    assert result.exit_code == 0
+    dry_run = json.loads(result.output)
+    assert dry_run["files_before"] == dry_run["files_after"] > 1
+
+    result = runner.invoke(
+        store_command, ["optimize", "--json"], catch_exceptions=False
+    )
+    assert result.exit_code == 0
+    optimized = json.loads(result.output)
+    assert optimized["files_before"] == dry_run["files_before"]
+    assert optimized["files_after"] <= optimized["files_before"]
+
+    result = runner.invoke(store_command, ["list", "--json"], catch_exceptions=False)
+    assert json.loads(result.output)["logs"] == logs
 
 
 def test_store_remove_no_prefix_no_missing_errors() -> None:
@@ -219,3 +266,13 @@ def test_store_import_path_with_dotdot_is_normalized() -> None:
     assert logs, "Expected logs to be imported"
     dotdot_logs = [log for log in logs if ".." in log]
     assert not dotdot_logs, f"Some log paths contain '..': {dotdot_logs}"
+
+
+def test_store_dedupe() -> None:
+    runner = CliRunner()
+    _import_logs(runner)
+    result = runner.invoke(
+        store_command, ["dedupe", "--dry-run", "--json"], catch_exceptions=False
+    )
+    assert result.exit_code == 0
+    assert json.loads(result.output) == {"copies": {}}
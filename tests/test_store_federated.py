@@ -0,0 +1,91 @@
+from pathlib import Path
+
+from inspect_flow import FlowSpec, FlowStoreConfig
+from inspect_flow._config.load import ConfigOptions, expand_spec
+from inspect_flow._store.deltalake import (
+    LOGS,
+    DeltaLakeStore,
+    _task_id_col,
+    to_uri,
+)
+from inspect_flow._store.federated import FederatedStore
+from inspect_flow._store.store import store_factory
+
+from tests.test_helpers.log_helpers import read_log_record
+
+dir1 = str(Path.cwd() / "tests/test_logs/logs1")
+dir2 = str(Path.cwd() / "tests/test_logs/logs2")
+log2_path = to_uri(
+    dir2 + "/2026-01-09T18-27-59+00-00_mmlu-0-shot_AaMwC64MK8EccYgfhUqy3n.eval"
+)
+
+
+def _stores(tmp_path: Path) -> tuple[str, str]:
+    team, shared = str(tmp_path / "team"), str(tmp_path / "shared")
+    DeltaLakeStore(team, create=True).import_log_path(dir1)
+    DeltaLakeStore(shared, create=True).import_log_path([dir1, dir2])
+    return team, shared
+
+
+def test_reads_fan_out_and_writes_go_to_primary(tmp_path: Path) -> None:
+    team, shared = _stores(tmp_path)
+    store = store_factory(
+        FlowSpec(store=FlowStoreConfig(path=team, read_from=[shared], read=True)),
+        base_dir=".",
+        quiet=True,
+    )
+    assert isinstance(store, FederatedStore)
+    assert store.store_path == team
+
+    logs = store.get_logs()
+    assert len(logs) == 3
+    task_id = read_log_record(log2_path).task_identifier
+    assert store.search_for_logs({task_id})[task_id].log_file == log2_path
+
+    # Logs in both stores are returned once
+    table = store.scan(["log_path"]).read_all()
+    assert sorted(table["log_path"].to_pylist()) == sorted(logs)
+
+    store.import_log_path(dir2)
+    assert len(DeltaLakeStore(team).get_logs()) == 3
+
+
+def test_missing_read_from_store_is_skipped(tmp_path: Path) -> None:
+    team, _ = _stores(tmp_path)
+    store = store_factory(
+        FlowSpec(
+            store=FlowStoreConfig(path=team, read_from=[str(tmp_path / "missing")])
+        ),
+        base_dir=".",
+        quiet=True,
+    )
+    assert isinstance(store, DeltaLakeStore)
+
+
+def test_store_read_from_option() -> None:
+    spec = expand_spec(
+        FlowSpec(store="auto"),
+        base_dir=".",
+        options=ConfigOptions(store_read_from=("/stores/a", "/stores/b")),
+    )
+    assert isinstance(spec.store, FlowStoreConfig)
+    assert spec.store.path == "auto"
+    assert spec.store.read_from == ["/stores/a", "/stores/b"]
+
+
+def test_read_from_store_is_not_modified(tmp_path: Path) -> None:
+    team, shared = _stores(tmp_path)
+    shared_store = DeltaLakeStore(shared)
+    # Rows written by code that doesn't tag them would normally be backfilled
+    shared_store._open_table(LOGS).update({_task_id_col(): "NULL"})
+    version = shared_store._open_table(LOGS).version()
+
+    store = store_factory(
+        FlowSpec(store=FlowStoreConfig(path=team, read_from=[shared], read=True)),
+        base_dir=".",
+        quiet=True,
+    )
+    assert isinstance(store, FederatedStore)
+    task_id = read_log_record(log2_path).task_identifier
+    assert task_id not in store.search_for_logs({task_id})
+    assert DeltaLakeStore(shared)._open_table(LOGS).version() == version
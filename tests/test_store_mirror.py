@@ -0,0 +1,107 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+from botocore.client import BaseClient
+from deltalake import DeltaTable
+from inspect_flow._store.deltalake import LOGS, DeltaLakeStore
+from inspect_flow._store.mirror import TableMirror, mirror_dir
+from inspect_flow._store.store import delete_store, store_factory
+
+dir1 = str(Path.cwd() / "tests/test_logs/logs1")
+dir2 = str(Path.cwd() / "tests/test_logs/logs2")
+store_path = "s3://test-bucket/test-store"
+
+
+def _mirrored_store(monkeypatch: pytest.MonkeyPatch, create: bool) -> DeltaLakeStore:
+    monkeypatch.setenv("INSPECT_FLOW_STORE_MIRROR", "1")
+    store = store_factory(store_path, base_dir=".", create=create, quiet=True)
+    assert isinstance(store, DeltaLakeStore)
+    return store
+
+
+def test_reads_from_local_mirror(
+    mock_s3: BaseClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = _mirrored_store(monkeypatch, create=True)
+    store.import_log_path(dir1)
+
+    local = mirror_dir(store._table_path(LOGS))
+    read_uris: list[str] = []
+    to_pyarrow_dataset = DeltaTable.to_pyarrow_dataset
+
+    def record_reads(self: DeltaTable, *args: Any, **kwargs: Any) -> Any:
+        read_uris.append(self.table_uri)
+        return to_pyarrow_dataset(self, *args, **kwargs)
+
+    monkeypatch.setattr(DeltaTable, "to_pyarrow_dataset", record_reads)
+    store = _mirrored_store(monkeypatch, create=False)
+    assert len(store.get_logs()) == 2
+    assert read_uris
+    assert all(uri.startswith(local.as_uri()) for uri in read_uris)
+    assert list(local.rglob("*.parquet"))
+
+
+def test_sync_fetches_only_new_commits(
+    mock_s3: BaseClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = _mirrored_store(monkeypatch, create=True)
+    store.import_log_path(dir1)
+    assert len(store.get_logs()) == 2
+
+    fetched: list[str] = []
+    fetch = TableMirror._fetch
+
+    def record_fetch(self: TableMirror, name: str, dest: Path) -> bool:
+        found = fetch(self, name, dest)
+        if found:
+            fetched.append(name)
+        return found
+
+    monkeypatch.setattr(TableMirror, "_fetch", record_fetch)
+    version = store._open_table(LOGS).version()
+    store.import_log_path(dir2, recursive=True)
+    new_version = store._open_table(LOGS).version()
+    assert len(store.get_logs()) == 4
+
+    commits = [name for name in fetched if name.endswith(".json")]
+    assert len(commits) == new_version - version
+    assert len(set(commits)) == len(commits)
+
+
+def test_replaced_store_resets_mirror(
+    mock_s3: BaseClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = _mirrored_store(monkeypatch, create=True)
+    store.import_log_path(dir1)
+    assert len(store.get_logs()) == 2
+
+    delete_store(store_path)
+    store = _mirrored_store(monkeypatch, create=True)
+    assert len(store.get_logs()) == 0
+
+
+def test_sync_prunes_unreferenced_files(
+    mock_s3: BaseClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = _mirrored_store(monkeypatch, create=True)
+    store.import_log_path(dir1)
+    store.import_log_path(dir2, recursive=True)
+    assert len(store.get_logs()) == 4
+    local = mirror_dir(store._table_path(LOGS))
+    before = set(local.rglob("*.parquet"))
+
+    # Removing logs drops data files; they are kept until aged out
+    store.remove_log_prefix([dir2], recursive=True)
+    assert len(store.get_logs()) == 2
+    assert before <= set(local.rglob("*.parquet"))
+
+    monkeypatch.setattr("inspect_flow._store.mirror._PRUNE_AFTER_SECONDS", -1)
+    dt = TableMirror(store._table_path(LOGS)).sync()
+    mirrored = {
+        p.relative_to(local).as_posix()
+        for p in local.rglob("*")
+        if p.is_file() and "_delta_log" not in p.parts
+    }
+    assert mirrored == set(dt.get_add_actions(flatten=True).column("path").to_pylist())
+    assert before - set(local.rglob("*.parquet"))
@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import pytest
+from inspect_ai.log import read_eval_log_sample_summaries
+from inspect_flow import FlowSpec, FlowStoreConfig, log_field
+from inspect_flow._store.deltalake import (
+    SAMPLE_SCAN_COLUMNS,
+    SAMPLES,
+    DeltaLakeStore,
+    to_uri,
+)
+from inspect_flow._store.federated import FederatedStore
+from inspect_flow._store.samples import SampleRecord
+from inspect_flow._store.store import store_factory
+
+dir1 = str(Path.cwd() / "tests/test_logs/logs1")
+dir2 = str(Path.cwd() / "tests/test_logs/logs2")
+log1_path = to_uri(
+    dir1 + "/2025-12-11T18-00-43+00-00_gpqa-diamond_NL3aygdanSgqAJfzoMFuH6.eval"
+)
+
+
+def _num_samples(log_paths: set[str]) -> int:
+    return sum(len(read_eval_log_sample_summaries(p)) for p in log_paths)
+
+
+def test_sample_record_from_summary() -> None:
+    [summary, *_] = read_eval_log_sample_summaries(log1_path)
+    record = SampleRecord.from_summary(log1_path, summary)
+    assert record.sample_id == str(summary.id)
+    assert record.epoch == summary.epoch
+    assert set(record.scores) <= set(summary.scores or {})
+    assert record.total_tokens == sum(
+        u.total_tokens for u in summary.model_usage.values()
+    )
+
+
+def test_import_indexes_samples(tmp_path: Path) -> None:
+    store = DeltaLakeStore(str(tmp_path), create=True, samples=True)
+    store.import_log_path([dir1, dir2])
+    logs = store.get_logs()
+
+    table = store.scan_samples().read_all()
+    assert table.column_names == SAMPLE_SCAN_COLUMNS
+    assert len(table) == _num_samples(logs)
+    assert set(table["log_path"].to_pylist()) == logs
+    assert all(table["task_identifier"].to_pylist())
+
+    # Samples are grouped by log, in the order `scan` returns the logs
+    order = store.scan(["log_path"]).read_all()["log_path"].to_pylist()
+    sample_logs = list(dict.fromkeys(table["log_path"].to_pylist()))
+    assert sample_logs == order
+
+    gpt5 = store.scan_samples(
+        ["model", "sample_id"], filter=log_field("model").eq("openai/gpt-5")
+    ).read_all()
+    assert set(gpt5["model"].to_pylist()) == {"openai/gpt-5"}
+
+    store.remove_log_prefix(log1_path)
+    table = store.scan_samples(["log_path"]).read_all()
+    assert log1_path not in table["log_path"].to_pylist()
+    assert len(table) == _num_samples(logs - {log1_path})
+
+
+def test_existing_logs_indexed_when_enabled(tmp_path: Path) -> None:
+    DeltaLakeStore(str(tmp_path), create=True).import_log_path(dir1)
+    store = DeltaLakeStore(str(tmp_path))
+    with pytest.raises(ValueError, match="no sample index"):
+        store.scan_samples()
+
+    store = DeltaLakeStore(str(tmp_path), samples=True)
+    store.import_log_path(dir1)
+    table = store.scan_samples(["log_path"]).read_all()
+    assert set(table["log_path"].to_pylist()) == store.get_logs()
+
+    # A store that has the index keeps it up to date without being asked to
+    reopened = DeltaLakeStore(str(tmp_path))
+    reopened.import_log_path(dir2)
+    version = reopened._open_table(SAMPLES).version()
+    assert len(reopened.scan_samples().read_all()) == _num_samples(reopened.get_logs())
+    # Re-importing unchanged logs doesn't re-index them
+    reopened.import_log_path([dir1, dir2])
+    assert reopened._open_table(SAMPLES).version() == version
+
+
+def test_federated_scan_samples(tmp_path: Path) -> None:
+    team, shared = str(tmp_path / "team"), str(tmp_path / "shared")
+    DeltaLakeStore(team, create=True, samples=True).import_log_path(dir1)
+    DeltaLakeStore(shared, create=True, samples=True).import_log_path([dir1, dir2])
+    store = store_factory(
+        FlowSpec(store=FlowStoreConfig(path=team, read_from=[shared])),
+        base_dir=".",
+        quiet=True,
+    )
+    assert isinstance(store, FederatedStore)
+    table = store.scan_samples(["log_path", "sample_id", "epoch"]).read_all()
+    assert table.column_names == ["log_path", "sample_id", "epoch"]
+    # Samples of logs in both stores are returned once
+    assert len(table) == _num_samples(store.get_logs())
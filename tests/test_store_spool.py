@@ -0,0 +1,180 @@
+import os
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+from deltalake.exceptions import CommitFailedError
+from inspect_ai import Task, task
+from inspect_ai.dataset import Sample
+from inspect_flow._runner.run import run_eval_set
+from inspect_flow._store.deltalake import (
+    LOGS,
+    DeltaLakeStore,
+    _records_table,
+    _task_id_col,
+    to_uri,
+)
+from inspect_flow._store.spool import LogSpool, _open_spools, spool_dir
+from inspect_flow._types.flow_types import FlowSpec, FlowStoreConfig, FlowTask
+
+from tests.test_helpers.log_helpers import read_log_record
+
+dir1 = str(Path.cwd() / "tests/test_logs/logs1")
+dir2 = str(Path.cwd() / "tests/test_logs/logs2")
+log1_path = dir1 + "/2025-12-11T18-00-43+00-00_gpqa-diamond_NL3aygdanSgqAJfzoMFuH6.eval"
+
+
+@task
+def spool_task() -> Task:
+    return Task(dataset=[Sample(input="a", target="a")])
+
+
+def _spooled_store(store_path: Path) -> DeltaLakeStore:
+    store = DeltaLakeStore(str(store_path), create=True, spool=True)
+    assert store._spool is not None
+    # Only flush when the test asks to
+    store._spool._max_delay = 3600
+    return store
+
+
+def test_spooled_imports_commit_in_one_append(tmp_path: Path) -> None:
+    store = _spooled_store(tmp_path)
+    version = store._open_table(LOGS).version()
+
+    store.import_log_path(dir1)
+    store.import_log_path(dir2)
+    assert len(store.get_logs()) == 0
+
+    store.flush()
+    assert len(store.get_logs()) == 3
+    history = store._open_table(LOGS).history()
+    writes = [
+        c for c in history if c["version"] > version and c["operation"] == "WRITE"
+    ]
+    assert len(writes) == 1
+    assert not list(spool_dir(store._table_path(LOGS)).iterdir())
+    assert store._spool is not None
+    store._spool.close()
+
+
+def test_spool_writer_keeps_store_settings(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = DeltaLakeStore(str(tmp_path), create=True, spool=True, samples=True)
+    assert store._spool is not None
+    store._spool._max_delay = 3600
+    backfilled: list[DeltaLakeStore] = []
+    monkeypatch.setattr(DeltaLakeStore, "_set_task_identifiers", backfilled.append)
+
+    store.import_log_path(dir1)
+    store.flush()
+    logs = store.get_logs()
+    assert len(logs) == 2
+    table = store.scan_samples(["log_path"]).read_all()
+    assert set(table["log_path"].to_pylist()) == logs
+    # The backfill prints progress, so the writer leaves it to the store's reads
+    assert store._spool_writer is not None
+    assert store._spool_writer not in backfilled
+    store._spool.close()
+
+
+def test_run_commits_spooled_logs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Only an explicit flush commits
+    monkeypatch.setattr(LogSpool, "_start", lambda self: None)
+    store_path = tmp_path / "store"
+    spec = FlowSpec(
+        log_dir=str(tmp_path / "logs"),
+        store=FlowStoreConfig(path=str(store_path), spool=True),
+        tasks=[FlowTask(name="spool_task", model="mockllm/mock-llm")],
+    )
+    assert run_eval_set(spec, base_dir=".").success
+    assert len(DeltaLakeStore(str(store_path)).get_logs()) == 1
+
+
+def test_spool_replayed_after_crash(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    table_uri = DeltaLakeStore(str(tmp_path), create=True)._table_path(LOGS)
+
+    def crash(records: pa.Table) -> None:
+        raise RuntimeError("crashed")
+
+    # A process that spooled a record, claimed it for a flush, then died
+    with monkeypatch.context() as m:
+        m.setattr(LogSpool, "_start", lambda self: None)
+        crashed = LogSpool(table_uri, commit=crash)
+        _open_spools[crashed._dir].discard(crashed)
+        crashed.append(_records_table([read_log_record(log1_path)]))
+        [claimed] = crashed._claim()
+    old = time.time() - 3600
+    os.utime(claimed, (old, old))
+
+    store = _spooled_store(tmp_path)
+    store.flush()
+    assert store.get_logs() == {to_uri(log1_path)}
+    assert not list(spool_dir(table_uri).iterdir())
+    assert store._spool is not None
+    store._spool.close()
+
+
+def test_conflicting_commit_is_retried(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("inspect_flow._store.spool._COMMIT_BACKOFF_SECONDS", 0)
+    committed: list[pa.Table] = []
+
+    def commit(records: pa.Table) -> None:
+        if not committed:
+            committed.append(records.slice(0, 0))
+            raise CommitFailedError("conflict")
+        committed.append(records)
+
+    spool = LogSpool(str(tmp_path / "table"), commit=commit, max_delay=3600)
+    spool.append(pa.table({"log_path": ["a"]}))
+    spool.append(pa.table({"log_path": ["b"]}))
+    assert spool.flush() == 2
+    assert committed[-1].column("log_path").to_pylist() == ["a", "b"]
+    spool.close()
+
+
+def test_spooled_records_of_another_identifier_version(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Records spooled with another identifier version are recomputed, not dropped."""
+    store = _spooled_store(tmp_path)
+    record = read_log_record(log1_path)
+    records = _records_table([record])
+    records = records.rename_columns(
+        [
+            "task_identifier_v0" if c == _task_id_col() else c
+            for c in records.column_names
+        ]
+    )
+    assert store._spool is not None
+    store._spool.append(records)
+    store.flush()
+    assert store.search_for_logs({record.task_identifier})[
+        record.task_identifier
+    ].log_file == to_uri(log1_path)
+    assert "Recomputing the task identifiers of 1 spooled" in caplog.text
+    store._spool.close()
+
+
+def test_one_exit_handler_per_spool_dir(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    registered: list[object] = []
+    monkeypatch.setattr(
+        "inspect_flow._store.spool.atexit.register",
+        lambda *args: registered.append(args),
+    )
+    spools = [
+        LogSpool(str(tmp_path / table), commit=lambda records: None)
+        for table in ["a", "a", "a", "b"]
+    ]
+    assert len(registered) == 2
+    for spool in spools:
+        spool.close()